@@ -0,0 +1,189 @@
+# Dashboard client of the read API (api_server.py)
+# With TENNIS_BACKEND=api the pages get their DataFrames from the API service instead of querying the database
+# from every Streamlit process:
+#   - ApiClient keeps one keep-alive HTTP connection per thread and asks for Arrow IPC responses when pyarrow is
+#     installed (JSON otherwise); a dropped keep-alive connection is reopened and the request sent once more
+#   - ApiBackend implements backend.DataBackend with one request per call, through the shared query cache
+#     (API_TTL seconds, dropped by query_cache.notify_invalidation like the SQL results), and rebuilds the
+#     CompetitorDirectory, CompetitionTree and RankSeries objects from the frames the API sends
+# Exports (exports.py) still read the database directly
+#
+# Usage:
+#   python api_server.py --mysql
+#   TENNIS_BACKEND=api TENNIS_API_URL=http://127.0.0.1:8600 streamlit run tennis_analytics.py
+
+# Importing Required Libraries
+import http.client               #Keep-alive HTTP/1.1 connections
+import io                        #Arrow responses
+import json                      #JSON responses
+import os                        #Settings from the environment
+import threading                 #One connection per thread
+from urllib.parse import urlencode, urlsplit
+
+import pandas as pd
+
+import instrumentation
+from backend import COMPARISON_COLUMNS, RANKING_PAGE_SIZE, SERIES_COLUMNS, DataBackend
+from directory import CompetitorDirectory
+from hierarchy import CompetitionTree
+from timeseries import RankSeries
+
+API_URL = os.environ.get("TENNIS_API_URL", "http://127.0.0.1:8600")
+API_TTL = float(os.environ.get("TENNIS_API_TTL", 30))   #Seconds an API response is reused by this process
+API_TIMEOUT = 30                 #Seconds per request
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class ApiError(RuntimeError):
+    pass
+
+
+def _arrow_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+#Response body -> DataFrame (or the plain JSON value of /rankings/weeks, /countries, ...)
+def decode(content_type, body):
+    if content_type.startswith(ARROW_TYPE):
+        import pyarrow as pa
+        return pa.ipc.open_stream(io.BytesIO(body)).read_pandas()   #Named index restored from the schema metadata
+    payload = json.loads(body)
+    if "columns" not in payload:
+        return payload["data"]
+    df = pd.DataFrame(payload["data"], columns=payload["columns"])
+    return df.set_index(payload["index"]) if payload.get("index") else df
+
+
+class ApiClient:
+    def __init__(self, url=API_URL, fmt=None, timeout=API_TIMEOUT):
+        parts = urlsplit(url)
+        self.url = url
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.fmt = fmt or ("arrow" if _arrow_available() else "json")
+        self.timeout = timeout
+        self.requests = 0
+        self.reconnects = 0
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def _drop(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    #GET path?params -> decoded body; raises ApiError on an error response
+    def get(self, path, params=None):
+        target = self.prefix + path + ("?" + urlencode(params) if params else "")
+        headers = {"Accept": ARROW_TYPE if self.fmt == "arrow" else "application/json"}
+        for attempt in (1, 2):
+            try:
+                conn = self._connection()
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException):
+                self._drop()  #Server closed the idle keep-alive connection: reconnect once
+                if attempt == 2:
+                    raise
+                self.reconnects += 1
+        self.requests += 1
+        if response.status != 200:
+            try:
+                message = json.loads(body)["error"]
+            except (ValueError, KeyError):
+                message = body[:200].decode("utf-8", "replace")
+            raise ApiError(f"{path}: {response.status} {message}")
+        return decode(response.getheader("Content-Type", ""), body)
+
+
+class ApiBackend(DataBackend):
+    name = "api"
+
+    def __init__(self, client, cache, ttl=API_TTL):
+        self.client = client
+        self.cache = cache
+        self.ttl = ttl
+
+    #One API request through the shared cache; prepare builds the object the pages expect (cached as well)
+    def _get(self, path, params=None, ttl=None, prepare=None, tags=("rankings",)):
+        key = tuple(sorted(params.items())) if params else None
+
+        def load():
+            value = self.client.get(path, params)
+            value = prepare(value) if prepare is not None else value
+            if hasattr(value, "__len__"):
+                read["rows"] = len(value)
+            read["hit"] = False
+            return value
+
+        with instrumentation.span("read", f"GET {path}") as read:
+            read["hit"] = True
+            return self.cache.get_or_load(path, key, load, ttl=self.ttl if ttl is None else ttl, tags=tags)
+
+    def search(self, text):
+        return self._get("/search", {"q": text})
+
+    def latest_rankings(self):
+        return self._get("/rankings/latest/all")
+
+    def latest_rankings_page(self, after=0, size=RANKING_PAGE_SIZE):
+        return self._get("/rankings/latest", {"after": int(after), "size": int(size)})
+
+    def latest_rankings_count(self):
+        return int(self._get("/rankings/latest/count"))
+
+    def ranking_by_country(self):
+        return self._get("/rankings/by-country")
+
+    def ranking_weeks(self):
+        return self._get("/rankings/weeks", prepare=lambda weeks: [(int(year), int(week)) for year, week in weeks])
+
+    def week_rankings(self, year, week):
+        return self._get("/rankings/week", {"year": int(year), "week": int(week)})
+
+    def top_movers(self):
+        return self._get("/movers")
+
+    def country_list(self):
+        return self._get("/countries")
+
+    def competitors_by_country(self, country):
+        return self._get("/countries/competitors", {"country": country})
+
+    def country_stats(self):
+        return self._get("/countries/stats")
+
+    def competitor_directory(self):
+        return self._get("/competitors/directory", prepare=CompetitorDirectory)
+
+    #IDs are sorted so the same selection in any order is one request and one cache entry
+    def comparison_latest(self, ids):
+        ids = tuple(sorted(set(ids)))
+        if not ids:
+            return pd.DataFrame(columns=COMPARISON_COLUMNS)
+        return self._get("/competitors/latest", {"ids": ",".join(ids)})
+
+    def rank_series(self, ids):
+        ids = tuple(sorted(set(ids)))
+        if not ids:
+            return RankSeries(pd.DataFrame(columns=SERIES_COLUMNS))
+        return self._get("/competitors/trend", {"ids": ",".join(ids)}, prepare=RankSeries)
+
+    def competition_tree(self):
+        return self._get("/competitions/tree", prepare=CompetitionTree, tags=("competitions",))
+
+    def stats(self):
+        return {"backend": self.name, "url": self.client.url, "format": self.client.fmt,
+                "requests": self.client.requests, "reconnects": self.client.reconnects, **self.cache.stats()}
@@ -0,0 +1,336 @@
+# Read API for the ranking data
+# The page data was only reachable from inside the Streamlit process (backend.py behind the pages), so notebooks
+# and partner tools could not reuse it and every dashboard process queried MySQL on its own. api_server.py serves
+# the same DataBackend calls over HTTP from one small asyncio process:
+#   - the backend is any of backend.make_backend ("mysql": pooled connections + query cache, "memory", "arrow")
+#     and its blocking calls run on a thread pool of API_WORKERS threads
+#   - single-flight: identical requests arriving while the first one is still running wait for its result
+#     instead of starting their own, so N concurrent identical requests cost one backend call / query
+#   - responses are compact JSON ({"columns": [...], "data": [[...], ...], "index": name or null}) or an Arrow
+#     IPC stream (?format=arrow or Accept: application/vnd.apache.arrow.stream); the encoded body of a
+#     DataFrame is kept while the backend keeps returning that same (cached) DataFrame, through a weak reference
+#     so the query cache can still evict it
+#   - HTTP/1.1 with keep-alive on asyncio streams (standard library only; Arrow needs pyarrow)
+#
+# Endpoints (GET):
+#   /health, /stats
+#   /search?q=pavic
+#   /rankings/latest?after=0&size=100    /rankings/latest/all    /rankings/latest/count
+#   /rankings/weeks    /rankings/week?year=2025&week=16    /rankings/by-country
+#   /movers
+#   /countries    /countries/competitors?country=Croatia    /countries/stats
+#   /competitors/directory    /competitors/latest?ids=sr:competitor:1,sr:competitor:2    /competitors/trend?ids=...
+#   /competitions/tree
+# The dashboard uses it with TENNIS_BACKEND=api (api_client.ApiBackend)
+#
+# Usage:
+#   python api_server.py --sqlite data/sportanalytics.db --port 8600
+#   python api_server.py --mysql --backend memory
+#   curl "http://127.0.0.1:8600/movers"
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import asyncio                   #Event loop, streams
+import json                      #Response bodies
+import os                        #Settings from the environment
+import threading                 #Lock around the encoded-body cache and the counters
+import time                      #Latencies
+import weakref                   #Encoded bodies do not keep their DataFrame alive
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from backend import BACKEND, MAX_COMPARE, RANKING_PAGE_SIZE, make_backend
+from db_pool import POOL_SIZE, ConnectionPool, mysql_factory, sqlite_factory
+from query_cache import QueryCache
+
+API_HOST = os.environ.get("TENNIS_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("TENNIS_API_PORT", 8600))
+API_WORKERS = int(os.environ.get("TENNIS_API_WORKERS", POOL_SIZE * 2))   #Backend calls running at once
+MAX_PAGE_SIZE = 1000             #Largest ?size= of /rankings/latest
+ENCODED_KEEP = 256               #Encoded response bodies kept (one per request key)
+RECENT = 2000                    #Latency samples kept for /stats
+MAX_HEADER_BYTES = 16384
+JSON_TYPE = "application/json"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           406: "Not Acceptable", 500: "Internal Server Error"}
+
+
+# 1) Endpoints: path -> function(backend, params) returning a DataFrame or a JSON-able value
+
+def _required(params, name):
+    if not params.get(name):
+        raise ValueError(f"missing parameter {name!r}")
+    return params[name]
+
+
+def _ids(params, limit=MAX_COMPARE):
+    ids = [i for i in params.get("ids", "").split(",") if i]
+    if len(ids) > limit:
+        raise ValueError(f"at most {limit} ids")
+    return ids
+
+
+ROUTES = {
+    "/search": lambda b, p: b.search(_required(p, "q")),
+    "/rankings/latest": lambda b, p: b.latest_rankings_page(
+        max(int(p.get("after", 0)), 0), min(max(int(p.get("size", RANKING_PAGE_SIZE)), 1), MAX_PAGE_SIZE)),
+    "/rankings/latest/all": lambda b, p: b.latest_rankings(),
+    "/rankings/latest/count": lambda b, p: b.latest_rankings_count(),
+    "/rankings/weeks": lambda b, p: b.ranking_weeks(),
+    "/rankings/week": lambda b, p: b.week_rankings(int(_required(p, "year")), int(_required(p, "week"))),
+    "/rankings/by-country": lambda b, p: b.ranking_by_country(),
+    "/movers": lambda b, p: b.top_movers(),
+    "/countries": lambda b, p: b.country_list(),
+    "/countries/competitors": lambda b, p: b.competitors_by_country(_required(p, "country")),
+    "/countries/stats": lambda b, p: b.country_stats(),
+    "/competitors/directory": lambda b, p: b.competitor_directory().frame,
+    "/competitors/latest": lambda b, p: b.comparison_latest(_ids(p)),
+    "/competitors/trend": lambda b, p: b.rank_series(_ids(p)).series_frame(),
+    "/competitions/tree": lambda b, p: b.competition_tree().frame,
+}
+
+
+# 2) Encoding
+
+def _plain(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+#DataFrame -> {"columns", "data", "index"}; a named index (e.g. Position) is sent as the first column
+def encode_json(result):
+    if not isinstance(result, pd.DataFrame):
+        return json.dumps({"data": _plain(result)}).encode()
+    index = result.index.name
+    frame = result.reset_index() if index is not None else result
+    body = frame.to_json(orient="split", index=False, date_format="iso")   #{"columns":[...],"data":[[...]]}
+    return (body[:-1] + f',"index":{json.dumps(index)}}}').encode()
+
+
+def encode_arrow(frame):
+    import pyarrow as pa
+    table = pa.Table.from_pandas(frame, preserve_index=frame.index.name is not None)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# 3) Single-flight
+
+class SingleFlight:
+    #Concurrent calls with the same key share one run of the work (the first caller's)
+    def __init__(self):
+        self._running = {}
+        self.leaders = 0         #Calls that ran the work
+        self.followers = 0       #Calls that waited for another caller's run
+
+    async def do(self, key, work):
+        task = self._running.get(key)
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._running[key] = task
+            task.add_done_callback(lambda _: self._running.pop(key, None))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        return await asyncio.shield(task)   #A client that disconnects does not cancel the others' result
+
+
+# 4) The service
+
+class ApiService:
+    def __init__(self, backend, workers=API_WORKERS, coalesce=True):
+        self.backend = backend
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self.coalesce = coalesce
+        self.flights = SingleFlight()
+        self._encoded = OrderedDict()    #request key -> (weakref to the DataFrame, content type, body)
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.statuses = {}
+        self.latencies = deque(maxlen=RECENT)
+
+    #Runs on the thread pool: backend call + encoding
+    def _compute(self, key, route, params, fmt):
+        result = route(self.backend, params)
+        if not isinstance(result, pd.DataFrame):
+            return 200, JSON_TYPE, encode_json(result)
+        with self._lock:
+            cached = self._encoded.get(key)
+        if cached is not None and cached[0]() is result:   #Same cached DataFrame as last time: same bytes
+            return 200, cached[1], cached[2]
+        content_type, body = (ARROW_TYPE, encode_arrow(result)) if fmt == "arrow" else (JSON_TYPE, encode_json(result))
+        with self._lock:
+            #A weak reference: a frame the query cache evicted is freed (TENNIS_CACHE_MAX_MB holds) and its body,
+            #which can no longer match, is dropped here
+            for stale in [k for k, (frame, _, _) in self._encoded.items() if frame() is None]:
+                del self._encoded[stale]
+            self._encoded[key] = (weakref.ref(result), content_type, body)
+            self._encoded.move_to_end(key)
+            while len(self._encoded) > ENCODED_KEEP:
+                self._encoded.popitem(last=False)
+        return 200, content_type, body
+
+    async def handle(self, path, params, fmt):
+        if path == "/health":
+            return 200, JSON_TYPE, json.dumps({"status": "ok", "backend": self.backend.name}).encode()
+        if path == "/stats":
+            return 200, JSON_TYPE, json.dumps(self.stats(), default=str).encode()
+        route = ROUTES.get(path)
+        if route is None:
+            return 404, JSON_TYPE, json.dumps({"error": f"unknown endpoint {path}"}).encode()
+        if fmt == "arrow" and not _arrow_available():
+            return 406, JSON_TYPE, json.dumps({"error": "Arrow responses need pyarrow on the server"}).encode()
+        key = (path, tuple(sorted(params.items())), fmt)
+        loop = asyncio.get_running_loop()
+
+        def work():
+            return loop.run_in_executor(self.executor, self._compute, key, route, params, fmt)
+
+        try:
+            if self.coalesce:
+                return await self.flights.do(key, work)
+            self.flights.leaders += 1
+            return await work()
+        except (ValueError, KeyError) as e:
+            return 400, JSON_TYPE, json.dumps({"error": str(e)}).encode()
+        except Exception as e:
+            return 500, JSON_TYPE, json.dumps({"error": f"{type(e).__name__}: {e}"}).encode()
+
+    def record(self, status, seconds):
+        self.requests += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latencies.append(seconds)
+
+    def stats(self):
+        recent = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        backend_stats = self.backend.stats()
+        pool = getattr(self.backend, "pool", None)
+        return {
+            "backend": backend_stats,
+            "pool": pool.stats() if pool is not None else None,
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "statuses": self.statuses,
+            "backend_calls": self.flights.leaders,
+            "coalesced": self.flights.followers,
+            "p50_ms": round(float(np.percentile(recent, 50)), 3),
+            "p99_ms": round(float(np.percentile(recent, 99)), 3),
+        }
+
+
+def _arrow_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# 5) HTTP/1.1 on asyncio streams
+
+def _format(params, headers):
+    fmt = params.pop("format", None)
+    if fmt is None:
+        fmt = "arrow" if ARROW_TYPE in headers.get("accept", "") else "json"
+    if fmt not in ("json", "arrow"):
+        raise ValueError("format must be json or arrow")
+    return fmt
+
+
+async def serve_connection(service, reader, writer):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            start = time.perf_counter()
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, version = (lines[0].split(" ") + ["", "", ""])[:3]
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            keep_alive = (headers.get("connection", "").lower() != "close" if version == "HTTP/1.1"
+                          else headers.get("connection", "").lower() == "keep-alive")
+
+            url = urlsplit(target)
+            params = dict(parse_qsl(url.query))
+            if method not in ("GET", "HEAD"):
+                status, content_type, body = 405, JSON_TYPE, b'{"error": "only GET"}'
+            else:
+                try:
+                    fmt = _format(params, headers)
+                except ValueError as e:
+                    status, content_type, body = 400, JSON_TYPE, json.dumps({"error": str(e)}).encode()
+                else:
+                    status, content_type, body = await service.handle(url.path.rstrip("/") or "/", params, fmt)
+
+            writer.write((f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                          f"Content-Type: {content_type}\r\n"
+                          f"Content-Length: {len(body)}\r\n"
+                          f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1"))
+            if method != "HEAD":
+                writer.write(body)
+            await writer.drain()
+            service.record(status, time.perf_counter() - start)
+            if not keep_alive:
+                return
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service, host=API_HOST, port=API_PORT, ready=None):
+    server = await asyncio.start_server(lambda r, w: serve_connection(service, r, w), host, port,
+                                        limit=MAX_HEADER_BYTES, backlog=1024)
+    print(f"Serving the {service.backend.name} backend on http://{host}:{port} "
+          f"({service.executor._max_workers} workers, coalescing {'on' if service.coalesce else 'off'})", flush=True)
+    if ready is not None:
+        ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP read API over the dashboard data backend")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--sqlite", metavar="PATH", help="serve a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="serve MySQL (db_pool.DB_CONFIG, the default)")
+    parser.add_argument("--backend", default=BACKEND if BACKEND != "api" else "mysql",
+                        choices=["mysql", "memory", "arrow"], help="data backend (default: TENNIS_BACKEND)")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="backend calls running at once")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE, help="database connections")
+    parser.add_argument("--no-coalesce", action="store_true", help="run every request on its own (benchmarks)")
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        pool = ConnectionPool(sqlite_factory(args.sqlite), size=args.pool_size, dialect="sqlite")
+    else:
+        pool = ConnectionPool(mysql_factory(), size=args.pool_size)
+    service = ApiService(make_backend(args.backend, pool, QueryCache()), args.workers, not args.no_coalesce)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.backend.close()
+
+
+if __name__ == "__main__":
+    main()
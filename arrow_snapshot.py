@@ -0,0 +1,260 @@
+# Shared-memory Arrow snapshot of the dashboard tables
+# With several Streamlit server processes behind a load balancer, every process built its own pandas copy of the
+# ranking history (TENNIS_BACKEND=memory) or cached its own query results (mysql). The ingestion jobs now publish
+# the tables the in-memory store needs as an immutable Arrow IPC snapshot and every worker memory-maps it:
+#   - publish(): reads competitors, the ranking history (already in the store's competitor / week order),
+#     categories, competitions, complexes, venues and country_rankings, writes one uncompressed Arrow IPC file per
+#     table into a new version folder (data/arrow_snapshot/v000042/), then swaps manifest.json (version, target,
+#     tables, rows, bytes) in one rename; the oldest version folders beyond KEEP_VERSIONS are removed
+#   - the manifest records the database it was published from (db_pool.database_target): a load into another
+#     database does not publish over it (set TENNIS_ARROW_DIR per database), and a worker ignores a snapshot
+#     of another database
+#   - columns are written so pandas can use the mapped buffers as they are: numbers without validity bitmaps
+#     (NULL -> NaN), strings as large_string, categoricals as dictionary indices of the width pandas uses for
+#     its codes (-1 kept in the NULL slots). Mapping a snapshot costs page cache shared by every process, not
+#     private memory: the ranking history is not copied into any worker
+#   - ArrowBackend (TENNIS_BACKEND=arrow) is the memory backend built on the mapped tables; a background thread
+#     reads the manifest every CHECK_INTERVAL seconds and hot-swaps to a new version (the old store and its
+#     mapping are released once no page uses them). The store is shared by every session of the process, so
+#     memory per worker does not grow with the number of sessions
+# ingest.py, etl.py and backfill.py publish a new version after a load that changed one of these tables
+#
+# Usage:
+#   python arrow_snapshot.py --sqlite data/sportanalytics.db        (publish a version now)
+#   python arrow_snapshot.py --mysql
+#   python arrow_snapshot.py --show                                   (manifest of the current version)
+#   TENNIS_BACKEND=arrow streamlit run tennis_analytics.py --server.port 8501     (one per worker process)
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import json                      #Manifest
+import os                        #Snapshot folder
+import shutil                    #Removing old versions
+import sqlite3                   #Local SQLite stand-in
+import time                      #Publish timing
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa             #Installed with streamlit
+
+from db_pool import DB_CONFIG, database_target
+from memstore import CATEGORICAL, VERSION_SQL, MemoryBackend, MemoryStore, load_table, sort_rankings, table_frame
+from schema import COLUMNS
+
+SNAPSHOT_DIR = os.environ.get(
+    "TENNIS_ARROW_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "arrow_snapshot"),
+)
+MANIFEST = "manifest.json"
+FORMAT = 1                       #Bumped if the file layout changes
+KEEP_VERSIONS = 3                #Version folders kept on disk (a worker still mapping an older one keeps its pages)
+CHECK_INTERVAL = 5               #Seconds between manifest checks in each worker
+TABLES = list(CATEGORICAL)       #The tables MemoryStore is built from
+
+
+# 1) Columns <-> Arrow
+
+#DataFrame -> one Arrow record batch laid out for zero-copy reading (see from_arrow)
+def to_arrow(df):
+    arrays = []
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            categories = values.cat.categories
+            dictionary = pa.array(categories.to_numpy(dtype=object), from_pandas=True,
+                                  type=None if categories.dtype.kind in "iuf" else pa.large_string())
+            indices = pa.array(codes, mask=codes < 0)   #NULL slots keep -1 in the data buffer
+            arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+        elif values.dtype.kind in "iufb":
+            arrays.append(pa.array(values.to_numpy(), from_pandas=False))   #NaN stays a value, no bitmap
+        else:
+            arrays.append(pa.array(values.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True))
+    return pa.RecordBatch.from_arrays(arrays, names=list(df.columns))
+
+
+#Arrow table (mapped, one record batch) -> DataFrame whose numeric columns and categorical codes are views of the Arrow buffers
+def from_arrow(table):
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        array = column.chunk(0)
+        if pa.types.is_dictionary(array.type):
+            dtype = np.dtype(array.indices.type.to_pandas_dtype())
+            data = array.indices.buffers()[1]
+            codes = (np.frombuffer(data, dtype=dtype, count=len(array), offset=array.indices.offset * dtype.itemsize)
+                     if len(array) else np.array([], dtype=dtype))
+            columns[name] = pd.Categorical.from_codes(codes, categories=array.dictionary.to_pandas(), validate=False)
+        elif pa.types.is_large_string(array.type) or pa.types.is_string(array.type):
+            columns[name] = array.to_pandas()
+        else:
+            columns[name] = array.to_numpy(zero_copy_only=False)
+    return pd.DataFrame(columns, columns=table.column_names, copy=False)
+
+
+# 2) Publishing
+
+def read_manifest(folder=SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(folder, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == FORMAT else None
+
+
+#True if a load with these ingest stats changed a snapshot table (or nothing has been published yet, or only a
+#manifest written before the target was recorded, which no worker maps)
+def needs_publish(stats, folder=SNAPSHOT_DIR):
+    return any(s["table"] in TABLES and s["rows"] for s in stats) or "target" not in (read_manifest(folder) or {})
+
+
+def read_tables(conn):
+    tables = {}
+    cursor = conn.cursor()
+    for table in TABLES:
+        cursor.execute(f"SELECT {', '.join(COLUMNS[table])} FROM {table}")
+        tables[table] = table_frame(cursor.fetchall(), table)
+    cursor.execute(VERSION_SQL)
+    data_version = cursor.fetchall()[0][0]
+    cursor.close()
+    tables["competitor_ranking_table"] = sort_rankings(tables["competitor_ranking_table"])
+    return tables, data_version
+
+
+#One record batch per file, written even for an empty table, so every mapped column is a single chunk
+def write_table(df, path):
+    batch = to_arrow(df)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+
+
+#Removes the version folders older than the newest `keep`; one still open elsewhere is left for the next publish
+def prune(folder, keep=KEEP_VERSIONS):
+    versions = sorted(name for name in os.listdir(folder) if name.startswith("v") and name[1:].isdigit())
+    for name in versions[:-keep]:
+        try:
+            shutil.rmtree(os.path.join(folder, name))
+        except OSError:  #Windows: still mapped by a worker
+            pass
+
+
+#Writes a new snapshot version from the database and points the manifest at it
+#Returns an ingest-style stats dict; nothing is written if the folder holds the snapshot of another database
+def publish(conn, dialect="mysql", folder=SNAPSHOT_DIR, keep=KEEP_VERSIONS):
+    start = time.perf_counter()
+    target = database_target(conn, dialect)
+    previous = read_manifest(folder)
+    if previous and previous.get("target", target) != target:
+        return {"table": "arrow snapshot", "rows": 0, "seconds": time.perf_counter() - start, "rows_per_sec": 0,
+                "method": f"skipped: {folder} holds the snapshot of {previous['target']}"}
+    tables, data_version = read_tables(conn)
+    version = (previous["version"] if previous else 0) + 1
+    name = f"v{version:06d}"
+    staging = os.path.join(folder, name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    entries = {}
+    for table, df in tables.items():
+        write_table(df, os.path.join(staging, f"{table}.arrow"))
+        entries[table] = {"file": f"{table}.arrow", "rows": len(df),
+                          "bytes": os.path.getsize(os.path.join(staging, f"{table}.arrow"))}
+    os.replace(staging, os.path.join(folder, name))
+
+    manifest = {"format": FORMAT, "version": version, "folder": name, "target": target, "data_version": data_version,
+                "published_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), "tables": entries}
+    with open(os.path.join(folder, MANIFEST + ".tmp"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(os.path.join(folder, MANIFEST + ".tmp"), os.path.join(folder, MANIFEST))  #Workers see it from here
+    prune(folder, keep)
+
+    seconds = time.perf_counter() - start
+    rows = sum(entry["rows"] for entry in entries.values())
+    return {
+        "table": "arrow snapshot",
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else float("inf"),
+        "method": f"version {version}, {len(entries)} tables, "
+                  f"{sum(e['bytes'] for e in entries.values()) / 2 ** 20:.1f} MB",
+    }
+
+
+# 3) Mapping
+
+#Memory-maps every table of the manifest's version: {table: DataFrame}
+def map_tables(manifest, folder=SNAPSHOT_DIR):
+    base = os.path.join(folder, manifest["folder"])
+    tables = {}
+    for table, entry in manifest["tables"].items():
+        source = pa.memory_map(os.path.join(base, entry["file"]))   #Read-only mapping
+        tables[table] = from_arrow(pa.ipc.open_file(source).read_all())
+    return tables
+
+
+class ArrowBackend(MemoryBackend):
+    name = "arrow"
+
+    def __init__(self, pool, folder=SNAPSHOT_DIR, refresh_interval=CHECK_INTERVAL, background=True):
+        self.folder = folder
+        with pool.connection() as conn:
+            self.target = database_target(conn, pool.dialect)
+        super().__init__(pool, refresh_interval, background)
+
+    #The folder's manifest if it was published from this backend's database, else None
+    def _manifest(self):
+        manifest = read_manifest(self.folder)
+        return manifest if manifest and manifest.get("target") == self.target else None
+
+    #Snapshot version in the manifest; None until the first publish
+    def _version(self):
+        manifest = self._manifest()
+        return manifest["version"] if manifest else None
+
+    def _load(self):
+        manifest = self._manifest()
+        if manifest is None:  #Nothing published for this database yet: a private copy until the first snapshot
+            store = MemoryStore({table: load_table(self.pool, table) for table in TABLES})
+        else:
+            store = MemoryStore(map_tables(manifest, self.folder), manifest["version"], presorted=True)
+        store.manifest = manifest
+        return store
+
+    def stats(self):
+        manifest = self._store.manifest
+        return dict(super().stats(), snapshot=manifest and {
+            "folder": os.path.join(self.folder, manifest["folder"]),
+            "published_at": manifest["published_at"],
+            "mapped_bytes": sum(entry["bytes"] for entry in manifest["tables"].values()),
+        })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish the dashboard tables as a memory-mapped Arrow snapshot")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="read a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="read MySQL (db_pool.DB_CONFIG)")
+    target.add_argument("--show", action="store_true", help="print the current manifest")
+    parser.add_argument("--folder", default=SNAPSHOT_DIR)
+    parser.add_argument("--keep", type=int, default=KEEP_VERSIONS, help="version folders kept on disk")
+    args = parser.parse_args(argv)
+
+    if args.show:
+        manifest = read_manifest(args.folder)
+        print(json.dumps(manifest, indent=1) if manifest else f"No snapshot published in {args.folder}")
+        return
+    if args.sqlite:
+        conn, dialect = sqlite3.connect(args.sqlite), "sqlite"
+    else:
+        import mysql.connector
+        conn, dialect = mysql.connector.connect(**DB_CONFIG), "mysql"
+    try:
+        stats = publish(conn, dialect, args.folder, args.keep)
+    finally:
+        conn.close()
+    from ingest import print_report
+    print_report([stats])
+
+
+if __name__ == "__main__":
+    main()
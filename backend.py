@@ -0,0 +1,237 @@
+# Data backends for the dashboard pages
+# Every page asks a backend for ready-to-display DataFrames, so the same page code runs on:
+#   "mysql"  - SqlBackend: the page queries (queries.py) through the shared pool and query cache
+#   "memory" - memstore.MemoryBackend: the tables loaded once into pandas, answered with vectorized filters
+#   "arrow"  - arrow_snapshot.ArrowBackend: the memory backend on the published Arrow snapshot, memory-mapped
+#              (one copy in the page cache for every server process; hot-swapped when a new version is published)
+#   "api"    - api_client.ApiBackend: the same calls answered by the read API service (api_server.py, TENNIS_API_URL)
+# Choose one with the TENNIS_BACKEND environment variable (default "mysql")
+
+# Importing Required Libraries
+import os                        #Backend choice from the environment
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+import queries                   #Page SQL
+from directory import CompetitorDirectory
+from hierarchy import CompetitionTree
+from query_cache import cached_read
+from search_index import SEARCH_LIMIT, SOURCE_SQL, load_for_pool
+from timeseries import RankSeries
+
+BACKEND = os.environ.get("TENNIS_BACKEND", "mysql")
+
+#Cache lifetimes (seconds): lookup lists barely change, ranking data changes once a week
+TTL_LOOKUP = 24 * 3600
+TTL_RANKINGS = 3600
+TTL_SEARCH = 300
+
+RANKING_PAGE_SIZE = 100          #Ranking Overview rows per page
+MAX_COMPARE = 50                 #Competitors on the Competitor Comparison page at once
+
+#Column names of the DataFrames each page receives (the same for every backend)
+SEARCH_COLUMNS = ["Competitor ID", "Name", "Country", "Country Code", "Abbreviation",
+                  "Rank", "Points", "Movement", "Competitions Played"]
+RANKING_COLUMNS = ["Rank", "Movement", "Points", "Competitor", "Country", "Week"]
+TOP_MOVERS_COLUMNS = ["ranks", "movement", "points", "competitor_name", "country", "week"]
+COUNTRY_COLUMNS = ["Competitor ID", "Name", "Rank", "Points"]
+COMPARISON_COLUMNS = ["Competitor", "Country", "Country Code", "Abbreviation",
+                      "Rank", "Points", "Movement", "Competitions Played"]
+SERIES_COLUMNS = ["Competitor ID", "Competitor", "Year", "Week", "Rank", "Points"]
+DIRECTORY_COLUMNS = ["Competitor ID", "Name", "Country", "Abbreviation"]
+COUNTRY_STATS_COLUMNS = ["Country Code", "Country", "Competitors", "Best Rank", "Median Points", "Total Points",
+                         "Top 10", "Top 100", "Competitors Change", "Best Rank Change", "Median Points Change",
+                         "Total Points Change", "Year", "Week"]
+RANKING_COUNTRY_COLUMNS = ["Country", "Competitors", "Points", "Best Rank"]
+TREE_COLUMNS = ["Competition ID", "Competition", "Parent ID", "Category", "Type", "Gender", "Depth", "Descendants"]
+
+
+#The interface the pages use; returned DataFrames are shared and must be treated as read-only
+#A backend that misses one of the calls fails when it is created, not when a page first asks for it
+class DataBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def search(self, text):                       #Best matches for a name, abbreviation or ID, with latest ranking
+        ...
+
+    @abstractmethod
+    def latest_rankings(self):                    #Latest ranking week in rank order
+        ...
+
+    #Up to size rows of the latest ranking week after position `after`, indexed by position (1 = top rank)
+    @abstractmethod
+    def latest_rankings_page(self, after=0, size=RANKING_PAGE_SIZE):
+        ...
+
+    @abstractmethod
+    def latest_rankings_count(self):              #Number of rows in the latest ranking week
+        ...
+
+    @abstractmethod
+    def ranking_by_country(self):                 #Latest ranking week aggregated per country, most points first
+        ...
+
+    @abstractmethod
+    def ranking_weeks(self):                      #Every stored ranking week, newest first: [(year, week), ...]
+        ...
+
+    #One (usually past) ranking week in rank order, indexed by position (1 = top rank)
+    @abstractmethod
+    def week_rankings(self, year, week):
+        ...
+
+    @abstractmethod
+    def top_movers(self):                         #Up to 50 largest absolute movements of the latest week
+        ...
+
+    @abstractmethod
+    def country_list(self):                       #Sorted list of countries
+        ...
+
+    @abstractmethod
+    def competitors_by_country(self, country):    #Competitors of one country with their latest rank and points
+        ...
+
+    @abstractmethod
+    def country_stats(self):                      #Per-country aggregates of the latest week (country_rankings)
+        ...
+
+    @abstractmethod
+    def competitor_directory(self):               #directory.CompetitorDirectory: unique label <-> competitor_id
+        ...
+
+    #The next two take competitor IDs; the "Competitor" column / series labels are the directory labels
+    @abstractmethod
+    def comparison_latest(self, ids):             #Latest ranking of the given competitors
+        ...
+
+    @abstractmethod
+    def rank_series(self, ids):                   #timeseries.RankSeries: weekly rank and points of the given competitors
+        ...
+
+    @abstractmethod
+    def competition_tree(self):                   #hierarchy.CompetitionTree of every competition
+        ...
+
+    def stats(self):
+        return {"backend": self.name}
+
+    def close(self):
+        pass
+
+
+class SqlBackend(DataBackend):
+    name = "mysql"
+
+    def __init__(self, pool, cache):
+        self.pool = pool
+        self.cache = cache
+
+    #Runs a page query through the cache and returns a read-only DataFrame
+    def _read(self, sql, params=None, columns=None, ttl=None, prepare=None, tags=("rankings",)):
+        return cached_read(self.cache, self.pool, sql, params, columns=columns, ttl=ttl, tags=tags,
+                           prepare=prepare)
+
+    #Search index over competitors_table, cached like a query result (rebuilt after the ETL invalidates "rankings")
+    def search_index(self):
+        return self.cache.get_or_load(SOURCE_SQL, None, lambda: load_for_pool(self.pool),
+                                      ttl=TTL_LOOKUP, tags=("rankings",))
+
+    def search(self, text):
+        ids = self.search_index().search(text, SEARCH_LIMIT)
+        if not ids:
+            return pd.DataFrame(columns=SEARCH_COLUMNS)
+        order = {competitor_id: i for i, competitor_id in enumerate(ids)}
+        sql = queries.in_list(queries.SEARCH_BY_IDS, len(ids))
+        return self._read(sql, tuple(ids), SEARCH_COLUMNS, TTL_SEARCH,
+                          prepare=lambda df: df.sort_values("Competitor ID", key=lambda s: s.map(order),
+                                                            ignore_index=True))  #Keep the index ranking
+
+    def latest_rankings(self):
+        return self._read(queries.LATEST_RANKINGS_SNAPSHOT, columns=RANKING_COLUMNS, ttl=TTL_RANKINGS)
+
+    #Keyset page: the cursor is the last position of the previous page (positions are 1..n in rank order)
+    def latest_rankings_page(self, after=0, size=RANKING_PAGE_SIZE):
+        return self._read(queries.LATEST_RANKINGS_PAGE, (int(after), int(size)), ["Position"] + RANKING_COLUMNS,
+                          TTL_RANKINGS, prepare=lambda df: df.set_index("Position"))
+
+    def latest_rankings_count(self):
+        return int(self._read(queries.LATEST_RANKINGS_COUNT, columns=["rows"], ttl=TTL_RANKINGS)["rows"].iloc[0])
+
+    def ranking_by_country(self):
+        return self._read(queries.RANKING_BY_COUNTRY, columns=RANKING_COUNTRY_COLUMNS, ttl=TTL_RANKINGS)
+
+    def ranking_weeks(self):
+        weeks = self._read(queries.RANKING_WEEKS, columns=["year", "week"], ttl=TTL_RANKINGS)
+        return [(int(year), int(week)) for year, week in zip(weeks["year"], weeks["week"])]
+
+    def week_rankings(self, year, week):
+        return self._read(queries.RANKING_OVERVIEW, (int(year), int(week)), RANKING_COLUMNS, TTL_RANKINGS,
+                          prepare=lambda df: df.set_axis(pd.RangeIndex(1, len(df) + 1, name="Position")))
+
+    def top_movers(self):
+        return self._read(queries.TOP_MOVERS_SNAPSHOT, columns=TOP_MOVERS_COLUMNS, ttl=TTL_RANKINGS)
+
+    def country_list(self):
+        return self._read(queries.COUNTRY_LIST, columns=["country"], ttl=TTL_LOOKUP)["country"].tolist()
+
+    def competitors_by_country(self, country):
+        return self._read(queries.COMPETITORS_BY_COUNTRY, (country,), COUNTRY_COLUMNS, TTL_RANKINGS)
+
+    def country_stats(self):
+        return self._read(queries.COUNTRY_RANKINGS, columns=COUNTRY_STATS_COLUMNS, ttl=TTL_RANKINGS)
+
+    #Built once per data refresh: cached until the ETL invalidates "rankings"
+    def competitor_directory(self):
+        return self._read(queries.COMPETITOR_DIRECTORY, columns=DIRECTORY_COLUMNS, ttl=TTL_LOOKUP,
+                          prepare=CompetitorDirectory)
+
+    #IDs are sorted so the same selection in any order is one cache entry
+    def comparison_latest(self, ids):
+        ids = tuple(sorted(set(ids)))
+        if not ids:
+            return pd.DataFrame(columns=COMPARISON_COLUMNS)
+        directory = self.competitor_directory()
+        return self._read(queries.in_list(queries.COMPARISON_LATEST, len(ids)), ids,
+                          ["Competitor ID"] + COMPARISON_COLUMNS, TTL_RANKINGS,
+                          prepare=lambda df: with_labels(df, directory).drop(columns="Competitor ID"))
+
+    #Every selected competitor's series in one query, cached as a RankSeries
+    def rank_series(self, ids):
+        ids = tuple(sorted(set(ids)))
+        if not ids:
+            return RankSeries(pd.DataFrame(columns=SERIES_COLUMNS))
+        directory = self.competitor_directory()
+        return self._read(queries.in_list(queries.RANK_SERIES, len(ids)), ids, SERIES_COLUMNS, TTL_RANKINGS,
+                          prepare=lambda df: RankSeries(with_labels(df, directory)))
+
+    #The whole tree in one query, cached as a CompetitionTree (rebuilt after the ETL invalidates "competitions")
+    def competition_tree(self):
+        return self._read(queries.COMPETITION_TREE, columns=TREE_COLUMNS, ttl=TTL_LOOKUP,
+                          prepare=CompetitionTree, tags=("competitions",))
+
+    def stats(self):
+        return {"backend": self.name, **self.cache.stats()}
+
+
+#The "Competitor" column replaced by each competitor's directory label (unique even when names are shared)
+def with_labels(df, directory):
+    return df.assign(Competitor=df["Competitor ID"].map(directory.label))
+
+
+#Builds the backend named by kind ("mysql", "memory", "arrow" or "api"; "api" does not use the pool)
+def make_backend(kind, pool, cache):
+    if kind == "api":
+        from api_client import API_URL, ApiBackend, ApiClient
+        return ApiBackend(ApiClient(API_URL), cache)
+    if kind == "memory":
+        from memstore import MemoryBackend
+        return MemoryBackend(pool)
+    if kind == "arrow":
+        from arrow_snapshot import ArrowBackend
+        return ArrowBackend(pool)
+    if kind == "mysql":
+        return SqlBackend(pool, cache)
+    raise ValueError(f"Unknown backend {kind!r} (expected 'mysql', 'memory', 'arrow' or 'api')")
@@ -0,0 +1,220 @@
+# Historical backfill of the weekly doubles rankings
+# The rankings endpoint only returns the current week, so the database held whichever week the notebook was last
+# run on. backfill.py loads a range of past weeks:
+#   - the weekly payloads are read from an archive folder, one double_competitors_rankings_<year>-W<week>.json
+#     per week (benchmarks/synthetic.py --output writes the same names); with --live the missing weeks are first
+#     fetched concurrently through fetcher.py (rate-limited, retried) into that folder
+#   - JSON decoding and flattening run in a process pool, one week per task, so they are not bound to the GIL;
+#     the main process only writes to the database
+#   - each week is written as its own partition through the incremental ranking sync (bulk loader) and recorded
+#     in etl_watermark under BACKFILL_SOURCE: an interrupted backfill resumes with the first week not recorded
+#   - the ranking snapshots, the search index and the dashboards' Arrow snapshot are rebuilt once at the end, then
+#     the dashboards are told to drop their cached rankings (the pages always show the newest week stored,
+#     whatever order weeks arrive in)
+#
+# Usage:
+#   python backfill.py --sqlite data/sportanalytics.db --from 2024-W01 --to 2025-W16 --archive data/rankings_archive
+#   python backfill.py --mysql --from 2024-W01 --to 2024-W52 --workers 8
+#   SPORTRADAR_API_KEY=... python backfill.py --mysql --from 2024-W01 --to 2024-W52 --live --path "<path with {year} and {week}>"
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import json                      #Decoding the weekly payloads (in the worker processes)
+import os                        #Archive paths
+import re                        #Parsing "2025-W16"
+import sqlite3                   #Local SQLite stand-in
+import time                      #Parse / load timings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from itertools import islice
+
+import ingest                    #Parser, incremental ranking sync, watermarks
+from db_pool import DB_CONFIG, adapt_sql
+from migrate import migrate
+from snapshots import refresh_snapshots
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "rankings_archive")
+WEEK_FILE = "double_competitors_rankings_{year}-W{week:02d}.json"
+BACKFILL_SOURCE = "double_competitors_rankings_backfill"   #etl_watermark.source of each backfilled week
+WORKERS = os.cpu_count() or 2    #Parser processes
+AHEAD = 2                        #Weeks parsed ahead of the loader per worker (bounds the rows held in memory)
+
+COMPLETED_WEEKS_SQL = "SELECT DISTINCT year, week FROM etl_watermark WHERE source = %s AND year IS NOT NULL"
+
+
+#"2025-W16" -> (2025, 16)
+def parse_week(text):
+    match = re.fullmatch(r"(\d{4})-?W?(\d{1,2})", text.strip(), re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"expected a week like 2025-W16, got {text!r}")
+    year, week = int(match.group(1)), int(match.group(2))
+    try:
+        date.fromisocalendar(year, week, 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{year} has no ISO week {week}")
+    return year, week
+
+
+#Every ISO week from first to last, both included: [(year, week), ...]
+def week_range(first, last):
+    day, end = date.fromisocalendar(*first, 1), date.fromisocalendar(*last, 1)
+    weeks = []
+    while day <= end:
+        weeks.append(tuple(day.isocalendar())[:2])
+        day += timedelta(weeks=1)
+    return weeks
+
+
+def week_path(archive, year, week):
+    return os.path.join(archive, WEEK_FILE.format(year=year, week=week))
+
+
+#Weeks already backfilled (recorded in etl_watermark by an earlier run): {(year, week), ...}
+def completed_weeks(conn, dialect="mysql"):
+    cursor = conn.cursor()
+    cursor.execute(adapt_sql(COMPLETED_WEEKS_SQL, dialect), (BACKFILL_SOURCE,))
+    done = {tuple(row) for row in cursor.fetchall()}
+    cursor.close()
+    return done
+
+
+#Worker process: decode one weekly payload and flatten it to rows of that week only
+#Returns (year, week, generated_at, ranking rows, competitor rows, rows of other weeks dropped)
+def parse_week_file(path, year, week):
+    with open(path, "rb") as f:
+        data = json.loads(f.read())
+    ranking_rows, competitor_rows = ingest.parse_rankings(data)
+    kept = [row for row in ranking_rows if (row[1], row[2]) == (year, week)]
+    ids = {row[0] for row in kept}
+    competitors = [row for row in competitor_rows if row[0] in ids]
+    return year, week, data.get("generated_at"), kept, competitors, len(ranking_rows) - len(kept)
+
+
+#Fetches the given weeks concurrently (fetcher.py: shared rate limiter, retries) and saves them in the archive
+#path_template: API path of one archived week, with {year} and {week}; returns the weeks that failed
+def fetch_weeks(weeks, archive, path_template, access_level="trial"):
+    import asyncio
+    from fetcher import SportradarFetcher
+
+    async def run():
+        fetcher = SportradarFetcher(access_level=access_level)
+        try:
+            return await fetcher.fetch_many([path_template.format(year=y, week=w) for y, w in weeks])
+        finally:
+            await fetcher.close()
+
+    os.makedirs(archive, exist_ok=True)
+    failed = []
+    for (year, week), result in zip(weeks, asyncio.run(run())):
+        if isinstance(result, Exception):
+            print(f"{year}-W{week:02d}: {result}")
+            failed.append((year, week))
+            continue
+        with open(week_path(archive, year, week), "w", encoding="utf-8") as f:
+            json.dump(result.data, f)
+    return failed
+
+
+#Loads every week of `weeks` found in the archive and not backfilled yet, oldest first
+#Returns (ingest stats per table, summary dict)
+def backfill(conn, weeks, archive=ARCHIVE_DIR, dialect="mysql", workers=WORKERS, chunk_size=ingest.CHUNK_SIZE):
+    done = completed_weeks(conn, dialect)
+    todo = [w for w in weeks if w not in done]
+    missing = [w for w in todo if not os.path.exists(week_path(archive, *w))]
+    todo = [w for w in todo if w not in missing]
+    summary = {"weeks": len(weeks), "already done": len(weeks) - len(todo) - len(missing),
+               "missing": missing, "loaded": 0, "rows": 0, "rows changed": 0, "dropped": 0, "load seconds": 0.0}
+    stats = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit(year_week):
+            return pool.submit(parse_week_file, week_path(archive, *year_week), *year_week)
+
+        pending = iter(todo)
+        queue = deque(submit(w) for w in islice(pending, workers * AHEAD))
+        while queue:
+            year, week, generated_at, ranking_rows, competitor_rows, dropped = queue.popleft().result()
+            following = next(pending, None)
+            if following:  #Keep the pool busy while this week is written
+                queue.append(submit(following))
+            start = time.perf_counter()
+            if ranking_rows:
+                week_stats = ingest.sync_ranking_batches(conn, [(ranking_rows, competitor_rows)], generated_at,
+                                                         dialect, chunk_size, snapshots=False, source=BACKFILL_SOURCE)
+            else:  #Nothing ranked that week: still recorded, so it is not read again
+                ingest.record_watermark(conn, BACKFILL_SOURCE, year, week, generated_at, 0, 0, dialect)
+                week_stats = []
+            summary["load seconds"] += time.perf_counter() - start
+            summary["loaded"] += 1
+            summary["rows"] += len(ranking_rows)
+            summary["rows changed"] += sum(s["rows"] for s in week_stats)
+            summary["dropped"] += dropped
+            stats += week_stats
+            print(f"{year}-W{week:02d}: {len(ranking_rows)} rows, "
+                  f"{sum(s['rows'] for s in week_stats)} changed", flush=True)
+    stats = ingest.merge_stats(["competitor_ranking_table", "competitors_table"], stats) if stats else []
+    return stats, summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill a range of weekly doubles rankings (resumable)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="load into a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="load into MySQL (db_pool.DB_CONFIG)")
+    parser.add_argument("--from", dest="first", type=parse_week, required=True, metavar="YEAR-Wnn")
+    parser.add_argument("--to", dest="last", type=parse_week, required=True, metavar="YEAR-Wnn")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="folder with one rankings payload per week")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="parser processes")
+    parser.add_argument("--chunk-size", type=int, default=ingest.CHUNK_SIZE)
+    parser.add_argument("--live", action="store_true", help="fetch the weeks missing from --archive first")
+    parser.add_argument("--path", help="with --live: API path of one archived week, with {year} and {week}")
+    parser.add_argument("--access-level", default="trial", help="Sportradar access level for --live")
+    args = parser.parse_args(argv)
+    if args.first > args.last:
+        parser.error("--from is after --to")
+    if args.live and not args.path:
+        parser.error("--live needs --path")
+
+    weeks = week_range(args.first, args.last)
+    if args.sqlite:
+        conn, dialect = sqlite3.connect(args.sqlite), "sqlite"
+    else:
+        import mysql.connector
+        conn, dialect = mysql.connector.connect(**DB_CONFIG), "mysql"
+    try:
+        migrate(conn, dialect)
+        if args.live:
+            done = completed_weeks(conn, dialect)
+            to_fetch = [w for w in weeks if w not in done and not os.path.exists(week_path(args.archive, *w))]
+            if to_fetch:
+                failed = fetch_weeks(to_fetch, args.archive, args.path, args.access_level)
+                print(f"fetched {len(to_fetch) - len(failed)} of {len(to_fetch)} weeks into {args.archive}")
+
+        start = time.perf_counter()
+        stats, summary = backfill(conn, weeks, args.archive, dialect, args.workers, args.chunk_size)
+        seconds = time.perf_counter() - start
+        if summary["rows changed"]:
+            stats += refresh_snapshots(conn, dialect)
+            stats.append(ingest.build_search_index(conn, dialect))
+            from arrow_snapshot import publish  #Not imported by the parser processes
+            stats.append(publish(conn, dialect))
+    finally:
+        conn.close()
+
+    if summary["rows changed"]:
+        from query_cache import notify_invalidation
+        notify_invalidation(("rankings",))
+    ingest.print_report(stats)
+    print(f"\n{summary['loaded']} weeks loaded ({summary['rows']} rows, {summary['rows changed']} changed) in "
+          f"{seconds:.3f} s, {summary['load seconds']:.3f} s of it writing; {summary['already done']} of "
+          f"{summary['weeks']} weeks already backfilled")
+    if summary["dropped"]:
+        print(f"{summary['dropped']} rows of other weeks found in the weekly files were skipped")
+    if summary["missing"]:
+        print(f"{len(summary['missing'])} weeks not in {args.archive}: "
+              + ", ".join(f"{y}-W{w:02d}" for y, w in summary["missing"][:10])
+              + (" ..." if len(summary["missing"]) > 10 else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# Load test: the read API (api_server.py) under --clients concurrent keep-alive clients
+# Builds a SQLite stand-in database with --weeks weeks x --competitors competitors of synthetic rankings
+# (benchmarks/synthetic.py) and starts api_server.py on it (backend "mysql": page queries through the pool and the
+# query cache) once with single-flight coalescing and once with --no-coalesce, then runs:
+#   burst:       the query cache is invalidated (query_cache.notify_invalidation on the server's stamp file) and
+#                every client sends the same request at once; database queries = query cache misses on the server
+#   throughput:  every client sends a mix of endpoints (latest page, week, country, search, comparison, trend,
+#                movers, ...) for --seconds seconds, in JSON and in Arrow; requests/s and p50 / p99 latency
+# The clients are asyncio streams in this process (one keep-alive connection each)
+# Results go to benchmarks/api_load.md
+#
+# Usage:
+#   python benchmarks/api_load.py
+#   python benchmarks/api_load.py --clients 200 --seconds 10 --competitors 5000 --weeks 104
+
+# Importing Required Libraries
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from arrow_snapshot_memory import build_database
+from query_cache import notify_invalidation
+
+REPORT_PATH = os.path.join(ROOT, "benchmarks", "api_load.md")
+BURST_PATHS = ["/rankings/latest?after=0&size=100", "/rankings/by-country", "/movers", "/countries/stats"]
+MAX_TREND = 20                   #Competitors in the burst's trend request
+HOST = "127.0.0.1"
+
+
+#One keep-alive HTTP/1.1 connection
+class Client:
+    def __init__(self, port, accept):
+        self.port = port
+        self.accept = accept
+        self.reader = self.writer = None
+
+    async def get(self, target):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(HOST, self.port)
+        self.writer.write(f"GET {target} HTTP/1.1\r\nHost: {HOST}\r\nAccept: {self.accept}\r\n\r\n".encode())
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        length = next(int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                      if line.lower().startswith(b"content-length:"))
+        body = await self.reader.readexactly(length)
+        if status != 200:
+            raise RuntimeError(f"{target}: {status} {body[:200]!r}")
+        return body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def connect_all(port, count, accept):
+    clients = [Client(port, accept) for _ in range(count)]
+    await asyncio.gather(*(c.get("/health") for c in clients))  #Open every connection before timing
+    return clients
+
+
+async def server_stats(port):
+    client = Client(port, "application/json")
+    try:
+        return json.loads(await client.get("/stats"))
+    finally:
+        client.close()
+
+
+#Every client sends the same request at once, right after the cache was invalidated
+async def burst(port, clients, label, path, stamp):
+    before = await server_stats(port)
+    notify_invalidation(path=stamp)
+    start = time.perf_counter()
+
+    async def one(client):
+        t = time.perf_counter()
+        await client.get(path)
+        return time.perf_counter() - t
+
+    latencies = await asyncio.gather(*(one(c) for c in clients))
+    seconds = time.perf_counter() - start
+    after = await server_stats(port)
+    return {
+        "path": label,
+        "queries": after["backend"]["misses"] - before["backend"]["misses"],
+        "backend_calls": after["backend_calls"] - before["backend_calls"],
+        "seconds": seconds,
+        "p99_ms": statistics.quantiles(latencies, n=100)[98] * 1000,
+    }
+
+
+#Random request targets of what the pages ask for
+def targets(rng, weeks, countries, ids):
+    year, week = rng.choice(weeks)
+    picked = ",".join(sorted(rng.sample(ids, 3)))
+    return rng.choice([
+        f"/rankings/latest?after={rng.randrange(0, 10) * 100}&size=100",
+        f"/rankings/week?year={year}&week={week}",
+        f"/countries/competitors?country={rng.choice(countries).replace(' ', '%20')}",
+        f"/search?q={rng.choice(['an', 'ka', 'lo', 'ma', 'ov', 'si'])}",
+        f"/competitors/latest?ids={picked}",
+        f"/competitors/trend?ids={picked}",
+        "/movers",
+        "/rankings/by-country",
+        "/countries/stats",
+    ])
+
+
+async def throughput(clients, seconds, weeks, countries, ids):
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def run(client, seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            t = time.perf_counter()
+            await client.get(targets(rng, weeks, countries, ids))
+            latencies.append(time.perf_counter() - t)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(c, n) for n, c in enumerate(clients)))
+    elapsed = time.perf_counter() - start
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {"requests": len(latencies), "rps": len(latencies) / elapsed,
+            "p50_ms": percentiles[49] * 1000, "p99_ms": percentiles[98] * 1000}
+
+
+def start_server(db, port, coalesce, env):
+    command = [sys.executable, os.path.join(ROOT, "api_server.py"), "--sqlite", db, "--backend", "mysql",
+               "--port", str(port)] + ([] if coalesce else ["--no-coalesce"])
+    server = subprocess.Popen(command, env=env, stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()  #"Serving ... on http://..." once it listens
+    return server
+
+
+async def run_mode(args, db, port, coalesce, env, lookups):
+    server = start_server(db, port, coalesce, env)
+    try:
+        json_clients = await connect_all(port, args.clients, "application/json")
+        arrow_clients = await connect_all(port, args.clients, "application/vnd.apache.arrow.stream")
+        weeks, _, ids = lookups
+        paths = [(path, path) for path in BURST_PATHS] + [
+            (f"/rankings/week?year={weeks[0][0]}&week={weeks[0][1]}",) * 2,
+            (f"/competitors/trend?ids=<{MAX_TREND} ids>", f"/competitors/trend?ids={','.join(sorted(ids[:MAX_TREND]))}"),
+        ]
+        bursts = [await burst(port, json_clients, label, path, env["TENNIS_CACHE_STAMP"]) for label, path in paths]
+        loads = {"json": await throughput(json_clients, args.seconds, *lookups),
+                 "arrow": await throughput(arrow_clients, args.seconds, *lookups)}
+        for client in json_clients + arrow_clients:
+            client.close()
+        return bursts, loads
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent clients against the read API, coalescing on and off")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--competitors", type=int, default=2000)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--port", type=int, default=8690)
+    parser.add_argument("--output", default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = os.path.join(folder, "rankings.db")
+        conn = build_database(db, args.competitors, args.weeks)
+        rows = conn.execute("SELECT COUNT(*) FROM competitor_ranking_table").fetchone()[0]
+        weeks = [tuple(r) for r in conn.execute("SELECT DISTINCT year, week FROM competitor_ranking_table")]
+        countries = [r[0] for r in conn.execute("SELECT DISTINCT country FROM competitors_table")]
+        ids = [r[0] for r in conn.execute("SELECT competitor_id FROM competitors_table")]
+        conn.close()
+        env = dict(os.environ, TENNIS_CACHE_STAMP=os.path.join(folder, "stamp.json"))
+        results = {}
+        for coalesce in (True, False):
+            mode = "coalescing" if coalesce else "no coalescing"
+            results[mode] = asyncio.run(run_mode(args, db, args.port, coalesce, env, (weeks, countries, ids)))
+            bursts, loads = results[mode]
+            print(f"{mode}: burst queries {[b['queries'] for b in bursts]}, "
+                  + ", ".join(f"{fmt} {load['rps']:.0f} req/s p99 {load['p99_ms']:.1f} ms" for fmt, load in loads.items()))
+
+    lines = [
+        "# Read API under concurrent clients",
+        "",
+        f"Generated by `python benchmarks/api_load.py` on the SQLite stand-in with {args.weeks} weeks x",
+        f"{args.competitors} competitors ({rows} ranking rows). api_server.py runs the SQL backend (pool of the",
+        f"default size, query cache) and {args.clients} keep-alive clients connect at once.",
+        "",
+        "## Burst after a cache invalidation",
+        "",
+        f"The query cache is invalidated, then all {args.clients} clients send the same request at the same moment.",
+        "Database queries are the query cache misses on the server (a trend request also reloads the competitor",
+        "directory it labels the series with: two queries). Without coalescing the concurrent misses are bounded by",
+        "the server's worker threads.",
+        "",
+        "| Endpoint | mode | DB queries | backend calls | burst ms | p99 ms |",
+        "|---|---|---:|---:|---:|---:|",
+    ]
+    for mode, (bursts, _) in results.items():
+        for b in bursts:
+            lines.append(f"| `{b['path']}` | {mode} | {b['queries']} | {b['backend_calls']} | "
+                         f"{b['seconds'] * 1000:.1f} | {b['p99_ms']:.1f} |")
+    lines += [
+        "",
+        "## Throughput",
+        "",
+        f"Each client sends a random mix of the page requests for {args.seconds:g} s.",
+        "",
+        "| mode | format | requests | req/s | p50 ms | p99 ms |",
+        "|---|---|---:|---:|---:|---:|",
+    ]
+    for mode, (_, loads) in results.items():
+        for fmt, load in loads.items():
+            lines.append(f"| {mode} | {fmt} | {load['requests']} | {load['rps']:.0f} | {load['p50_ms']:.1f} | "
+                         f"{load['p99_ms']:.1f} |")
+    report = "\n".join(lines) + "\n"
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
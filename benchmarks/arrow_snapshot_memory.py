@@ -0,0 +1,164 @@
+# Memory benchmark: dashboard worker processes on the memory backend vs the mapped Arrow snapshot
+# Builds a SQLite stand-in database with --weeks weeks x --competitors competitors of synthetic rankings
+# (benchmarks/synthetic.py), publishes an Arrow snapshot of it, then for each backend starts --workers worker
+# processes at once. Each worker builds the backend (TENNIS_BACKEND=memory or arrow) and serves --sessions
+# simulated sessions (every page's backend calls with different weeks, competitors, countries and searches),
+# reporting its memory after 1, 10 and all sessions:
+#   private: RssAnon, memory only this process uses
+#   mapped:  RssFile, file pages (the snapshot) shared with the other workers through the page cache
+#   PSS:     proportional set size, the shared pages divided among the processes that map them
+# Results go to benchmarks/arrow_snapshot_memory.md (Linux: reads /proc/self/status and smaps_rollup)
+#
+# Usage:
+#   python benchmarks/arrow_snapshot_memory.py
+#   python benchmarks/arrow_snapshot_memory.py --competitors 10000 --weeks 104 --workers 4 --sessions 200
+
+# Importing Required Libraries
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+REPORT_PATH = os.path.join(ROOT, "benchmarks", "arrow_snapshot_memory.md")
+BACKENDS = ["memory", "arrow"]
+
+
+#{"private": MB, "mapped": MB, "pss": MB} of this process
+def memory_mb():
+    values = {}
+    for path in ("/proc/self/status", "/proc/self/smaps_rollup"):
+        with open(path) as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("RssAnon", "RssFile", "Pss"):
+                    values[key] = int(rest.split()[0]) / 1024
+    return {"private": values["RssAnon"], "mapped": values["RssFile"], "pss": values["Pss"]}
+
+
+def build_database(path, competitors, weeks):
+    import synthetic
+    from ingest import parse_rankings, sync_ranking_batches
+    from migrate import migrate
+    from snapshots import refresh_snapshots
+    conn = sqlite3.connect(path)
+    migrate(conn, "sqlite")
+    for payload in synthetic.rankings_payloads(random.Random("arrow-snapshot"), competitors, weeks):
+        sync_ranking_batches(conn, [parse_rankings(payload)], payload["generated_at"], "sqlite", chunk_size=10000,
+                             snapshots=False)
+    refresh_snapshots(conn, "sqlite")
+    return conn
+
+
+#One simulated session: what the pages ask the backend for
+def session(backend, rng):
+    weeks = backend.ranking_weeks()
+    ids = backend.competitor_directory().ids
+    backend.latest_rankings_page(rng.randrange(0, 1000), 100)
+    backend.ranking_by_country()
+    backend.top_movers()
+    backend.week_rankings(*rng.choice(weeks))
+    backend.competitors_by_country(rng.choice(backend.country_list()))
+    backend.country_stats()
+    backend.search(rng.choice(["an", "ka", "lo", "ma", "ov", "si"]))
+    picked = rng.sample(ids, 5)
+    backend.comparison_latest(picked)
+    backend.rank_series(picked)
+    backend.competition_tree()
+
+
+#Worker process: build the backend, serve the sessions, print the memory readings, wait for the parent
+def worker(kind, db, sessions):
+    from db_pool import ConnectionPool, sqlite_factory
+    pool = ConnectionPool(sqlite_factory(db), size=2, dialect="sqlite")
+    if kind == "arrow":
+        from arrow_snapshot import ArrowBackend
+        backend = ArrowBackend(pool, background=False)
+    else:
+        from memstore import MemoryBackend
+        backend = MemoryBackend(pool, background=False)
+    rng = random.Random(os.getpid())
+    readings = {"loaded": memory_mb()}
+    for n in range(1, sessions + 1):
+        session(backend, rng)
+        if n in (1, 10, sessions):
+            readings[f"{n} sessions"] = memory_mb()
+    print(json.dumps(readings), flush=True)
+    sys.stdin.readline()  #Stay alive (and mapped) until every worker has reported
+
+
+def run_workers(kind, db, count, sessions, env):
+    procs = [subprocess.Popen([sys.executable, os.path.abspath(__file__), "--worker", kind, "--db", db,
+                               "--sessions", str(sessions)],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, env=env)
+             for _ in range(count)]
+    readings = [json.loads(p.stdout.readline()) for p in procs]
+    for p in procs:
+        p.communicate("\n")
+    return readings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-worker memory: memory backend vs mapped Arrow snapshot")
+    parser.add_argument("--competitors", type=int, default=10000)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--output", default=REPORT_PATH)
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker:
+        return worker(args.worker, args.db, args.sessions)
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = os.path.join(folder, "rankings.db")
+        start = time.perf_counter()
+        conn = build_database(db, args.competitors, args.weeks)
+        env = dict(os.environ, TENNIS_ARROW_DIR=os.path.join(folder, "arrow"))  #Where the workers look
+        from arrow_snapshot import publish
+        published = publish(conn, "sqlite", env["TENNIS_ARROW_DIR"])
+        rows = conn.execute("SELECT COUNT(*) FROM competitor_ranking_table").fetchone()[0]
+        conn.close()
+        print(f"database built in {time.perf_counter() - start:.1f} s ({rows} ranking rows), "
+              f"snapshot: {published['method']}")
+        results = {}
+        for kind in BACKENDS:
+            results[kind] = run_workers(kind, db, args.workers, args.sessions, env)
+            last = results[kind][0][f"{args.sessions} sessions"]
+            print(f"{kind}: worker 1 private {last['private']:.1f} MB, mapped {last['mapped']:.1f} MB, "
+                  f"PSS {last['pss']:.1f} MB")
+
+    lines = [
+        "# Dashboard worker memory: memory backend vs mapped Arrow snapshot",
+        "",
+        f"Generated by `python benchmarks/arrow_snapshot_memory.py` on the SQLite stand-in with {args.weeks} weeks x",
+        f"{args.competitors} competitors ({rows} ranking rows; snapshot {published['method']}).",
+        f"{args.workers} worker processes per backend run at the same time, each serving {args.sessions} simulated",
+        "sessions. MB per worker, averaged over the workers. \"private\" is RssAnon, \"mapped\" is RssFile (page cache",
+        "shared by the workers), PSS counts each shared page once across the processes that map it.",
+        "",
+        "| Backend | after | private MB | mapped MB | PSS MB |",
+        "|---|---|---:|---:|---:|",
+    ]
+    for kind, readings in results.items():
+        for point in readings[0]:
+            values = [r[point] for r in readings]
+            private, mapped, pss = (sum(v[key] for v in values) / len(values) for key in ("private", "mapped", "pss"))
+            lines.append(f"| {kind} | {point} | {private:.1f} | {mapped:.1f} | {pss:.1f} |")
+    report = "\n".join(lines) + "\n"
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# EXPLAIN report for the dashboard page queries: original layout vs the indexed (year, week) layout
+# Builds two SQLite stand-in databases from the saved fixtures, runs every page query on both and writes
+# the query plans and timings to benchmarks/explain_report.md
+#
+# Usage:
+#   python benchmarks/explain_report.py                 (SQLite before/after, rewrites explain_report.md)
+#   python benchmarks/explain_report.py --runs 5        (simulate 5 appended notebook runs in the "before" database)
+#   python benchmarks/explain_report.py --mysql         (also EXPLAIN the new queries on the live MySQL database)
+
+# Importing Required Libraries
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import queries                                   #New page queries
+from db_pool import adapt_sql
+from ingest import parse_rankings, read_payload, sync_rankings, RANKINGS_FILE
+from migrate import migrate
+
+REPORT_PATH = os.path.join(ROOT, "benchmarks", "explain_report.md")
+
+#Original layout created by the DOUBLES COMPETITOR RANKINGS notebook (no keys, no indexes)
+LEGACY_DDL = [
+    """CREATE TABLE competitor_ranking_table (
+        rank_id INT, ranks INT, movement INT, points INT, competitions_played INT, competitor_id VARCHAR(255))""",
+    """CREATE TABLE competitors_table (
+        competitor_id VARCHAR(255), name VARCHAR(255), country VARCHAR(255), week VARCHAR(50),
+        country_code VARCHAR(10), abbreviation VARCHAR(10))""",
+]
+
+#Original page queries from tennis_analytics.py (MySQL "#" comments removed so SQLite can run them)
+LEGACY_QUERIES = {
+    "Search": ("""
+        SELECT DISTINCT co.competitor_id, co.name, co.country, co.country_code, co.abbreviation,
+               r.ranks, r.points, r.movement, r.competitions_played
+        FROM competitors_table co
+        LEFT JOIN competitor_ranking_table r ON co.competitor_id = r.competitor_id
+        WHERE co.name LIKE '%Pav%' OR co.competitor_id LIKE '%Pav%'
+    """, None),
+    "Ranking Overview": ("""
+        SELECT cr.ranks, cr.movement, cr.points, co.name AS competitor_name, co.country, co.week
+        FROM competitor_ranking_table cr
+        JOIN competitors_table co ON cr.competitor_id = co.competitor_id
+        WHERE co.week = 16
+        ORDER BY cr.ranks ASC
+    """, None),
+    "Top Movers": ("""
+        SELECT cr.ranks, cr.movement, cr.points, co.name AS competitor_name, co.country, co.week
+        FROM competitor_ranking_table cr
+        JOIN (SELECT competitor_id, MAX(week) AS latest_week FROM competitors_table GROUP BY competitor_id) latest
+            ON cr.competitor_id = latest.competitor_id
+        JOIN competitors_table co ON co.competitor_id = cr.competitor_id AND co.week = latest.latest_week
+        WHERE cr.movement IS NOT NULL
+        ORDER BY ABS(cr.movement) DESC
+        LIMIT 50
+    """, None),
+    "Country list": ("SELECT DISTINCT country FROM competitors_table", None),
+    "Competitors by country": ("""
+        SELECT co.competitor_id, co.name, MAX(cr.ranks) AS rank, MAX(cr.points) AS points
+        FROM competitors_table co
+        JOIN competitor_ranking_table cr ON co.competitor_id = cr.competitor_id
+        WHERE co.country = %s
+        GROUP BY co.competitor_id, co.name
+        ORDER BY rank ASC
+    """, ("Italy",)),
+    "Comparison (latest)": ("""
+        SELECT co.name, co.country, co.country_code, co.abbreviation,
+               cr.ranks, cr.points, cr.movement, cr.competitions_played
+        FROM competitors_table co
+        JOIN competitor_ranking_table cr ON co.competitor_id = cr.competitor_id
+        WHERE (co.name = %s OR co.name = %s)
+          AND co.week = (SELECT MAX(week) FROM competitors_table co2 WHERE co2.name = co.name)
+    """, ("Pavic, Mate", "Bolelli, Simone")),
+    "Rank trend": ("""
+        SELECT DISTINCT co.name, co.week, cr.ranks
+        FROM competitors_table co
+        JOIN competitor_ranking_table cr ON co.competitor_id = cr.competitor_id
+        WHERE co.name IN (%s, %s)
+        ORDER BY co.name, co.week
+    """, ("Pavic, Mate", "Bolelli, Simone")),
+}
+
+#The same pages on the new layout
+NEW_QUERIES = {
+    "Search": (queries.in_list(queries.SEARCH_BY_IDS, 2),
+               ("sr:competitor:49363", "sr:competitor:59324")),  #IDs the search index returns for "Pav"
+    "Ranking Overview": (queries.RANKING_OVERVIEW, (2025, 16)),
+    "Top Movers": (queries.TOP_MOVERS, (2025, 16)),
+    "Country list": (queries.COUNTRY_LIST, None),
+    "Competitors by country": (queries.COMPETITORS_BY_COUNTRY, ("Italy",)),
+    "Comparison (latest)": (queries.in_list(queries.COMPARISON_LATEST, 2),
+                            ("sr:competitor:49363", "sr:competitor:15310")),  #Pavic, Mate and Bolelli, Simone
+    "Rank trend": (queries.in_list(queries.RANK_SERIES, 2), ("sr:competitor:49363", "sr:competitor:15310")),
+}
+
+
+#"Before" database: the original tables, with the full snapshot appended once per notebook run
+def build_legacy(path, data, runs):
+    conn = sqlite3.connect(path)
+    for ddl in LEGACY_DDL:
+        conn.execute(ddl)
+    ranking_rows, competitor_rows = parse_rankings(data)
+    weeks = {row[0]: row[2] for row in ranking_rows}
+    for _ in range(runs):
+        conn.executemany("INSERT INTO competitor_ranking_table VALUES (?, ?, ?, ?, ?, ?)",
+                         [(i + 1, r[3], r[4], r[5], r[6], r[0]) for i, r in enumerate(ranking_rows)])
+        conn.executemany("INSERT INTO competitors_table VALUES (?, ?, ?, ?, ?, ?)",
+                         [(c[0], c[1], c[2], str(weeks[c[0]]), c[3], c[4]) for c in competitor_rows])
+    conn.commit()
+    return conn
+
+
+#"After" database: current schema, loaded through the incremental sync
+def build_indexed(path, data):
+    conn = sqlite3.connect(path)
+    migrate(conn, "sqlite")
+    sync_rankings(conn, data, "sqlite")
+    return conn
+
+
+def explain(conn, sql, params):
+    rows = conn.execute("EXPLAIN QUERY PLAN " + adapt_sql(sql, "sqlite"), params or ()).fetchall()
+    return [row[-1] for row in rows]
+
+
+def time_query(conn, sql, params, repeat=50):
+    sql = adapt_sql(sql, "sqlite")
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = conn.execute(sql, params or ()).fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, len(result)
+
+
+def mysql_explain():
+    import mysql.connector
+    from db_pool import DB_CONFIG
+    conn = mysql.connector.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    lines = ["", "## MySQL EXPLAIN (new queries, live database)", ""]
+    for page, (sql, params) in NEW_QUERIES.items():
+        cursor.execute("EXPLAIN " + sql, params)
+        columns = [c[0] for c in cursor.description]
+        lines += [f"### {page}", "", "| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+        lines += ["| " + " | ".join(str(v) for v in row) + " |" for row in cursor.fetchall()]
+        lines.append("")
+    conn.close()
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN the dashboard queries before/after the indexed schema")
+    parser.add_argument("--runs", type=int, default=5, help="notebook runs appended in the 'before' database")
+    parser.add_argument("--mysql", action="store_true", help="also EXPLAIN the new queries on MySQL")
+    parser.add_argument("--output", default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    data = read_payload(RANKINGS_FILE)
+    with tempfile.TemporaryDirectory() as tmp:
+        before = build_legacy(os.path.join(tmp, "before.db"), data, args.runs)
+        after = build_indexed(os.path.join(tmp, "after.db"), data)
+
+        lines = [
+            "# Dashboard query plans: original layout vs indexed (year, week) layout",
+            "",
+            "Generated by `python benchmarks/explain_report.py` on the SQLite stand-in, using the saved",
+            f"rankings fixture. The \"before\" database holds {args.runs} appended notebook runs (no keys, no indexes);",
+            "the \"after\" database is the current schema loaded through the incremental sync.",
+            "Timings are the median of 50 runs.",
+            "",
+            "| Page query | rows before | ms before | rows after | ms after |",
+            "|---|---:|---:|---:|---:|",
+        ]
+        plans = []
+        for page in NEW_QUERIES:
+            old_ms, old_rows = time_query(before, *LEGACY_QUERIES[page])
+            new_ms, new_rows = time_query(after, *NEW_QUERIES[page])
+            lines.append(f"| {page} | {old_rows} | {old_ms:.3f} | {new_rows} | {new_ms:.3f} |")
+            plans += [f"### {page}", "", "Before:", "```"] + explain(before, *LEGACY_QUERIES[page]) + ["```", "",
+                      "After:", "```"] + explain(after, *NEW_QUERIES[page]) + ["```", ""]
+        lines += ["", "## Query plans (EXPLAIN QUERY PLAN)", ""] + plans
+        before.close()
+        after.close()
+
+    if args.mysql:
+        lines += mysql_explain()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines).rstrip() + "\n")
+    print("\n".join(lines[:9 + len(NEW_QUERIES)]))
+    print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# Import-time profile of the dashboard: cold start and warm rerun latency per page
+# Each page is opened first in a fresh Python process running under `-X importtime`, the way a new Streamlit
+# server process meets its first visitor: the first script run ("cold") pays for every module the page imports.
+# The same process then reruns the page a few times ("warm": modules and shared caches already loaded).
+# Streamlit itself is imported before the clock starts, as it is in a running server.
+# The app runs against a synthetic SQLite database (TENNIS_SQLITE_PATH) with one ranking week of --competitors rows
+# Results go to benchmarks/import_profile.md
+#
+# Usage:
+#   python benchmarks/import_profile.py
+#   python benchmarks/import_profile.py --pages Home "Ranking Overview" --warm-runs 10
+#   python benchmarks/import_profile.py --script path/to/other_app.py        (profile another version of the app)
+
+# Importing Required Libraries
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+REPORT_PATH = os.path.join(ROOT, "benchmarks", "import_profile.md")
+APP_PATH = os.path.join(ROOT, "tennis_analytics.py")
+START_MARKER = "import_profile: start"
+END_MARKER = "import_profile: end"
+TOP_IMPORTS = 4
+
+
+#Child process: opens one page, then reruns it; prints {"cold_ms", "warm_ms", "modules"} as JSON
+def run_child(script, page, warm_runs):
+    from streamlit.testing.v1 import AppTest   #Streamlit is already loaded in a running server
+    before = set(sys.modules)
+    at = AppTest.from_file(script, default_timeout=120)
+    at.session_state["page"] = page           #The sidebar radio's key: open this page on the first run
+
+    print(START_MARKER, file=sys.stderr, flush=True)
+    start = time.perf_counter()
+    at.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+    print(END_MARKER, file=sys.stderr, flush=True)
+    modules = len(set(sys.modules) - before)
+
+    warm = []
+    for _ in range(warm_runs):
+        start = time.perf_counter()
+        at.run()
+        warm.append((time.perf_counter() - start) * 1000)
+    errors = [e.value for e in at.error] + [str(e.value) for e in at.exception]
+    print(json.dumps({"cold_ms": cold_ms, "warm_ms": statistics.median(warm), "modules": modules, "errors": errors}))
+
+
+#-X importtime lines between the markers -> (total ms, [(top-level module, ms)] heaviest first)
+#Only top-level entries are summed: their cumulative time already includes everything they import
+def parse_importtime(stderr):
+    inside, top = False, []
+    for line in stderr.splitlines():
+        if line.startswith(START_MARKER):
+            inside = True
+        elif line.startswith(END_MARKER):
+            break
+        elif inside and line.startswith("import time:"):
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit() and not name.startswith("  "):
+                top.append((name.strip(), int(cumulative) / 1000))
+    top.sort(key=lambda item: -item[1])
+    return sum(ms for _, ms in top), top
+
+
+def profile_page(script, page, warm_runs, env):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child", page,
+         "--script", os.path.abspath(script), "--warm-runs", str(warm_runs)],
+        capture_output=True, text=True, env=env, cwd=ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{page}: profile run failed\n{result.stderr[-2000:]}")
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    stats["import_ms"], stats["top"] = parse_importtime(result.stderr)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start and warm rerun latency of each dashboard page")
+    parser.add_argument("--script", default=APP_PATH, help="Streamlit script to profile")
+    parser.add_argument("--pages", nargs="+", help="pages to profile (default: every page)")
+    parser.add_argument("--competitors", type=int, default=2000, help="rows in the synthetic ranking week")
+    parser.add_argument("--warm-runs", type=int, default=5)
+    parser.add_argument("--output", default=REPORT_PATH)
+    parser.add_argument("--child", metavar="PAGE", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.script, args.child, args.warm_runs)
+        return
+
+    import dashboard
+    from snapshot_latency import build_database   #Same synthetic ranking database
+    pages = args.pages or list(dashboard.PAGES)
+
+    with tempfile.TemporaryDirectory() as folder:
+        db_path = os.path.join(folder, "profile.db")
+        build_database(db_path, 1, args.competitors).close()
+        env = dict(os.environ,
+                   TENNIS_SQLITE_PATH=db_path,
+                   TENNIS_CACHE_STAMP=os.path.join(folder, "stamp.json"),
+                   TENNIS_SEARCH_INDEX=os.path.join(folder, "search_index.pkl"),
+                   TENNIS_EXPORT_DIR=os.path.join(folder, "exports"))
+        results = []
+        for page in pages:
+            stats = profile_page(args.script, page, args.warm_runs, env)
+            results.append((page, stats))
+            heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in stats["top"][:TOP_IMPORTS])
+            print(f"{page:<24} cold {stats['cold_ms']:>7.0f} ms (imports {stats['import_ms']:>6.0f} ms, "
+                  f"{stats['modules']:>4} modules)  warm {stats['warm_ms']:>6.1f} ms  {heaviest}")
+            for error in stats["errors"]:
+                print(f"  error: {error[:200]}")
+
+    lines = [
+        "# Dashboard import-time profile",
+        "",
+        f"Generated by `python benchmarks/import_profile.py` on a synthetic SQLite database with one ranking week of",
+        f"{args.competitors} rows. Cold = first script run of the page in a fresh process with Streamlit already",
+        "imported (the first visitor of a new server process); imports = time spent importing modules during that",
+        f"run (`-X importtime`, top-level imports). Warm = median of {args.warm_runs} reruns of the same page.",
+        "",
+        "| Page | cold ms | imports ms | modules loaded | heaviest imports (ms) | warm ms |",
+        "|---|---:|---:|---:|---|---:|",
+    ]
+    for page, stats in results:
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in stats["top"][:TOP_IMPORTS])
+        lines.append(f"| {page} | {stats['cold_ms']:.0f} | {stats['import_ms']:.0f} | {stats['modules']} | "
+                     f"{heaviest} | {stats['warm_ms']:.1f} |")
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Latency benchmark: the ranking notification stage with a large rule table
+# Builds a SQLite stand-in database with two weeks of synthetic rankings (benchmarks/synthetic.py, --competitors
+# per week), fills watch_rules with --rules rules (watch-list rules on random competitors, --general of them
+# on every competitor, all four rule types), then times notifications.evaluate() step by step:
+#   first run:  diff, rule load, matching, dedupe, fan out to the file sink, logging
+#   re-run:     the same week again (everything already sent, nothing delivered)
+# Results (median of --repeat runs) go to benchmarks/notification_latency.md
+#
+# Usage:
+#   python benchmarks/notification_latency.py
+#   python benchmarks/notification_latency.py --rules 100000 --competitors 10000 --general 20 --repeat 3
+
+# Importing Required Libraries
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic
+from ingest import bulk_load, parse_rankings, sync_ranking_batches
+from migrate import migrate
+from notifications import RULE_TYPES, evaluate
+
+REPORT_PATH = os.path.join(ROOT, "benchmarks", "notification_latency.md")
+THRESHOLDS = {  #rule_type -> thresholds drawn for the synthetic rules
+    "entered_top": [10, 20, 50, 100, 200, 500],
+    "left_top": [10, 20, 50, 100, 200, 500],
+    "moved": [20, 50, 100, 500, 1000],   #The synthetic long tail has near-equal points, so ranks churn there
+    "points_change": [25, 50, 100],
+}
+
+
+def build_database(path, competitors):
+    conn = sqlite3.connect(path)
+    migrate(conn, "sqlite")
+    payloads = synthetic.rankings_payloads(random.Random("notifications"), competitors, 2)
+    for payload in payloads:
+        sync_ranking_batches(conn, [parse_rankings(payload)], payload["generated_at"], "sqlite", chunk_size=5000)
+    return conn
+
+
+def add_rules(conn, count, general, competitors, seed=23):
+    rng = random.Random(seed)
+    rows = []
+    for n in range(count):
+        rule_type = rng.choice(RULE_TYPES)
+        competitor_id = None if n < general else f"sr:competitor:{100000 + rng.randrange(competitors)}"
+        rows.append((f"user{n % 5000}", competitor_id, rule_type, rng.choice(THRESHOLDS[rule_type]), "file", None,
+                     "2026-01-01T00:00:00+00:00"))
+    bulk_load(conn, "watch_rules", rows, "sqlite")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the notification stage against a large rule table")
+    parser.add_argument("--rules", type=int, default=100000)
+    parser.add_argument("--competitors", type=int, default=1000, help="ranking rows per week (1000: the live feed)")
+    parser.add_argument("--general", type=int, default=20, help="how many of the rules are on every competitor")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    first, rerun, sent = [], [], 0
+    with tempfile.TemporaryDirectory() as folder:
+        conn = build_database(os.path.join(folder, "notifications.db"), args.competitors)
+        add_rules(conn, args.rules, args.general, args.competitors)
+        for run in range(args.repeat):
+            conn.execute("DELETE FROM notifications")
+            conn.commit()
+            outbox = os.path.join(folder, f"outbox{run}")
+            start = time.perf_counter()
+            stats, timings = evaluate(conn, "sqlite", outbox)
+            first.append(dict(timings, total=time.perf_counter() - start))
+            sent = stats[0]["rows"]
+            start = time.perf_counter()
+            _, timings = evaluate(conn, "sqlite", outbox)
+            rerun.append(dict(timings, total=time.perf_counter() - start))
+            print(f"run {run + 1}: {first[-1]['total'] * 1000:.1f} ms ({sent} notifications), "
+                  f"re-run {rerun[-1]['total'] * 1000:.1f} ms")
+        conn.close()
+
+    def median_ms(runs, step):
+        return statistics.median(r.get(step, 0.0) for r in runs) * 1000
+
+    lines = [
+        "# Notification stage latency",
+        "",
+        f"Generated by `python benchmarks/notification_latency.py` on the SQLite stand-in with two synthetic ranking",
+        f"weeks of {args.competitors} competitors and {args.rules} rules in `watch_rules` ({args.rules - args.general}",
+        f"watch-list rules, {args.general} rules on every competitor). The first run sends {sent} notifications",
+        f"through the file sink; the re-run evaluates the same week again and sends nothing. Median of {args.repeat} runs.",
+        "",
+        "| Step | first run ms | re-run ms |",
+        "|---|---:|---:|",
+    ]
+    for step in list(first[0]):
+        lines.append(f"| {step} | {median_ms(first, step):.1f} | {median_ms(rerun, step):.1f} |")
+    report = "\n".join(lines) + "\n"
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
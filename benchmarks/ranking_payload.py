@@ -0,0 +1,135 @@
+# Payload and render-time benchmark for the Ranking Overview page
+# Builds a SQLite stand-in with one ranking week of --competitors rows, then measures what one page view
+# sends to the browser and how long it takes to produce it (query + DataFrame + serialization):
+#   before: the whole week read with fetchall, shipped to st.dataframe, one bar per competitor in the chart
+#   after:  the row count + one keyset page (queries.LATEST_RANKINGS_PAGE), and a top-N or per-country chart
+# "payload" is the Arrow bytes st.dataframe sends plus the figure JSON st.plotly_chart sends
+# Results go to benchmarks/ranking_payload.md
+#
+# Usage:
+#   python benchmarks/ranking_payload.py
+#   python benchmarks/ranking_payload.py --competitors 50000 --page-size 250 --repeat 3
+
+# Importing Required Libraries
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import plotly.express as px
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import queries
+from backend import RANKING_COLUMNS, RANKING_COUNTRY_COLUMNS, RANKING_PAGE_SIZE
+from snapshot_latency import build_database   #Same synthetic ranking database
+from db_pool import adapt_sql
+
+REPORT_PATH = os.path.join(ROOT, "benchmarks", "ranking_payload.md")
+TOP_N = 25
+
+
+def read(conn, sql, params=(), columns=None):
+    cursor = conn.cursor()
+    cursor.execute(adapt_sql(sql, "sqlite"), params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return pd.DataFrame(rows, columns=columns)
+
+
+#One view of each variant: returns (table bytes, chart bytes, rows sent)
+def view_before(conn, page_size):
+    df = read(conn, queries.LATEST_RANKINGS_SNAPSHOT, columns=RANKING_COLUMNS)
+    table = convert_pandas_df_to_arrow_bytes(df)
+    fig = px.bar(df, x="Competitor", y="Points", color="Country", title="Ranking Overview")
+    return len(table), len(fig.to_json()), len(df)
+
+
+def view_after_top(conn, page_size):
+    read(conn, queries.LATEST_RANKINGS_COUNT)
+    df = read(conn, queries.LATEST_RANKINGS_PAGE, (0, page_size), ["Position"] + RANKING_COLUMNS).set_index("Position")
+    table = convert_pandas_df_to_arrow_bytes(df)
+    top = read(conn, queries.LATEST_RANKINGS_PAGE, (0, TOP_N), ["Position"] + RANKING_COLUMNS)
+    fig = px.bar(top, x="Competitor", y="Points", color="Country", title=f"Ranking Overview - Top {TOP_N}")
+    return len(table), len(fig.to_json()), len(df)
+
+
+def view_after_country(conn, page_size):
+    read(conn, queries.LATEST_RANKINGS_COUNT)
+    df = read(conn, queries.LATEST_RANKINGS_PAGE, (0, page_size), ["Position"] + RANKING_COLUMNS).set_index("Position")
+    table = convert_pandas_df_to_arrow_bytes(df)
+    by_country = read(conn, queries.RANKING_BY_COUNTRY, columns=RANKING_COUNTRY_COLUMNS)
+    fig = px.bar(by_country, x="Country", y="Points", hover_data=["Competitors", "Best Rank"])
+    return len(table), len(fig.to_json()), len(df)
+
+
+#A page deep in the ranking: keyset seek vs OFFSET (what a naive "LIMIT/OFFSET" pager would run)
+OFFSET_PAGE = """
+    SELECT position, ranks, movement, points, competitor_name, country, week
+    FROM latest_rankings
+    ORDER BY position
+    LIMIT %s OFFSET %s
+"""
+
+
+def time_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ranking Overview payload size and render time, before/after paging")
+    parser.add_argument("--competitors", type=int, default=20000, help="rows in the ranking week")
+    parser.add_argument("--page-size", type=int, default=RANKING_PAGE_SIZE)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        conn = build_database(os.path.join(folder, "payload.db"), 1, args.competitors)
+        results = []
+        for label, view in (("before: whole week, one bar per competitor", view_before),
+                            (f"after: one page + top {TOP_N} chart", view_after_top),
+                            ("after: one page + points by country", view_after_country)):
+            ms, (table_bytes, chart_bytes, rows) = time_ms(lambda: view(conn, args.page_size), args.repeat)
+            results.append((label, rows, table_bytes, chart_bytes, ms))
+            print(f"{label:<45} {rows:>7} rows  {(table_bytes + chart_bytes) / 1024:>9.1f} KB  {ms:>9.1f} ms")
+
+        last_page = (args.competitors // args.page_size - 1) * args.page_size
+        keyset_ms, _ = time_ms(lambda: read(conn, queries.LATEST_RANKINGS_PAGE, (last_page, args.page_size)), 50)
+        offset_ms, _ = time_ms(lambda: read(conn, OFFSET_PAGE, (args.page_size, last_page)), 50)
+        conn.close()
+
+    lines = [
+        "# Ranking Overview: payload and render time",
+        "",
+        f"Generated by `python benchmarks/ranking_payload.py` on one SQLite ranking week of {args.competitors} rows",
+        f"(page size {args.page_size}, median of {args.repeat} views). Payload = Arrow bytes for `st.dataframe` + figure",
+        "JSON for `st.plotly_chart`; time = queries, DataFrames, Arrow serialization and figure build/serialization.",
+        "",
+        "| View | rows in table | table KB | chart KB | payload KB | time ms |",
+        "|---|---:|---:|---:|---:|---:|",
+    ]
+    for label, rows, table_bytes, chart_bytes, ms in results:
+        lines.append(f"| {label} | {rows} | {table_bytes / 1024:.1f} | {chart_bytes / 1024:.1f} | "
+                     f"{(table_bytes + chart_bytes) / 1024:.1f} | {ms:.1f} |")
+    lines += [
+        "",
+        f"Last page (after position {last_page}): keyset seek {keyset_ms:.3f} ms vs `LIMIT/OFFSET` {offset_ms:.3f} ms (median of 50).",
+    ]
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
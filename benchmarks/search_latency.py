@@ -0,0 +1,128 @@
+# Search latency benchmark: trigram index vs LIKE '%...%'
+# Generates a synthetic corpus of --competitors competitors (surnames and first names recombined from the
+# rankings fixture, plus accented names), then times a mix of queries (prefixes, fragments from the middle
+# of a name, typos, accented input, numeric IDs) against:
+#   index: search_index.SearchIndex (in memory)
+#   like:  the old parameterized "name LIKE %s OR competitor_id LIKE %s" query on the SQLite stand-in
+# Results (p50/p99 per query kind) go to benchmarks/search_latency.md
+#
+# Usage:
+#   python benchmarks/search_latency.py
+#   python benchmarks/search_latency.py --competitors 100000 --queries 2000
+
+# Importing Required Libraries
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ingest import RANKINGS_FILE, parse_rankings, read_payload
+from search_index import SearchIndex
+
+REPORT_PATH = os.path.join(ROOT, "benchmarks", "search_latency.md")
+ACCENTED = ["Hernández", "Müller", "Šafářová", "Łukasz", "Björn", "Peña", "Dvořák", "Gonçalves", "Ségolène", "Øyvind"]
+LIKE_SQL = "SELECT competitor_id, name FROM competitors WHERE name LIKE ? OR competitor_id LIKE ? LIMIT 50"
+
+
+def synthetic_corpus(size, seed=7):
+    rng = random.Random(seed)
+    _, competitors = parse_rankings(read_payload(RANKINGS_FILE))
+    surnames = sorted({c[1].split(",")[0].strip() for c in competitors if c[1]} | set(ACCENTED))
+    first_names = sorted({c[1].split(",")[-1].strip() for c in competitors if c[1] and "," in c[1]} | set(ACCENTED))
+    rows = []
+    for n in range(size):
+        surname, first_name = rng.choice(surnames), rng.choice(first_names)
+        rows.append((f"sr:competitor:{100000 + n}", f"{surname}, {first_name}", surname[:3].upper()))
+    return rows
+
+
+#(kind, query) pairs built from names in the corpus
+def make_queries(rows, count, seed=11):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        competitor_id, name, _ = rng.choice(rows)
+        surname = name.split(",")[0]
+        kind = rng.choice(["prefix", "fragment", "typo", "accent-free", "id"])
+        if kind == "prefix":
+            query = surname[:rng.randint(2, 5)]
+        elif kind == "fragment":
+            start = rng.randint(0, max(len(surname) - 4, 0))
+            query = surname[start:start + 4]
+        elif kind == "typo":
+            i = rng.randrange(len(surname))
+            query = surname[:i] + "x" + surname[i + 1:]
+        elif kind == "accent-free":
+            query = rng.choice(ACCENTED).encode("ascii", "ignore").decode()
+        else:
+            query = competitor_id.rsplit(":", 1)[-1][:5]
+        queries.append((kind, query))
+    return queries
+
+
+def percentiles(timings):
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="p50/p99 search latency: trigram index vs LIKE")
+    parser.add_argument("--competitors", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--output", default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    rows = synthetic_corpus(args.competitors)
+    start = time.perf_counter()
+    index = SearchIndex([r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows])
+    build_seconds = time.perf_counter() - start
+    queries = make_queries(rows, args.queries)
+
+    with tempfile.TemporaryDirectory() as folder:
+        conn = sqlite3.connect(os.path.join(folder, "search.db"))
+        conn.execute("CREATE TABLE competitors (competitor_id VARCHAR(255) PRIMARY KEY, name VARCHAR(255))")
+        conn.executemany("INSERT INTO competitors VALUES (?, ?)", [(r[0], r[1]) for r in rows])
+        conn.commit()
+
+        timings = {}
+        for kind, query in queries:
+            t0 = time.perf_counter()
+            index.search(query)
+            t1 = time.perf_counter()
+            pattern = f"%{query}%"
+            conn.execute(LIKE_SQL, (pattern, pattern)).fetchall()
+            t2 = time.perf_counter()
+            index_ms, like_ms = timings.setdefault(kind, ([], []))
+            index_ms.append((t1 - t0) * 1000)
+            like_ms.append((t2 - t1) * 1000)
+        conn.close()
+
+    everything = ([t for i, _ in timings.values() for t in i], [t for _, l in timings.values() for t in l])
+    lines = [
+        "# Search latency: trigram index vs LIKE",
+        "",
+        f"Generated by `python benchmarks/search_latency.py` on a synthetic corpus of {args.competitors} competitors",
+        f"({len(index.postings)} grams, index built in {build_seconds:.1f} s) with {args.queries} queries.",
+        "\"like\" is the old parameterized `name LIKE %s OR competitor_id LIKE %s` query (LIMIT 50) on the SQLite stand-in.",
+        "",
+        "| Query kind | queries | index p50 ms | index p99 ms | like p50 ms | like p99 ms |",
+        "|---|---:|---:|---:|---:|---:|",
+    ]
+    for kind, (index_ms, like_ms) in sorted(timings.items()) + [("all", everything)]:
+        (ip50, ip99), (lp50, lp99) = percentiles(index_ms), percentiles(like_ms)
+        lines.append(f"| {kind} | {len(index_ms)} | {ip50:.3f} | {ip99:.3f} | {lp50:.3f} | {lp99:.3f} |")
+    report = "\n".join(lines) + "\n"
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# Latency benchmark: live page queries vs the precomputed snapshot tables
+# Builds a SQLite stand-in database with several weeks of ranking history (the fixture scaled up to
+# --competitors rows per week), then times what the Ranking Overview and Top Movers pages run per view:
+#   live:     latest-week lookup + join/sort query (queries.CURRENT_WEEK + RANKING_OVERVIEW / TOP_MOVERS)
+#   snapshot: one primary-key-ordered read (queries.LATEST_RANKINGS_SNAPSHOT / TOP_MOVERS_SNAPSHOT)
+# Results go to benchmarks/snapshot_latency.md
+#
+# Usage:
+#   python benchmarks/snapshot_latency.py
+#   python benchmarks/snapshot_latency.py --weeks 52 --competitors 2000 --repeat 200
+#   python benchmarks/snapshot_latency.py --mysql        (time the queries on the live MySQL database instead)
+
+# Importing Required Libraries
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import queries
+from db_pool import DB_CONFIG, adapt_sql
+from ingest import RANKINGS_FILE, parse_rankings, read_payload, sync_ranking_batches
+from migrate import migrate
+
+REPORT_PATH = os.path.join(ROOT, "benchmarks", "snapshot_latency.md")
+
+
+#One week of ranking rows for `competitors` competitors (fixture rows repeated with new ids and shifted ranks)
+def synthetic_week(template, competitors, year, week):
+    ranking_rows, competitor_rows = [], []
+    for n in range(competitors):
+        ranking, competitor = template[0][n % len(template[0])], template[1][n % len(template[1])]
+        competitor_id = f"sr:competitor:{n}"
+        movement = (n * 7 + week) % 11 - 5
+        ranking_rows.append((competitor_id, year, week, n + 1, movement, max(ranking[5] - n, 0), ranking[6]))
+        competitor_rows.append((competitor_id,) + competitor[1:5] + (year, week))
+    return ranking_rows, competitor_rows
+
+
+def build_database(path, weeks, competitors):
+    conn = sqlite3.connect(path)
+    migrate(conn, "sqlite")
+    template = parse_rankings(read_payload(RANKINGS_FILE))
+    for week in range(1, weeks + 1):
+        batches = [synthetic_week(template, competitors, 2025, week)]
+        sync_ranking_batches(conn, batches, f"2025-W{week:02d}", "sqlite", chunk_size=5000)
+    return conn
+
+
+#Page -> (live query taking the latest (year, week), snapshot query)
+PAGES = {
+    "Ranking Overview": (queries.RANKING_OVERVIEW, queries.LATEST_RANKINGS_SNAPSHOT),
+    "Top Movers": (queries.TOP_MOVERS, queries.TOP_MOVERS_SNAPSHOT),
+}
+
+
+#One page view: the live path looks up the latest week first, the snapshot path is a single read
+def run_view(conn, dialect, sql, live):
+    cursor = conn.cursor()
+    params = ()
+    if live:
+        cursor.execute(queries.CURRENT_WEEK)
+        params = tuple(cursor.fetchone())
+    cursor.execute(adapt_sql(sql, dialect), params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+#Per-view latency in ms: (p50, p95, rows)
+def time_view(conn, dialect, sql, live, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = run_view(conn, dialect, sql, live)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the live page queries against the snapshot tables")
+    parser.add_argument("--weeks", type=int, default=52, help="weeks of history in the SQLite database")
+    parser.add_argument("--competitors", type=int, default=2000, help="ranking rows per week")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--mysql", action="store_true", help="time the live MySQL database (db_pool.DB_CONFIG)")
+    parser.add_argument("--output", default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        if args.mysql:
+            import mysql.connector
+            conn, dialect = mysql.connector.connect(**DB_CONFIG), "mysql"
+            source = f"the live MySQL database `{DB_CONFIG['database']}`"
+        else:
+            conn, dialect = build_database(os.path.join(folder, "snapshots.db"), args.weeks, args.competitors), "sqlite"
+            source = f"the SQLite stand-in with {args.weeks} weeks x {args.competitors} competitors of history"
+        results = []
+        for page, (live_sql, snapshot_sql) in PAGES.items():
+            live = time_view(conn, dialect, live_sql, True, args.repeat)
+            snapshot = time_view(conn, dialect, snapshot_sql, False, args.repeat)
+            results.append((page, live, snapshot))
+            print(f"{page:<18} live p50 {live[0]:7.3f} ms p95 {live[1]:7.3f} ms  "
+                  f"snapshot p50 {snapshot[0]:7.3f} ms p95 {snapshot[1]:7.3f} ms  ({snapshot[2]} rows)")
+        conn.close()
+
+    lines = [
+        "# Page latency: live queries vs precomputed snapshots",
+        "",
+        f"Generated by `python benchmarks/snapshot_latency.py` on {source}.",
+        "\"live\" is what the pages ran per view before the snapshots (latest-week lookup, then the join/sort query);",
+        f"\"snapshot\" is the single read of `latest_rankings` / `top_movers`. {args.repeat} runs each, no query cache.",
+        "",
+        "| Page | rows | live p50 ms | live p95 ms | snapshot p50 ms | snapshot p95 ms | speed-up (p50) |",
+        "|---|---:|---:|---:|---:|---:|---:|",
+    ]
+    for page, live, snapshot in results:
+        lines.append(f"| {page} | {snapshot[2]} | {live[0]:.3f} | {live[1]:.3f} | {snapshot[0]:.3f} | "
+                     f"{snapshot[1]:.3f} | {live[0] / snapshot[0]:.1f}x |")
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+# Benchmark suite: ETL stages and dashboard page queries on deterministic synthetic data
+# For each --scale the suite generates the payloads (benchmarks/synthetic.py), loads them into a fresh SQLite file
+# or a dedicated MySQL database through the real ETL code, and times:
+#   - ETL stages (the notebooks' fetch -> parse -> load steps, plus what the ETL now does after a load):
+#     JSON decode, parse per feed, load per feed, weekly ranking sync, snapshot / hierarchy / search index rebuilds,
+#     and a re-sync of an unchanged week (the incremental path)
+#   - every query the dashboard pages run (queries.py, the Search page's index lookup), median and p95 of --repeat
+# Results are written as JSON, so two runs can be compared: --compare old.json prints new/old per stage and query
+#
+# Usage:
+#   python benchmarks/suite.py                                   (scale 1, SQLite in a temporary file)
+#   python benchmarks/suite.py --scale 1 10 --weeks 12 --output benchmarks/results/after.json
+#   python benchmarks/suite.py --mysql --database sportanalytics_bench
+#   python benchmarks/suite.py --compare benchmarks/results/sqlite_1x.json
+
+# Importing Required Libraries
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import queries
+from db_pool import DB_CONFIG, adapt_sql
+from hierarchy import refresh_hierarchy
+from ingest import (load_competitions, load_complexes, parse_competitions, parse_complexes, parse_rankings,
+                    sync_ranking_batches, sync_rankings)
+from migrate import migrate
+from schema import TABLES
+from search_index import build_from_connection
+from snapshots import refresh_snapshots
+from synthetic import DEFAULT_SEED, generate, volume
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+SUITE_VERSION = 1
+
+
+#Fresh database for one run: (connection, dialect)
+def connect(args, folder, scale):
+    if args.mysql:
+        import mysql.connector
+        conn = mysql.connector.connect(**dict(DB_CONFIG, database=None))
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {args.database}")
+        cursor.execute(f"USE {args.database}")
+        for table in ["schema_version"] + list(reversed(TABLES)):
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.commit()
+        cursor.close()
+        return conn, "mysql"
+    path = args.sqlite or os.path.join(folder, f"suite_{scale}x.db")
+    if os.path.exists(path):
+        os.remove(path)
+    return sqlite3.connect(path), "sqlite"
+
+
+def table_counts(conn):
+    cursor = conn.cursor()
+    counts = {}
+    for table in TABLES:
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        counts[table] = cursor.fetchone()[0]
+    cursor.close()
+    return counts
+
+
+class Stages:
+    #Collects {"stage", "rows", "seconds", "rows_per_sec"} entries
+    def __init__(self):
+        self.results = []
+
+    def run(self, name, fn, rows=None):
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        count = rows(result) if callable(rows) else rows
+        self.results.append({
+            "stage": name,
+            "rows": count,
+            "seconds": round(seconds, 6),
+            "rows_per_sec": round(count / seconds) if count and seconds > 0 else None,
+        })
+        print(f"  {name:<34}{count if count is not None else '':>10}{seconds:>10.3f} s")
+        return result
+
+
+def stat_rows(stats):
+    return sum(s["rows"] for s in stats)
+
+
+#Runs the ETL on the synthetic payloads; returns the stage timings
+def run_etl(conn, dialect, data, chunk_size):
+    stages = Stages()
+    #Fetch: the notebooks decode each API response with response.json(); the payloads are decoded from text here
+    texts = {"rankings": [json.dumps(p) for p in data["rankings"]],
+             "competitions": json.dumps(data["competitions"]), "complexes": json.dumps(data["complexes"])}
+    decoded = stages.run("fetch: decode json", lambda: {
+        "rankings": [json.loads(t) for t in texts["rankings"]],
+        "competitions": json.loads(texts["competitions"]),
+        "complexes": json.loads(texts["complexes"]),
+    }, rows=len(texts["rankings"]) + 2)
+
+    ranking_batches = stages.run("parse: rankings (all weeks)", lambda: [parse_rankings(p) for p in decoded["rankings"]],
+                                 rows=lambda batches: sum(len(b[0]) for b in batches))
+    stages.run("parse: competitions", lambda: parse_competitions(decoded["competitions"]), rows=lambda r: len(r[1]))
+    stages.run("parse: complexes", lambda: parse_complexes(decoded["complexes"]), rows=lambda r: len(r[0]) + len(r[1]))
+
+    options = {"chunk_size": chunk_size}
+    stages.run("load: competitions", lambda: load_competitions(conn, decoded["competitions"], dialect, **options),
+               rows=stat_rows)
+    stages.run("load: complexes", lambda: load_complexes(conn, decoded["complexes"], dialect, **options), rows=stat_rows)
+    stages.run("refresh: competition hierarchy", lambda: refresh_hierarchy(conn, dialect), rows=stat_rows)
+
+    #Weekly sync, one payload at a time as the scheduled ETL runs it (includes the snapshot rebuild per week)
+    def sync_weeks():
+        return [sync_ranking_batches(conn, [batch], payload["generated_at"], dialect, chunk_size)
+                for batch, payload in zip(ranking_batches, decoded["rankings"])]
+    stages.run("load: rankings (weekly sync)", sync_weeks, rows=lambda runs: sum(len(b[0]) for b in ranking_batches))
+
+    stages.run("refresh: ranking snapshots", lambda: refresh_snapshots(conn, dialect), rows=stat_rows)
+    stages.run("refresh: search index", lambda: build_from_connection(conn, path=None), rows=len)
+
+    #The last week delivered again under a new generated_at: every row is diffed, nothing is written
+    last = dict(decoded["rankings"][-1], generated_at=decoded["rankings"][-1]["generated_at"] + "-resend")
+    stages.run("load: re-sync unchanged week", lambda: sync_rankings(conn, last, dialect, chunk_size),
+               rows=len(ranking_batches[-1][0]))
+    return stages.results
+
+
+def fetch(conn, dialect, sql, params=()):
+    cursor = conn.cursor()
+    cursor.execute(adapt_sql(sql, dialect), params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+#(page, query name, function returning rows) for every query the dashboard pages run
+def page_queries(conn, dialect):
+    top = fetch(conn, dialect,
+                "SELECT competitor_name, country, competitor_id FROM latest_rankings ORDER BY position LIMIT 50")
+    (name1, country, id1), (_, _, id2) = top[0], top[1]
+    top_ids = tuple(competitor_id for _, _, competitor_id in top)
+    year, week = fetch(conn, dialect, queries.CURRENT_WEEK)[0]
+    widest = fetch(conn, dialect, """
+        SELECT ancestor_id FROM competition_closure
+        GROUP BY ancestor_id ORDER BY COUNT(*) DESC, ancestor_id LIMIT 1
+    """)[0][0]
+    total = fetch(conn, dialect, queries.LATEST_RANKINGS_COUNT)[0][0]
+    index = build_from_connection(conn, path=None)
+    search_text = name1.split(",")[0][:5]
+
+    def search():
+        ids = index.search(search_text)
+        if not ids:
+            return []
+        sql = queries.in_list(queries.SEARCH_BY_IDS, len(ids))
+        return fetch(conn, dialect, sql, tuple(ids))
+
+    def q(sql, params=()):
+        return lambda: fetch(conn, dialect, sql, params)
+
+    return [
+        ("Search", "search index + SEARCH_BY_IDS", search),
+        ("Ranking Overview", "LATEST_RANKINGS_COUNT", q(queries.LATEST_RANKINGS_COUNT)),
+        ("Ranking Overview", "LATEST_RANKINGS_PAGE (first page)", q(queries.LATEST_RANKINGS_PAGE, (0, 100))),
+        ("Ranking Overview", "LATEST_RANKINGS_PAGE (last page)",
+         q(queries.LATEST_RANKINGS_PAGE, (max(total - 100, 0), 100))),
+        ("Ranking Overview", "RANKING_BY_COUNTRY", q(queries.RANKING_BY_COUNTRY)),
+        ("Ranking Overview", "LATEST_RANKINGS_SNAPSHOT (export)", q(queries.LATEST_RANKINGS_SNAPSHOT)),
+        ("Ranking Overview", "RANKING_OVERVIEW (live, no snapshot)", q(queries.RANKING_OVERVIEW, (year, week))),
+        ("Top Movers", "TOP_MOVERS_SNAPSHOT", q(queries.TOP_MOVERS_SNAPSHOT)),
+        ("Top Movers", "TOP_MOVERS (live, no snapshot)", q(queries.TOP_MOVERS, (year, week))),
+        ("Country-wise Filter", "COUNTRY_LIST", q(queries.COUNTRY_LIST)),
+        ("Country-wise Filter", "COMPETITORS_BY_COUNTRY", q(queries.COMPETITORS_BY_COUNTRY, (country,))),
+        ("Country Map", "COUNTRY_RANKINGS", q(queries.COUNTRY_RANKINGS)),
+        ("Competitor Comparison", "COMPETITOR_DIRECTORY", q(queries.COMPETITOR_DIRECTORY)),
+        ("Competitor Comparison", "COMPARISON_LATEST", q(queries.in_list(queries.COMPARISON_LATEST, 2), (id1, id2))),
+        ("Competitor Comparison", "RANK_SERIES (2 competitors)", q(queries.in_list(queries.RANK_SERIES, 2), (id1, id2))),
+        ("Competitor Comparison", f"RANK_SERIES ({len(top_ids)} competitors)",
+         q(queries.in_list(queries.RANK_SERIES, len(top_ids)), top_ids)),
+        ("Competition Hierarchy", "COMPETITION_TREE", q(queries.COMPETITION_TREE)),
+        ("Competition Hierarchy", "COMPETITION_DESCENDANTS", q(queries.COMPETITION_DESCENDANTS, (widest,))),
+        ("Competition Hierarchy", "COMPETITION_DEPTH", q(queries.COMPETITION_DEPTH, (widest,))),
+        ("Competition Hierarchy", "COMPETITION_ROLLUP", q(queries.COMPETITION_ROLLUP, (widest,))),
+    ]
+
+
+def run_queries(conn, dialect, repeat):
+    results = []
+    for page, name, fn in page_queries(conn, dialect):
+        rows = fn()  #Warm-up run (page cache, statement preparation)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        results.append({
+            "page": page,
+            "query": name,
+            "rows": len(rows),
+            "p50_ms": round(statistics.median(timings), 4),
+            "p95_ms": round(timings[max(int(len(timings) * 0.95) - 1, 0)], 4),
+        })
+        print(f"  {page + ': ' + name:<62}{len(rows):>8}{results[-1]['p50_ms']:>10.3f} ms")
+    return results
+
+
+def run_scale(args, folder, scale):
+    print(f"Scale {scale}x ({args.weeks} weeks, seed {args.seed})")
+    start = time.perf_counter()
+    data = generate(scale, args.weeks, args.seed)
+    generate_seconds = time.perf_counter() - start
+    conn, dialect = connect(args, folder, scale)
+    try:
+        migrate(conn, dialect)
+        etl = run_etl(conn, dialect, data, args.chunk_size)
+        result = {
+            "scale": scale,
+            "dialect": dialect,
+            "volume": dict(volume(scale), weeks=args.weeks),
+            "generate_seconds": round(generate_seconds, 3),
+            "tables": table_counts(conn),
+            "etl": etl,
+            "queries": run_queries(conn, dialect, args.repeat),
+        }
+    finally:
+        conn.close()
+    return result
+
+
+#Prints new/old for every stage and query both result files have (below 1.0 = faster)
+def compare(new, old):
+    old_runs = {run["scale"]: run for run in old["runs"]}
+    print(f"\nCompared with {old.get('created_at')} (new / old; below 1.00 is faster)")
+    for run in new["runs"]:
+        base = old_runs.get(run["scale"])
+        if base is None:
+            continue
+        print(f"Scale {run['scale']}x")
+        before = {s["stage"]: s["seconds"] for s in base["etl"]}
+        for s in run["etl"]:
+            if before.get(s["stage"]):
+                print(f"  {s['stage']:<62}{s['seconds'] / before[s['stage']]:>8.2f}")
+        before = {(q["page"], q["query"]): q["p50_ms"] for q in base["queries"]}
+        for q in run["queries"]:
+            old_ms = before.get((q["page"], q["query"]))
+            if old_ms:
+                print(f"  {q['page'] + ': ' + q['query']:<62}{q['p50_ms'] / old_ms:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the ETL stages and dashboard queries on synthetic data")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--sqlite", metavar="PATH", help="SQLite file to (re)create (default: a temporary file)")
+    target.add_argument("--mysql", action="store_true", help="use MySQL (db_pool.DB_CONFIG) and --database")
+    parser.add_argument("--database", default="sportanalytics_bench",
+                        help="MySQL database for the run; its tables are dropped first")
+    parser.add_argument("--scale", type=float, nargs="+", default=[1], help="multiples of the live feed volume")
+    parser.add_argument("--weeks", type=int, default=12, help="ranking weeks to load")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per query")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--output", help="result JSON (default: benchmarks/results/<dialect>_<scales>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier result file to compare with")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        runs = [run_scale(args, folder, scale if scale % 1 else int(scale)) for scale in args.scale]
+
+    result = {
+        "suite_version": SUITE_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "sqlite": sqlite3.sqlite_version},
+        "config": {"weeks": args.weeks, "seed": args.seed, "repeat": args.repeat, "chunk_size": args.chunk_size},
+        "runs": runs,
+    }
+    scales = "_".join(f"{run['scale']}x" for run in runs)
+    output = args.output or os.path.join(RESULTS_DIR, f"{runs[0]['dialect']}_{scales}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=1)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
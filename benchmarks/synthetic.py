@@ -0,0 +1,213 @@
+# Deterministic synthetic Sportradar payloads for the benchmark suite
+# Produces the same JSON shapes the ETL reads (double_competitors_rankings.json, competitions.json with parent
+# links, complexes.json), at a multiple of the live feed volume. The same (scale, weeks, seed) always gives
+# byte-identical payloads, so two benchmark runs load exactly the same data
+#
+# Scale 1 = roughly what the live feeds return (REAL_VOLUME); 10 and 100 are for stress runs
+#   - rankings: one payload per week, ATP and WTA lists; points drift week to week, so ranks and movement change
+#   - competitions: tournaments with singles/doubles events below them and qualification events below some of
+#     those (three levels), spread over the categories
+#   - complexes: venues per complex vary around REAL_VOLUME["venues_per_complex"]
+#
+# Usage:
+#   from synthetic import generate
+#   data = generate(scale=10, weeks=12)     -> {"rankings": [...weekly payloads], "competitions": {...}, "complexes": {...}}
+#   python benchmarks/synthetic.py --scale 1 --weeks 4 --output data/synthetic      (write the payloads as JSON)
+
+# Importing Required Libraries
+import argparse
+import json
+import os
+import random
+
+#Approximate size of the live feeds at scale 1
+REAL_VOLUME = {
+    "competitors": 1000,          #Doubles rankings: ~500 ranked per tour (ATP, WTA)
+    "competitions": 5800,         #competitions.json
+    "complexes": 650,             #complexes.json
+    "venues_per_complex": 5,      #Average courts/venues listed per complex
+}
+START_YEAR = 2025
+DEFAULT_SEED = 2025
+
+COUNTRIES = [
+    ("Argentina", "ARG", "America/Argentina/Buenos_Aires"), ("Australia", "AUS", "Australia/Sydney"),
+    ("Austria", "AUT", "Europe/Vienna"), ("Belgium", "BEL", "Europe/Brussels"), ("Brazil", "BRA", "America/Sao_Paulo"),
+    ("Canada", "CAN", "America/Toronto"), ("Chile", "CHL", "America/Santiago"), ("China", "CHN", "Asia/Shanghai"),
+    ("Colombia", "COL", "America/Bogota"), ("Croatia", "HRV", "Europe/Zagreb"), ("Czechia", "CZE", "Europe/Prague"),
+    ("Ecuador", "ECU", "America/Guayaquil"), ("El Salvador", "SLV", "America/El_Salvador"),
+    ("Finland", "FIN", "Europe/Helsinki"), ("France", "FRA", "Europe/Paris"), ("Germany", "DEU", "Europe/Berlin"),
+    ("Great Britain", "GBR", "Europe/London"), ("India", "IND", "Asia/Kolkata"), ("Italy", "ITA", "Europe/Rome"),
+    ("Japan", "JPN", "Asia/Tokyo"), ("Kazakhstan", "KAZ", "Asia/Almaty"), ("Mexico", "MEX", "America/Mexico_City"),
+    ("Monaco", "MCO", "Europe/Monaco"), ("Netherlands", "NLD", "Europe/Amsterdam"),
+    ("New Zealand", "NZL", "Pacific/Auckland"), ("Poland", "POL", "Europe/Warsaw"), ("Portugal", "PRT", "Europe/Lisbon"),
+    ("Russia", "RUS", "Europe/Moscow"), ("Serbia", "SRB", "Europe/Belgrade"), ("Spain", "ESP", "Europe/Madrid"),
+    ("Sweden", "SWE", "Europe/Stockholm"), ("Switzerland", "CHE", "Europe/Zurich"), ("Ukraine", "UKR", "Europe/Kyiv"),
+    ("USA", "USA", "America/New_York"),
+]
+CATEGORIES = [
+    ("sr:category:3", "ATP"), ("sr:category:6", "WTA"), ("sr:category:72", "Challenger"),
+    ("sr:category:785", "ITF Men"), ("sr:category:213", "ITF Women"), ("sr:category:76", "Davis Cup"),
+    ("sr:category:74", "Billie Jean King Cup"), ("sr:category:871", "UTR Men"), ("sr:category:873", "UTR Women"),
+    ("sr:category:1681", "Exhibition"), ("sr:category:2100", "Hopman Cup"), ("sr:category:2101", "Laver Cup"),
+    ("sr:category:1705", "Juniors"), ("sr:category:2160", "Wheelchairs"), ("sr:category:2189", "Legends"),
+]
+SYLLABLES = ["an", "ba", "ce", "da", "el", "fa", "gi", "ho", "ka", "lo", "ma", "ne", "ov", "pa", "ra", "si", "ta",
+             "ur", "va", "zi", "ber", "dor", "gan", "kov", "lin", "mar", "nov", "ric", "son", "ter", "vic", "wel"]
+CITY_WORDS = ["Port", "San", "Nova", "Lake", "Mont", "Bel", "Grand", "North", "Santa", "Vila", "Saint", "Old"]
+
+
+def word(rng, syllables):
+    return "".join(rng.choice(SYLLABLES) for _ in range(syllables)).capitalize()
+
+
+#Unique "Surname, Given" names (a suffix is added on the rare collision, so the output stays deterministic)
+def competitor_names(rng, count):
+    names, seen = [], set()
+    for _ in range(count):
+        name = f"{word(rng, rng.randint(2, 4))}, {word(rng, rng.randint(2, 3))}"
+        while name in seen:
+            name += " Jr"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def year_week(n):
+    return START_YEAR + (n - 1) // 52, (n - 1) % 52 + 1
+
+
+#One rankings payload per week for `competitors` competitors, split between the ATP and WTA lists
+def rankings_payloads(rng, competitors, weeks):
+    names = competitor_names(rng, competitors)
+    players = []
+    for i, name in enumerate(names):
+        country, code, _ = rng.choice(COUNTRIES)
+        surname = name.split(",")[0]
+        players.append({
+            "id": f"sr:competitor:{100000 + i}",
+            "name": name,
+            "country": country,
+            "country_code": code,
+            "abbreviation": surname[:3].upper(),
+            "tour": "ATP" if i % 2 == 0 else "WTA",
+            "points": int(10000 * (i // 2 + 1) ** -0.6) + rng.randint(0, 50),
+            "played": rng.randint(5, 30),
+        })
+
+    payloads, previous = [], {}
+    for n in range(1, weeks + 1):
+        year, week = year_week(n)
+        if n > 1:
+            for p in players:
+                p["points"] = max(0, p["points"] + rng.randint(-60, 60))
+                p["played"] += rng.random() < 0.3
+        rankings = []
+        for tour, type_id, gender in (("ATP", 1, "men"), ("WTA", 2, "women")):
+            ranked = sorted((p for p in players if p["tour"] == tour), key=lambda p: (-p["points"], p["id"]))
+            entries = []
+            for rank, p in enumerate(ranked, start=1):
+                entries.append({
+                    "rank": rank,
+                    "movement": previous.get(p["id"], rank) - rank,
+                    "points": p["points"],
+                    "competitions_played": p["played"],
+                    "competitor": {k: p[k] for k in ("id", "name", "country", "country_code", "abbreviation")},
+                })
+                previous[p["id"]] = rank
+            rankings.append({"type_id": type_id, "name": tour, "year": year, "week": week, "gender": gender,
+                             "competitor_rankings": entries})
+        payloads.append({"generated_at": f"{year}-W{week:02d}T06:00:00+00:00", "rankings": rankings})
+    return payloads
+
+
+#competitions.json with `count` competitions: tournaments, their events and some qualification events
+def competitions_payload(rng, count):
+    competitions = []
+    next_id = 10000
+
+    def add(name, parent_id, type_, gender, category):
+        nonlocal next_id
+        next_id += 1
+        item = {"id": f"sr:competition:{next_id}", "name": name, "type": type_, "gender": gender,
+                "category": {"id": category[0], "name": category[1]}}
+        if parent_id is not None:
+            item["parent_id"] = parent_id
+        competitions.append(item)
+        return item["id"]
+
+    while len(competitions) < count:
+        category = rng.choice(CATEGORIES)
+        city = f"{rng.choice(CITY_WORDS)} {word(rng, 2)}"
+        gender = rng.choice(["men", "women", "mixed"])
+        tournament = add(f"{category[1]} {city}", None, "singles", gender, category)
+        genders = ["men", "women"] if gender == "mixed" else [gender]
+        for g in genders:
+            for type_ in ("singles", "doubles"):
+                if len(competitions) >= count:
+                    break
+                label = "Men" if g == "men" else "Women"
+                event = add(f"{category[1]} {city} {label} {type_.capitalize()}", tournament, type_, g, category)
+                if type_ == "singles" and rng.random() < 0.4 and len(competitions) < count:
+                    add(f"{category[1]} {city} {label} Singles Qualification", event, "singles", g, category)
+    return {"generated_at": f"{START_YEAR}-01-01T06:00:00+00:00", "competitions": competitions[:count]}
+
+
+#complexes.json with `count` complexes and about venues_per_complex venues each
+def complexes_payload(rng, count, venues_per_complex):
+    complexes, venue_id = [], 50000
+    for i in range(count):
+        country, code, timezone = rng.choice(COUNTRIES)
+        city = f"{rng.choice(CITY_WORDS)} {word(rng, 2)}"
+        venues = []
+        for v in range(rng.randint(1, 2 * venues_per_complex - 1)):
+            venue_id += 1
+            venues.append({"id": f"sr:venue:{venue_id}", "name": "Centre Court" if v == 0 else f"Court {v}",
+                           "city_name": city, "country_name": country, "country_code": code, "timezone": timezone})
+        complexes.append({"id": f"sr:complex:{1000 + i}", "name": f"{word(rng, 3)} Tennis Club", "venues": venues})
+    return {"generated_at": f"{START_YEAR}-01-01T06:00:00+00:00", "complexes": complexes}
+
+
+#Entity counts for a scale factor
+def volume(scale=1):
+    return {
+        "competitors": int(REAL_VOLUME["competitors"] * scale),
+        "competitions": int(REAL_VOLUME["competitions"] * scale),
+        "complexes": int(REAL_VOLUME["complexes"] * scale),
+        "venues_per_complex": REAL_VOLUME["venues_per_complex"],
+    }
+
+
+#All payloads for one benchmark run; each feed has its own random stream, so changing one size leaves the
+#other feeds unchanged
+def generate(scale=1, weeks=12, seed=DEFAULT_SEED):
+    sizes = volume(scale)
+    return {
+        "rankings": rankings_payloads(random.Random(f"{seed}-rankings"), sizes["competitors"], weeks),
+        "competitions": competitions_payload(random.Random(f"{seed}-competitions"), sizes["competitions"]),
+        "complexes": complexes_payload(random.Random(f"{seed}-complexes"), sizes["complexes"],
+                                       sizes["venues_per_complex"]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write deterministic synthetic Sportradar payloads as JSON")
+    parser.add_argument("--scale", type=float, default=1, help="multiple of the live feed volume (1, 10, 100)")
+    parser.add_argument("--weeks", type=int, default=12, help="ranking weeks to generate")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", required=True, help="folder for the payload files")
+    args = parser.parse_args(argv)
+
+    data = generate(args.scale, args.weeks, args.seed)
+    os.makedirs(args.output, exist_ok=True)
+    files = {"competitions.json": data["competitions"], "complexes.json": data["complexes"]}
+    for payload in data["rankings"]:
+        files[f"double_competitors_rankings_{payload['generated_at'][:8]}.json"] = payload
+    for name, payload in files.items():
+        with open(os.path.join(args.output, name), "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+    print(f"{len(files)} payload files written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Streamlit dashboard package
+# tennis_analytics.py only draws the sidebar and hands the selected page to render(); each page lives in its own
+# module under dashboard/pages/ and is imported the first time it is opened, so a page only pays for its own
+# imports (the Home page loads neither pandas nor plotly) and the others stay out of cold start
+#
+# Adding a page: create dashboard/pages/<module>.py with a render() function and list it in PAGES
+# HIDDEN_PAGES are left out of the sidebar unless the URL asks for them (e.g. ?diagnostics=1)
+# Every render is timed by instrumentation.page_render (see the Diagnostics page)
+
+# Importing Required Libraries
+import importlib                 #Imports a page module on first use
+
+import instrumentation           #Render time and query / figure spans of each page
+
+#Sidebar title -> module under dashboard.pages, in sidebar order
+PAGES = {
+    "Home": "home",
+    "Search": "search",
+    "Ranking Overview": "ranking_overview",
+    "Top Movers": "top_movers",
+    "Country-wise Filter": "country_filter",
+    "Country Map": "country_map",
+    "Competitor Comparison": "competitor_comparison",
+    "Competition Hierarchy": "competition_hierarchy",
+}
+
+#Pages only listed when their query parameter is in the URL: query parameter -> (title, module)
+HIDDEN_PAGES = {
+    "diagnostics": ("Diagnostics", "diagnostics"),
+}
+
+
+#Sidebar titles for this session: PAGES plus the hidden pages asked for in the URL
+def page_titles(query_params=()):
+    return list(PAGES) + [title for param, (title, _) in HIDDEN_PAGES.items() if param in query_params]
+
+
+#The module of one page (imported once per process, then taken from sys.modules)
+def page_module(title):
+    modules = dict(PAGES, **dict(HIDDEN_PAGES.values()))
+    return importlib.import_module(f"dashboard.pages.{modules[title]}")
+
+
+def render(title):
+    with instrumentation.page_render(title):
+        page_module(title).render()
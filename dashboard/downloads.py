@@ -0,0 +1,38 @@
+# Export panel used by the pages that offer downloads (exports.ExportService jobs with a progress bar)
+
+# Importing Required Libraries
+import streamlit as st           #For building the interactive web app interface
+
+from dashboard.resources import get_export_service
+
+
+#exporters: button label -> function queuing the export (returns an exports.ExportJob)
+#While a job of this panel is running the panel reruns on its own once a second (the rest of the page does not)
+def export_panel(name, exporters, disabled=()):
+    exports = get_export_service()
+    jobs = st.session_state.setdefault("export_jobs", {})  #(panel, label) -> job id
+    for col, (label, submit) in zip(st.columns(len(exporters)), exporters.items()):
+        if col.button(label, key=f"export_{name}_{label}", disabled=label in disabled):
+            try:
+                jobs[(name, label)] = submit().id
+            except Exception as e:
+                st.error(f"Export failed: {e}")
+    panel_jobs = [exports.job(job_id) for (panel, _), job_id in jobs.items() if panel == name]
+    panel_jobs = [job for job in panel_jobs if job is not None]
+    polling = any(not job.finished for job in panel_jobs)
+
+    def show_jobs():
+        for job in panel_jobs:
+            if job.status == "done":
+                st.download_button(f"📥 {job.file_name} ({job.bytes / 1024:.0f} KB)", data=lambda job=job: exports.read(job),
+                                   file_name=job.file_name, mime=job.mime, key=f"download_{job.id}")
+            elif job.status == "failed":
+                st.error(f"{job.file_name}: {job.error}")
+            else:
+                rows = f"{job.rows} of {job.total} rows" if job.total else f"{job.rows} rows"
+                st.progress(job.progress, text=f"{job.file_name}: {job.status}, {rows}")
+        if polling and all(job.finished for job in panel_jobs):
+            st.rerun()  #Full rerun: redraws the panel without the timer
+    st.fragment(show_jobs, run_every=1 if polling else None)()
+
+
@@ -0,0 +1,62 @@
+# Competition Hierarchy page: drill down the competition tree (hierarchy.CompetitionTree)
+# The whole tree is read once (cached) into a hierarchy.CompetitionTree; each drill-down level is a lookup in
+# that tree, so picking a competition does not run another query
+
+# Importing Required Libraries
+import streamlit as st           #For building the interactive web app interface
+
+from dashboard.resources import get_backend, get_figure_cache
+
+
+def render():
+    backend = get_backend()
+    figures = get_figure_cache()
+
+    st.subheader("🌳 Competition Hierarchy")
+
+    try:
+        tree = backend.competition_tree()
+
+        if len(tree) == 0:
+            st.warning("No competitions found. Load competitions.json with ingest.py first.")
+        else:
+            #One dropdown per level, listing the children of the competition picked above it
+            selected = None
+            while True:
+                children = tree.children(selected)
+                if children.empty:
+                    break
+                choice = st.selectbox(
+                    "Competition" if selected is None else f"Under {tree.name(selected)}",
+                    [None] + children["Competition ID"].tolist(),
+                    format_func=lambda c: "(all)" if c is None else tree.name(c),
+                    key=f"hierarchy_{selected}",  #One widget per parent, so each level remembers its pick
+                )
+                if choice is None:
+                    break
+                selected = choice
+
+            if selected is None:
+                rows = tree.frame
+                st.write(f"**{len(tree)}** competitions, **{len(tree.children())}** of them top-level")
+            else:
+                rows = tree.descendants(selected)
+                st.write(" › ".join(tree.name(c) for c in tree.path(selected)))
+                col1, col2 = st.columns(2)
+                col1.metric("Depth", len(tree.path(selected)) - 1)
+                col2.metric("Competitions below", len(rows))
+            st.dataframe(rows, use_container_width=True)
+
+            #Roll-up of everything below the selection by category, type and gender
+            rollup = tree.rollup(selected)
+            if not rollup.empty:
+                st.dataframe(rollup)
+                fig = figures.express("bar", rollup, x="Category", y="Competitions", color="Type", barmode="group",
+                                      hover_data=["Gender"], title="Competitions by Category and Type")
+                st.plotly_chart(fig)
+
+    except Exception as e:
+        st.error(f"Error loading competition hierarchy: {e}")
+
+
+#Short Note: Competition Hierarchy: Tournaments and their events (e.g. ATP Vienna -> Men Singles / Men Doubles) as a tree built by the ETL from competitions.json and the info.json children, with depth and roll-up counts for any branch.
@@ -0,0 +1,185 @@
+# Competitor Comparison page: latest ranking, charts and rank trend of up to backend.MAX_COMPARE competitors,
+# with exports; the trend is a timeseries.RankSeries (all series from one query, downsampled for long ranges)
+# The only page with PNG export, so it is also the one that starts the Kaleido renderer
+
+# Importing Required Libraries
+import streamlit as st           #For building the interactive web app interface
+import pandas as pd              #For data manipulation and analysis in tabular format
+import plotly.express as px      #Rank trend line chart
+import plotly.graph_objects as go #Customizing layouts, adding annotations, combining multiple chart types (like line + bar), or exporting static images.
+
+import queries                   #SQL of the exported queries
+from backend import COMPARISON_COLUMNS, MAX_COMPARE
+from dashboard.downloads import export_panel
+from dashboard.resources import get_backend, get_export_service, get_figure_cache, start_renderer
+from exports import arrow_available
+from figure_cache import image_export_available
+from timeseries import DEFAULT_WINDOW
+
+TREND_MAX_POINTS = 150           #Weeks plotted per competitor; longer ranges are downsampled (LTTB)
+
+
+def render():
+    backend = get_backend()
+    figures = get_figure_cache()
+    exports = get_export_service()
+    start_renderer()
+
+    st.subheader("🔄 Competitor Comparison")
+
+    # Competitor directory: one unique label per competitor_id (players sharing a name stay separate)
+    directory = backend.competitor_directory()
+
+    selected = st.multiselect(f"Select Competitors (up to {MAX_COMPARE})", directory.ids, default=directory.ids[:2],
+                              format_func=directory.label, max_selections=MAX_COMPARE)  #Values are competitor IDs
+
+    if len(selected) >= 2:
+        # Query to fetch latest data for the selected competitors (key join on their latest (year, week))
+        df_static = backend.comparison_latest(selected)  #Columns: Competitor, Country, Country Code, Abbreviation, Rank, Points, Movement, Competitions Played
+
+        if not df_static.empty:
+
+            st.dataframe(df_static)
+
+            # 📊 Points Bar Chart
+            # (each figure comes from the figure cache: rebuilt only when df_static changes)
+            st.plotly_chart(figures.express(
+                "bar", df_static, x="Competitor", y="Points", color="Country", 
+                title="Points Comparison", text="Points"
+            ))
+
+            # 📊 Movement Bar Chart
+            st.plotly_chart(figures.express(
+                "bar", df_static, x="Competitor", y="Movement", color="Country", 
+                title="Rank Movement Comparison", text="Movement"
+            ))
+
+            # 🕸️ Radar Chart
+            def build_radar():
+                radar_df = df_static[["Competitor", "Rank", "Points", "Movement", "Competitions Played"]].set_index("Competitor")
+                radar_df = radar_df.transpose().reset_index().rename(columns={'index': 'Metric'})
+
+                fig_radar = go.Figure()
+                for competitor in radar_df.columns[1:]:
+                    fig_radar.add_trace(go.Scatterpolar(
+                        r=radar_df[competitor],
+                        theta=radar_df['Metric'],
+                        fill='toself',
+                        name=competitor
+                    ))
+
+                fig_radar.update_layout(
+                    polar=dict(radialaxis=dict(visible=True)),
+                    showlegend=True,
+                    title="Competitor Radar Chart"
+                )
+                return fig_radar
+            fig_radar = figures.figure("comparison_radar", df_static, build_radar)
+            st.plotly_chart(fig_radar)
+
+            # Exports of the selected competitors' latest ranking and of the radar chart (background jobs)
+            ids = tuple(sorted(set(selected)))
+            def export_comparison(fmt):
+                return lambda: exports.export_query(queries.in_list(queries.COMPARISON_LATEST, len(ids)), ids,
+                                                    ["Competitor ID"] + COMPARISON_COLUMNS, fmt,
+                                                    name="competitor_comparison")
+            export_panel("competitor_comparison",
+                         {"Export CSV": export_comparison("csv"), "Export Parquet": export_comparison("parquet"),
+                          "Radar Chart (PNG)": lambda: exports.export_figure(fig_radar, name="competitor_radar")},
+                         disabled=(() if arrow_available() else ("Export Parquet",))
+                                  + (() if image_export_available() else ("Radar Chart (PNG)",)))
+
+            # 📈 Rank Trend Over Time
+            # One row per competitor per ranking week, every selected competitor in one query
+            series = backend.rank_series(selected)
+
+            if len(series):
+                first, last = (pd.Timestamp(day).date() for day in series.date_range())
+                if first < last:
+                    start, end = st.slider("Weeks", min_value=first, max_value=last, value=(first, last),
+                                           format="YYYY-MM-DD")
+                    series = series.between(start, end)
+                df_trend = series.to_frame(max_points=TREND_MAX_POINTS)
+
+                def build_trend():
+                    fig_trend = px.line(df_trend, x="Date", y="Rank", color="Competitor",
+                                        markers=len(df_trend) <= 20 * len(series), hover_data=["Year", "Week", "Points"],
+                                        title="Weekly Rank Trend")
+                    return fig_trend.update_yaxes(autorange="reversed")  #Rank 1 at the top
+                st.plotly_chart(figures.figure("rank_trend", df_trend, build_trend))
+                weeks = int(series.offsets[-1])
+                if weeks > len(df_trend):
+                    st.caption(f"{len(df_trend)} of {weeks} weekly points plotted (downsampled per competitor).")
+
+                # Rank statistics per competitor over the selected weeks
+                st.write(f"Rank statistics (volatility = standard deviation of the weekly rank change; recent = last "
+                         f"{DEFAULT_WINDOW} weeks; streaks in weeks, current streak > 0 = moving up)")
+                st.dataframe(series.summary(DEFAULT_WINDOW).round(2))
+            else:
+                st.warning("No trend data available for the selected players.")
+        else:
+            st.warning("No comparison data available.")
+    else:
+        st.info("Please select at least two competitors.")
+
+    # Example competitor data for metrics selection
+    data = {
+        'Metric': ['Rank', 'Points', 'Matches Played', 'Wins'],
+        'Competitor A': [5, 3200, 30, 22],
+        'Competitor B': [3, 4100, 35, 26]
+    }
+
+    df = pd.DataFrame(data)
+
+    # Get metric list for dynamic selection
+    metric_options = df['Metric'].tolist()
+    selected_metrics = st.multiselect("Select metrics to compare:", metric_options, default=metric_options)
+
+    # Filter based on selected metrics
+    filtered_df = df[df['Metric'].isin(selected_metrics)]
+
+    # Create radar chart figure (cached per selection of metrics)
+    def build_metrics_radar():
+        fig = go.Figure()
+
+        # Add traces for each competitor
+        for competitor in filtered_df.columns[1:]:
+            fig.add_trace(go.Scatterpolar(
+                r=filtered_df[competitor],
+                theta=filtered_df['Metric'],
+                fill='toself',
+                name=competitor
+            ))
+
+        # Layout and export options
+        fig.update_layout(
+            polar=dict(radialaxis=dict(visible=True)),
+            showlegend=True
+        )
+        return fig
+    fig = figures.figure("metrics_radar", filtered_df, build_metrics_radar)
+
+    # Display chart with download options
+    st.plotly_chart(fig, use_container_width=True, config={
+        "displayModeBar": True,
+        "toImageButtonOptions": {
+            "format": "png",
+            "filename": "competitor_comparison_chart",
+            "height": 600,
+            "width": 800,
+            "scale": 1
+        }
+    })
+
+    # The PNG is rendered by the export service (Kaleido process started with the dashboard), not in the page;
+    # the CSV is only generated when the download is clicked (data is a function), not on every rerun
+    export_panel("metrics_radar", {"📥 Radar Chart (PNG)": lambda: exports.export_figure(fig, name="comparison_chart")},
+                 disabled=() if image_export_available() else ("📥 Radar Chart (PNG)",))
+    if not image_export_available():
+        st.caption("PNG export needs Kaleido: pip install --upgrade \"kaleido>=1\"")
+
+    # Export Comparison Data as CSV
+    st.download_button(label="📄 Download Comparison Data (CSV)", data=lambda: filtered_df.to_csv(index=False).encode('utf-8'), file_name="comparison_data.csv", mime="text/csv")
+
+
+#Short Note: Competitor Comparison: Compares up to 50 players' performance across different metrics like ranking, points, movement, and competitions played. It also includes a trend chart to see how their rankings have changed over time, with rank statistics (volatility, best/worst rank, streaks) per player.
@@ -0,0 +1,74 @@
+# Country-wise Filter page: competitors of one country with their latest rank and points
+
+# Importing Required Libraries
+import streamlit as st           #For building the interactive web app interface
+
+from dashboard.resources import get_backend, get_figure_cache
+
+
+def render():
+    backend = get_backend()
+    figures = get_figure_cache()
+
+    st.subheader("🌍 Country-wise Performance Filter")
+
+    #Function to fetch the list of countries for the dropdown filter
+    def get_country_list():
+        return backend.country_list()
+    #Function Purpose: Fetches a list of distinct countries from the competitors_table
+
+
+    #Function to fetch competitors' data for the selected country
+    def get_competitors_by_country(country):
+        return backend.competitors_by_country(country)  #Columns: Competitor ID, Name, Rank, Points
+    #Function Purpose: Fetches competitor information (ID, name, latest rank, points) for a specific country.
+
+
+    # Streamlit layout
+    st.title('Tennis Analytics: Country-wise Competitor Ranking')
+
+    #Fetch the list of countries for the dropdown
+    country_list = get_country_list() #Calls the get_country_list() function to retrieve the list of countries from the database.
+     
+    # Dropdown for selecting a country
+    selected_country = st.selectbox("Select Country", country_list) #Displays a dropdown (selectbox) to allow the user to choose a country from the list of countries.
+
+    # Displaying the data for the selected country
+    if selected_country:
+        st.write(f"**Country**: {selected_country}")
+
+        # Country aggregates of the latest week (precomputed by the ETL), with the change since the previous week
+        stats = backend.country_stats()
+        country_stats = stats[stats["Country"] == selected_country]
+        if not country_stats.empty:
+            row = country_stats.iloc[0]
+            delta = lambda value: None if value is None or value != value else int(value)  #NaN: no previous week
+            columns = st.columns(4)
+            columns[0].metric("Ranked Competitors", int(row["Competitors"]), delta(row["Competitors Change"]))
+            columns[1].metric("Best Rank", int(row["Best Rank"]), delta(row["Best Rank Change"]))
+            columns[2].metric("Top 10 / Top 100", f"{int(row['Top 10'])} / {int(row['Top 100'])}")
+            columns[3].metric("Total Points", int(row["Total Points"]), delta(row["Total Points Change"]))
+        competitors_data = get_competitors_by_country(selected_country)
+        #Calls the get_competitors_by_country(selected_country) function to fetch competitors' data for the selected country.
+
+
+    #Check if Data Exists and Display it
+        if not competitors_data.empty:
+            # Display the (cached) DataFrame
+            df = competitors_data
+            st.dataframe(df)
+    #If competitor data is available, displays the DataFrame (df) as a table in the app using st.dataframe().
+
+
+            # Create a bar chart for country-specific ranking
+            fig = figures.express("bar", df, x="Name", y="Points", color="Rank",
+                                  title=f"Competitor Rankings for {selected_country}",
+                                  labels={"Points": "Points", "Rank": "Rank"})
+            st.plotly_chart(fig)
+            #Labels for Y-axis ("Points") and color ("Rank")
+        else:
+            st.warning(f"No data found for {selected_country}.")
+    #If no data is found for the selected country, a warning message is displayed saying "No data found for {selected_country}".
+
+
+#Country-wise Filter: Allows users to explore the performance of competitors from different countries, displaying their rankings and points for a quick overview of the top players from each country.
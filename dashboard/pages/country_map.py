@@ -0,0 +1,53 @@
+# Country Map page: world map of the per-country aggregates of the latest ranking week
+# Renders from snapshots.country_rankings (one row per country, rebuilt by the ETL after each ranking load):
+# one cached read, never the ranking rows themselves
+
+# Importing Required Libraries
+import plotly.express as px      #Choropleth map
+import streamlit as st           #For building the interactive web app interface
+
+from dashboard.resources import get_backend, get_figure_cache
+
+#Map colour options; for "lower is better" columns the colour scale is reversed so the best country is darkest
+METRICS = ["Total Points", "Competitors", "Best Rank", "Median Points", "Top 10", "Top 100",
+           "Total Points Change", "Best Rank Change", "Competitors Change"]
+LOWER_IS_BETTER = {"Best Rank"}
+
+
+def render():
+    backend = get_backend()
+    figures = get_figure_cache()
+
+    st.subheader("🗺️ Country Map")
+
+    stats = backend.country_stats()  #Columns: backend.COUNTRY_STATS_COLUMNS
+    if stats.empty:
+        st.warning("No country aggregates yet: they are built by the ETL after each ranking load "
+                   "(or by hand with python snapshots.py).")
+        return
+    st.caption(f"Ranking week {int(stats['Week'].iloc[0])} of {int(stats['Year'].iloc[0])}; changes are since the "
+               "previous ranking week (Best Rank Change > 0 = better).")
+
+    metric = st.selectbox("Colour countries by", METRICS)
+    mapped = stats[stats["Country Code"] != ""]  #Competitors without a country code cannot be placed on the map
+
+    # 🗺️ Choropleth (ISO 3166-1 alpha-3 country codes), cached per data and metric
+    def build_map():
+        fig_map = px.choropleth(
+            mapped, locations="Country Code", locationmode="ISO-3", color=metric, hover_name="Country",
+            hover_data=["Competitors", "Best Rank", "Median Points", "Top 10", "Top 100"],
+            color_continuous_scale="Viridis_r" if metric in LOWER_IS_BETTER else "Viridis",
+            title=f"{metric} by Country")
+        return fig_map.update_layout(margin=dict(l=0, r=0, t=40, b=0))
+    st.plotly_chart(figures.figure("country_map", mapped, build_map, metric=metric))
+
+    # Countries ranked by the selected metric
+    ranked = stats.sort_values(metric, ascending=metric in LOWER_IS_BETTER, na_position="last", ignore_index=True)
+    st.dataframe(ranked.drop(columns=["Year", "Week"]), hide_index=True)
+    unplaced = len(stats) - len(mapped)
+    if unplaced:
+        st.caption(f"{unplaced} group(s) of competitors without a country code are listed but not drawn.")
+
+
+#Country Map: compares countries at a glance - points, depth of the field (top-10 / top-100 players) and how each
+#country moved since the previous ranking week - from aggregates the ETL precomputes.
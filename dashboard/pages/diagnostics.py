@@ -0,0 +1,73 @@
+# Diagnostics page (hidden): render latency per page, the span breakdown of each page's latest render,
+# per-statement timings and the slow statements with their EXPLAIN plan
+# Open the dashboard with ?diagnostics=1 to list it in the sidebar; numbers cover this server process only
+
+# Importing Required Libraries
+import json                      #JSON download of the metrics snapshot
+
+import pandas as pd              #Tables of the metrics
+import streamlit as st           #For building the interactive web app interface
+
+from instrumentation import recorder
+
+
+def render():
+    st.subheader("🩺 Diagnostics")
+    snapshot = recorder.snapshot()
+    st.caption(f"Statements slower than {snapshot['slow_query_ms']:.0f} ms are kept with their query plan "
+               "(TENNIS_SLOW_QUERY_MS). Latencies are for this server process since it started or was reset.")
+
+    # Page Latency
+    st.write("### Page render time")
+    pages = pd.DataFrame.from_dict(snapshot["pages"], orient="index")
+    if pages.empty:
+        st.info("No page has been rendered yet.")
+    else:
+        st.dataframe(pages.sort_values("p95_ms", ascending=False))
+
+    # Latest Render Breakdown
+    # Spans are nested: backend call > cached read > query / DataFrame build; figures sit next to them
+    st.write("### Latest render breakdown")
+    renders = snapshot["last_renders"]
+    if renders:
+        page = st.selectbox("Page", sorted(renders))
+        last = renders[page]
+        st.write(f"{last['ms']:.1f} ms · {last['queries']} queries · {last['rows']} rows fetched · "
+                 f"{last['bytes'] / 1024:.0f} KB of DataFrames / figures built")
+        spans = pd.DataFrame([{
+            "step": " " * span.get("depth", 0) + f"{span['kind']}: {span['name']}",
+            "ms": span.get("ms"),
+            "rows": span.get("rows"),
+            "bytes": span.get("bytes"),
+            "cache": {True: "hit", False: "miss"}.get(span.get("hit"), ""),
+        } for span in last["spans"]])
+        if spans.empty:
+            st.write("This page reads no data.")
+        else:
+            st.dataframe(spans, hide_index=True)
+
+    # Statement Timings
+    st.write("### Statements")
+    queries = pd.DataFrame.from_dict(snapshot["queries"], orient="index")
+    if queries.empty:
+        st.info("No statement has run yet.")
+    else:
+        st.dataframe(queries.sort_values("p95_ms", ascending=False))
+
+    # Slow Statements
+    st.write(f"### Slow statements ({len(snapshot['slow_queries'])})")
+    for slow in reversed(snapshot["slow_queries"]):
+        with st.expander(f"{slow['query']} · {slow['ms']:.0f} ms · {slow['rows']} rows · {slow['page'] or 'background'}"):
+            st.code(slow["sql"], language="sql")
+            if slow["params"]:
+                st.write(f"Parameters: {', '.join(slow['params'])}")
+            st.code("\n".join(slow["plan"]) or "(empty plan)", language="text")
+
+    # Exports
+    with st.expander("Prometheus text (served on /metrics when TENNIS_METRICS_PORT is set)"):
+        st.code(recorder.prometheus_text(), language="text")
+    st.download_button("Download metrics (JSON)", json.dumps(snapshot, default=str, indent=1),
+                       file_name="tennis_metrics.json", mime="application/json")
+    if st.button("Reset metrics"):
+        recorder.reset()
+        st.rerun()
@@ -0,0 +1,40 @@
+# Home page: greeting and a short guide to the other pages
+# Needs neither the database nor the charting libraries, so opening the dashboard stays cheap
+
+# Importing Required Libraries
+import streamlit as st           #For building the interactive web app interface
+from datetime import datetime    #For the time-of-day greeting
+
+
+def render():
+    #Title of the homepage
+    st.title("SportRadar Tennis Analytics")
+    #Welcome message
+    st.write("Welcome to the Tennis Analytics Dashboard powered by SportRadar! 🎾")
+    #Display - Engaging description for the users
+    st.write("Get in-depth tennis data with filters and analytics. 'Game on! 😎'")
+
+    #Personalized Greeting
+    current_hour = datetime.now().hour
+    if current_hour < 12:
+        st.write("🌞 Good Morning!")
+    elif 12 <= current_hour < 18:
+        st.write("☀️ Good Afternoon!")
+    else:
+        st.write("🌙 Good Evening!")
+
+    # Home Page Content
+    st.subheader("🏠 Home Dashboard")
+    st.write("Welcome to the main dashboard! Navigate using the sidebar for all available analytics.")
+
+    # Quick Guide or Tips
+    with st.expander("📘 How to Use This Dashboard"):
+        st.markdown(""" 
+        - **Search**: Find specific players or tournaments.
+        - **Top Movers**: See the performance changes of the top players.
+        - **Ranking Overview**: Get insights into the overall rankings.
+        - **Country-wise Analysis**: Filter players by country for specific insights.
+        - **Country Map**: Compare countries on a world map by points, best rank and top-10 / top-100 players.
+        - **Competitor Comparison**: Compare up to 50 players' rankings, points, movement, and performance over time in one view.
+        - **Competition Hierarchy**: Drill down from a tournament to its singles/doubles events and count them by category, type and gender.
+        """) #Brief instructions on how to navigate the app
@@ -0,0 +1,121 @@
+# Ranking Overview page: the latest ranking week (or any stored past week), paged, with a top-N / per-country
+# chart and exports
+
+# Importing Required Libraries
+import streamlit as st           #For building the interactive web app interface
+import pandas as pd              #For data manipulation and analysis in tabular format
+
+import queries                   #SQL of the exported queries
+from backend import RANKING_COLUMNS, RANKING_COUNTRY_COLUMNS, RANKING_PAGE_SIZE
+from dashboard.downloads import export_panel
+from dashboard.resources import get_backend, get_export_service, get_figure_cache
+from exports import arrow_available
+
+
+def render():
+    backend = get_backend()
+    figures = get_figure_cache()
+    exports = get_export_service()
+
+    st.subheader("🏅 Ranking Overview")
+
+    try:
+        #Ranking week: the newest stored week by default; older weeks are there once history is backfilled
+        weeks = backend.ranking_weeks()
+        selected_week = weeks[0] if weeks else None
+        if len(weeks) > 1:
+            selected_week = st.selectbox("Ranking week", weeks, format_func=lambda yw: f"{yw[0]} week {yw[1]}"
+                                         + (" (latest)" if yw == weeks[0] else ""))
+        latest = not weeks or selected_week == weeks[0]
+
+        if latest:
+            #SQL Query: Read the latest ranking week from the latest_rankings snapshot (rebuilt by the ETL after each
+            #load) one page at a time: only the row count is read up front, never the whole week
+            total_rows = backend.latest_rankings_count()
+            rankings_page = backend.latest_rankings_page
+        else:
+            #A past week is read once (one indexed week of competitor_ranking_table) and paged in memory
+            df_week = backend.week_rankings(*selected_week)
+            total_rows = len(df_week)
+
+            def rankings_page(after, size):
+                return df_week.iloc[int(after):int(after) + int(size)]
+
+        #Check if no data is found
+        if total_rows == 0:
+            st.error("No ranking data found for the selected week.")
+        else:
+            #Page / size controls
+            col1, col2 = st.columns(2)
+            page_size = col1.selectbox("Rows per page", [50, RANKING_PAGE_SIZE, 250, 500], index=1)
+            page_count = -(-total_rows // page_size)
+            page = col2.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
+
+            #Pages loaded below the selected one ("Load more"); back to one when the page or size changes
+            if st.session_state.get("ranking_view") != (selected_week, page, page_size):
+                st.session_state["ranking_view"] = (selected_week, page, page_size)
+                st.session_state["ranking_chunks"] = 1
+
+            #Keyset pagination: each chunk starts after the last position of the previous one
+            chunks = []
+            after = (page - 1) * page_size
+            for _ in range(st.session_state["ranking_chunks"]):
+                chunk = rankings_page(after, page_size)  #Columns: Rank, Movement, Points, Competitor, Country, Week
+                if chunk.empty:
+                    break
+                chunks.append(chunk)
+                after = int(chunk.index[-1])
+            df_ranking = pd.concat(chunks)
+
+            #Display the loaded rows (st.dataframe only draws the rows scrolled into view)
+            st.dataframe(df_ranking, height=400)
+            st.caption(f"Showing positions {int(df_ranking.index[0])}–{after} of {total_rows}")
+            if after < total_rows:
+                def load_more():
+                    st.session_state["ranking_chunks"] += 1
+                st.button(f"Load {page_size} more", on_click=load_more)
+
+            #Chart: the top N competitors or one bar per country, never one bar per ranked competitor
+            chart = st.radio("Chart", ["Top competitors", "Points by country"], horizontal=True)
+            if chart == "Top competitors":
+                top_n = st.slider("Number of competitors", min_value=10, max_value=100, value=25, step=5)
+                df_top = rankings_page(0, top_n)
+                fig = figures.express("bar", df_top, x="Competitor", y="Points", color="Country",
+                                      title=f"Ranking Overview - Top {top_n}", labels={"Points": "Points"})
+            else:
+                if latest:
+                    df_country = backend.ranking_by_country()  #Columns: Country, Competitors, Points, Best Rank
+                else:
+                    df_country = df_week.groupby("Country", dropna=False).agg(
+                        Competitors=("Rank", "size"), Points=("Points", "sum"), best_rank=("Rank", "min")).reset_index()
+                    df_country = df_country.sort_values(["Points", "Country"], ascending=[False, True],
+                                                        ignore_index=True).set_axis(RANKING_COUNTRY_COLUMNS, axis=1)
+                fig = figures.express("bar", df_country, x="Country", y="Points", hover_data=["Competitors", "Best Rank"],
+                                      title="Ranking Overview - Points by Country", labels={"Points": "Points"})
+            st.plotly_chart(fig)
+
+            #Export the whole week as CSV, Parquet or Arrow: streamed from the database by the export service
+            def export_week(fmt):
+                if latest:
+                    return lambda: exports.export_query(queries.LATEST_RANKINGS_SNAPSHOT, columns=RANKING_COLUMNS,
+                                                        fmt=fmt, name="ranking_overview",
+                                                        count_sql=queries.LATEST_RANKINGS_COUNT)
+                return lambda: exports.export_query(queries.RANKING_OVERVIEW, selected_week, RANKING_COLUMNS, fmt,
+                                                    name=f"ranking_overview_{selected_week[0]}_w{selected_week[1]}",
+                                                    count_sql=queries.WEEK_RANKINGS_COUNT)
+            export_panel("ranking_overview",
+                         {"Export CSV": export_week("csv"), "Export Parquet": export_week("parquet"),
+                          "Export Arrow": export_week("arrow")},
+                         disabled=() if arrow_available() else ("Export Parquet", "Export Arrow"))
+
+    except Exception as e:
+        #Handle errors and display a message if something goes wrong
+        st.error(f"Error loading ranking overview: {e}")
+
+
+#Ranking Overview Page - Short Note
+# SQL Query: Fetches the latest week one page at a time in rank order (keyset pagination on the snapshot table);
+# a past week picked in the week selector is read once and paged in memory.
+# Data Processing: Converts each page into a DataFrame; "Load more" appends the next page.
+# Visualization: Creates a bar chart of the top N competitors or of points by country.
+# Export: Allows users to download the whole ranking week as CSV, Parquet or Arrow, built in the background.
@@ -0,0 +1,27 @@
+# Search page: competitors by name or ID (trigram index, see search_index.py)
+
+# Importing Required Libraries
+import streamlit as st           #For building the interactive web app interface
+
+from dashboard.resources import get_backend
+
+
+def render():
+    backend = get_backend()
+
+    st.subheader("🔍 Search Competitors")  #Subheader for the Search section
+    search_query = st.text_input("Enter competitor name or ID")  #Text input to search by name or ID
+
+    if search_query:
+        #Search competitors by name or ID (partial, case-insensitive match) with their latest ranking
+        df = backend.search(search_query)  #Columns: Competitor ID, Name, Country, Country Code, Abbreviation, Rank, Points, Movement, Competitions Played
+
+        if not df.empty:  # If there are results
+            st.dataframe(df, use_container_width=True)  #Display the DataFrame in the app
+        else:  # If no results are found
+            st.info("No results found.")  #Display a message if no results are found
+
+
+#Short Note: Serach Page          
+#User Input: Users type a competitor's name or ID in the search box.
+#SQL Query: The query searches for matches in the competitors_table and competitor_ranking_table based on the input.
@@ -0,0 +1,39 @@
+# Top Movers page: the 50 biggest rank movements of the latest week
+
+# Importing Required Libraries
+import streamlit as st           #For building the interactive web app interface
+
+from dashboard.resources import get_backend, get_figure_cache
+
+
+def render():
+    backend = get_backend()
+    figures = get_figure_cache()
+
+    st.subheader("🏆 Top Movers")  # Subheader for the page
+
+    try:
+        # SQL Query: Get the top 50 competitors with the largest movement in ranks in the latest week.
+        # The ETL precomputes them into the top_movers snapshot, so the page only reads up to 50 rows in order
+        top_movers_df = backend.top_movers()
+
+        # Check if there are no results
+        if top_movers_df.empty:
+            st.error("No data found or join issue.")
+
+        # Display the DataFrame in the app with a fixed height to allow scrolling
+        st.dataframe(top_movers_df, height=500)  # Set a fixed height for scrolling functionality
+
+        # Create a bar chart to visualize rank movement of top movers
+        fig = figures.express("bar", top_movers_df, x='competitor_name', y='movement', title="Top Movers - Movement", labels={'movement': 'Rank Movement', 'competitor_name': 'Competitor'})
+        st.plotly_chart(fig)  # Display the chart (built once per top_movers snapshot, then reused)
+
+    except Exception as e:
+        # Handle any exceptions (errors) that occur during data fetching or processing
+        st.error(f"Error loading top movers: {e}")
+
+
+#Top-Movers: Top Movers focusing specifically on players with substantial rank changes.
+#Ranking Overview & Top Movers
+#The Ranking Overview displays the rankings of all competitors for a given week, 
+#whereas Top Movers emphasizes competitors who have had the most notable movements, either up or down.
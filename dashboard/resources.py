@@ -0,0 +1,126 @@
+# Objects shared by every page and session: connection pool, query cache, data backend, figure cache, exports
+# Each one is created on first use (st.cache_resource, once per server process) and imports its module only then,
+# so opening the Home page does not load pandas, plotly or the in-memory store
+#
+# Set TENNIS_SQLITE_PATH to run the dashboard on a local SQLite file instead of MySQL (offline runs, benchmarks)
+# With TENNIS_BACKEND=api the pages read from the API service at TENNIS_API_URL (api_server.py) instead
+
+# Importing Required Libraries
+import os                        #SQLite path from the environment
+import sqlite3                   #Error class of the SQLite stand-in
+import urllib.request            #API health check (without importing api_client and pandas)
+
+import streamlit as st           #For building the interactive web app interface
+
+from db_pool import ConnectionPool, PoolTimeout, POOL_SIZE, mysql_factory, sqlite_factory #Shared connection pool
+
+SQLITE_PATH = os.environ.get("TENNIS_SQLITE_PATH")
+BACKEND = os.environ.get("TENNIS_BACKEND", "mysql")           #Same settings as backend.BACKEND and api_client.API_URL
+API_URL = os.environ.get("TENNIS_API_URL", "http://127.0.0.1:8600")
+
+_created = set()                 #Names of the resources created in this process (see created())
+
+
+#True once a resource exists, so the sidebar can show its stats without creating it
+def created(name):
+    return name in _created
+
+
+# MySQL Connection Pool
+# One pool per server process (cached across reruns and sessions), so a click borrows an open connection
+# instead of doing a new MySQL handshake
+@st.cache_resource
+def get_pool():
+    _created.add("pool")
+    if SQLITE_PATH:
+        return ConnectionPool(sqlite_factory(SQLITE_PATH), size=POOL_SIZE, dialect="sqlite")
+    return ConnectionPool(mysql_factory(), size=POOL_SIZE)
+
+
+#If the database (or in api mode the API service) is unreachable, shows an error and stops the app
+def check_database():
+    if BACKEND == "api":
+        try:
+            urllib.request.urlopen(API_URL.rstrip("/") + "/health", timeout=5).close()
+        except OSError as e:
+            st.error(f"API service at {API_URL} is unreachable: {e}")
+            st.stop()
+        return
+    pool = get_pool()
+    if pool.dialect == "mysql":
+        import mysql.connector   #Only for its error class; the pool imports it to connect anyway
+        errors = (mysql.connector.Error, PoolTimeout)
+    else:
+        errors = (sqlite3.Error, PoolTimeout)
+    try:
+        with pool.connection():
+            pass #Borrow and return one connection to confirm the database is reachable
+    except errors as e:
+        st.error(f"Database connection failed: {e}") #Display error in Streamlit UI
+        st.stop() #Stop app execution if connection fails
+
+
+# Query Result Cache
+# Shared by all sessions; ranking results are dropped when the weekly ETL calls query_cache.notify_invalidation()
+@st.cache_resource
+def get_query_cache():
+    from query_cache import QueryCache #TTL + LRU cache of query results as DataFrames
+    _created.add("query_cache")
+    return QueryCache()
+
+
+# Data Backend
+# Every page reads its DataFrames through this one object: "mysql" runs the page queries (through the cache above),
+# "memory" answers them from tables loaded once into pandas and refreshed in the background after each ETL run,
+# "arrow" does the same on the Arrow snapshot the ETL publishes, memory-mapped and shared by every server process,
+# "api" asks the read API service (api_server.py) and caches its responses like query results
+@st.cache_resource
+def get_backend():
+    from backend import make_backend #Page data from MySQL, the in-memory store or the API service (TENNIS_BACKEND)
+    from instrumentation import InstrumentedBackend #Each call shows up as a span on the Diagnostics page
+    _created.add("backend")
+    pool = None if BACKEND == "api" else get_pool() #The API service holds the database connections
+    return InstrumentedBackend(make_backend(BACKEND, pool, get_query_cache()))
+
+
+# Figure Cache
+# Charts are rebuilt only when the DataFrame behind them (or the chart spec) changes; shared by all sessions
+@st.cache_resource
+def get_figure_cache():
+    from figure_cache import FigureCache #Plotly figures reused across reruns
+    _created.add("figures")
+    return FigureCache()
+
+
+# Kaleido Renderer
+# Started once per server process, in the background, by the first page that offers PNG downloads
+@st.cache_resource
+def start_renderer():
+    from figure_cache import prewarm_renderer
+    return prewarm_renderer()
+
+
+# Export Service
+# Downloads are produced by a worker pool shared by all sessions and kept on disk by query hash, so a click only
+# queues a job; dashboard.downloads.export_panel() shows its progress and offers the file once it is written
+@st.cache_resource
+def get_export_service():
+    from exports import ExportService #CSV/Parquet/Arrow/PNG downloads built on a background worker pool
+    _created.add("exports")
+    return ExportService(get_pool())
+
+
+# Metrics Endpoint
+# With TENNIS_METRICS_PORT set, /metrics (Prometheus text) and /metrics.json are served from this process, so a
+# scraper can graph p95 page latency; returns None when the port is not set. It binds TENNIS_METRICS_HOST
+# (127.0.0.1 by default, like the read API): a scraper on another host needs it set to that interface or 0.0.0.0
+@st.cache_resource
+def start_metrics_endpoint():
+    from instrumentation import METRICS_PORT, start_metrics_server
+    if not METRICS_PORT:
+        return None
+    try:
+        return start_metrics_server(METRICS_PORT)
+    except OSError as e: #Port taken (e.g. a second server process): the dashboard itself keeps working
+        print(f"Metrics endpoint not started on port {METRICS_PORT}: {e}")
+        return None
@@ -0,0 +1,76 @@
+# Sidebar stats of the shared resources (dashboard.resources)
+# A resource that no page has used yet in this process is reported as not loaded instead of being created here,
+# so the stats do not pull pandas / plotly into a session that has only seen the Home page
+
+# Importing Required Libraries
+import streamlit as st           #For building the interactive web app interface
+from datetime import datetime    #For formatting the backend load time
+
+from dashboard import resources
+
+NOT_LOADED = "Not loaded yet: created by the first page that needs it."
+
+
+def render():
+    # Connection Pool Stats
+    # Connections stay open in the shared pool between reruns; show how busy the pool is
+    with st.sidebar.expander("🔌 Connection Pool"):
+        pool_stats = resources.get_pool().stats()
+        st.write(f"In use: {pool_stats['in_use']} / {pool_stats['size']} (idle: {pool_stats['idle']})")
+        st.write(f"Checkouts: {pool_stats['checkouts']} · waits: {pool_stats['waits']} (avg {pool_stats['avg_wait_ms']} ms)")
+        st.write(f"Checkout latency: avg {pool_stats['avg_checkout_ms']} ms · max {pool_stats['max_checkout_ms']} ms")
+        st.write(f"Reconnects: {pool_stats['reconnects']} · failures: {pool_stats['failures']}")
+
+    # Query Cache Stats
+    with st.sidebar.expander("🗄️ Query Cache"):
+        if not resources.created("query_cache"):
+            st.write(NOT_LOADED)
+        else:
+            query_cache = resources.get_query_cache()
+            cache_stats = query_cache.stats()
+            st.write(f"Entries: {cache_stats['entries']} ({cache_stats['bytes'] / 1024:.0f} KB of {cache_stats['max_bytes'] // (1024 * 1024)} MB)")
+            st.write(f"Hit rate: {cache_stats['hit_rate']:.0%} · evictions: {cache_stats['evictions']} · invalidated: {cache_stats['invalidations']}")
+            if st.button("Clear cache"):
+                query_cache.invalidate()
+
+    # Figure Cache Stats
+    with st.sidebar.expander("📈 Figure Cache"):
+        if not resources.created("figures"):
+            st.write(NOT_LOADED)
+        else:
+            from figure_cache import image_export_available
+            figure_stats = resources.get_figure_cache().stats()
+            st.write(f"Figures: {figure_stats['entries']} ({figure_stats['bytes'] / 1024:.0f} KB of JSON) · hit rate: {figure_stats['hit_rate']:.0%}")
+            st.write(f"Build time spent: {figure_stats['build_ms']:.0f} ms")
+            st.write("PNG export: " + ("Kaleido ready" if image_export_available() else "Kaleido not installed"))
+
+    # Export Service Stats
+    with st.sidebar.expander("📦 Exports"):
+        if not resources.created("exports"):
+            st.write(NOT_LOADED)
+        else:
+            export_stats = resources.get_export_service().stats()
+            st.write(f"Running: {export_stats['running']} · queued: {export_stats['queued']}")
+            st.write(f"Completed: {export_stats['completed']} · failed: {export_stats['failed']} · served from disk: {export_stats['hit_rate']:.0%}")
+            st.write(f"Rows written: {export_stats['rows']} ({export_stats['bytes'] / 1024:.0f} KB)")
+
+    # Data Backend Stats
+    with st.sidebar.expander("🧮 Data Backend"):
+        if not resources.created("backend"):
+            st.write(NOT_LOADED)
+            return
+        backend_stats = resources.get_backend().stats()
+        st.write(f"Backend: {backend_stats['backend']}")
+        if backend_stats["backend"] in ("memory", "arrow"):
+            st.write(f"Rows: {sum(backend_stats['rows'].values())} ({backend_stats['bytes'] / 1024:.0f} KB) · built in {backend_stats['build_ms']} ms")
+            st.write(f"Loaded: {datetime.fromtimestamp(backend_stats['loaded_at']):%Y-%m-%d %H:%M:%S} · refreshes: {backend_stats['refreshes']}")
+        if backend_stats["backend"] == "api":
+            st.write(f"API: {backend_stats['url']} ({backend_stats['format']}) · requests: {backend_stats['requests']} · reconnects: {backend_stats['reconnects']}")
+        if backend_stats["backend"] == "arrow":
+            snapshot = backend_stats["snapshot"]
+            if snapshot:
+                st.write(f"Snapshot: version {backend_stats['version']} ({snapshot['mapped_bytes'] / 1024:.0f} KB mapped, shared by every worker) · published {snapshot['published_at']}")
+            else:
+                st.write("Snapshot: none published yet, serving a private copy of the tables")
+            if backend_stats["last_error"]:
+                st.warning(f"Last refresh failed: {backend_stats['last_error']}")
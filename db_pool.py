@@ -0,0 +1,234 @@
+# Importing Required Libraries
+import os                        #For reading connection settings from environment variables
+import sqlite3                   #Local SQLite stand-in used for offline runs and benchmarks
+import threading                 #Lock and condition protecting the pool counters and idle list
+import time                      #For measuring wait time and checkout latency
+from contextlib import contextmanager
+
+import instrumentation           #Per-statement timings, EXPLAIN of slow statements
+
+# Database Settings
+# Same values the notebooks use; every value can be overridden with an environment variable
+DB_CONFIG = {
+    "host": os.environ.get("TENNIS_DB_HOST", "localhost"),
+    "user": os.environ.get("TENNIS_DB_USER", "root"),
+    "password": os.environ.get("TENNIS_DB_PASSWORD", ""),
+    "database": os.environ.get("TENNIS_DB_NAME", "sportanalytics"),
+    "port": int(os.environ.get("TENNIS_DB_PORT", 3314)),
+}
+
+POOL_SIZE = int(os.environ.get("TENNIS_DB_POOL_SIZE", 5))               #Maximum open connections per process
+POOL_TIMEOUT = float(os.environ.get("TENNIS_DB_POOL_TIMEOUT", 10))      #Seconds to wait for a free connection
+HEALTH_CHECK_INTERVAL = float(os.environ.get("TENNIS_DB_HEALTH_CHECK", 30))  #Idle seconds before a connection is pinged
+
+
+class PoolTimeout(Exception):
+    #Raised when no connection becomes free within the pool timeout
+    pass
+
+
+#Connection factories: a pool only needs a function that opens one new connection
+#Pooled MySQL connections only read, so they run in autocommit: with InnoDB's REPEATABLE READ an open transaction
+#would keep the snapshot of its first SELECT and the pages would never see a later ETL run
+def mysql_factory(config=None):
+    import mysql.connector
+    settings = {**DB_CONFIG, "autocommit": True, **(config or {})}
+    return lambda: mysql.connector.connect(**settings)
+
+
+def sqlite_factory(path):
+    return lambda: sqlite3.connect(path, check_same_thread=False)
+
+
+#Database a connection points at, written like etl.Context.fingerprint's target: the SQLite file's absolute path or
+#"mysql:<database>". Files built from one database (Arrow snapshot, search index) record it and are not served for another
+def database_target(conn, dialect):
+    cursor = conn.cursor()
+    if dialect == "sqlite":
+        cursor.execute("PRAGMA database_list")
+        path = next(row[2] for row in cursor.fetchall() if row[1] == "main")
+        target = os.path.abspath(path) if path else ":memory:"
+    else:
+        cursor.execute("SELECT DATABASE()")
+        target = f"mysql:{cursor.fetchall()[0][0]}"
+    cursor.close()
+    return target
+
+
+#Converts MySQL-style %s placeholders to the ? style SQLite expects
+def adapt_sql(sql, dialect):
+    if dialect == "sqlite":
+        return sql.replace("%s", "?")
+    return sql
+
+
+class ConnectionPool:
+    #Fixed-size pool of reusable connections
+    #Connections are opened lazily, pinged after being idle and replaced when they are broken
+
+    def __init__(self, factory, size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 health_check_interval=HEALTH_CHECK_INTERVAL, dialect="mysql"):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.dialect = dialect
+        self._idle = []                  #(connection, last_used) pairs; LIFO keeps the warmest connection in use
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)  #Signalled when a connection or a free slot comes back
+        self._created = 0
+        self._in_use = 0
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "checkout_seconds": 0.0,
+            "max_checkout_seconds": 0.0,
+            "hold_seconds": 0.0,
+            "reconnects": 0,
+            "failures": 0,
+        }
+
+    def _is_healthy(self, conn):
+        try:
+            if self.dialect == "sqlite":
+                conn.execute("SELECT 1")
+                return True
+            return conn.is_connected()   #mysql.connector pings the server here
+        except Exception:
+            return False
+
+    #Gives a connection's slot back (caller holds the lock); a waiter may open a new connection in it
+    def _free_slot(self):
+        self._created -= 1
+        self._available.notify()
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._free_slot()
+
+    #Opens a connection in a slot already counted in _created; the slot is given back if that fails
+    def _open(self):
+        try:
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._free_slot()
+                self._stats["failures"] += 1
+            raise
+
+    def _acquire(self):
+        waited = False
+        deadline = time.monotonic() + self.timeout
+        with self._available:
+            while True:
+                #1) Reuse an idle connection if there is one
+                if self._idle:
+                    return self._idle.pop(), waited
+                #2) Open a new connection while the pool is below its size
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                #3) Otherwise wait until another session returns a connection or a broken one frees its slot
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(f"No database connection free after {self.timeout}s (pool size {self.size})")
+                waited = True
+                self._available.wait(remaining)
+        return (self._open(), time.monotonic()), waited
+
+    @contextmanager
+    def connection(self):
+        start = time.perf_counter()
+        (conn, last_used), waited = self._acquire()
+        wait_seconds = time.perf_counter() - start if waited else 0.0
+
+        #Health check: ping connections that sat idle for a while and reconnect if the server dropped them
+        if time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(conn):
+            try:
+                conn.close()
+            except Exception:
+                pass
+            with self._lock:
+                self._stats["reconnects"] += 1
+            conn = self._open()          #Same slot: the dropped connection is replaced
+
+        checkout_seconds = time.perf_counter() - start
+        with self._lock:
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["waits"] += int(waited)
+            self._stats["wait_seconds"] += wait_seconds
+            self._stats["checkout_seconds"] += checkout_seconds
+            self._stats["max_checkout_seconds"] = max(self._stats["max_checkout_seconds"], checkout_seconds)
+
+        held_from = time.perf_counter()
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            #Roll back half-finished work; a connection that fails the ping afterwards is thrown away
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            broken = not self._is_healthy(conn)
+            raise
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._stats["hold_seconds"] += time.perf_counter() - held_from
+            if broken:
+                self._discard(conn)
+            else:
+                with self._available:
+                    self._idle.append((conn, time.monotonic()))
+                    self._available.notify()
+
+    def stats(self):
+        #Snapshot of the pool counters for the sidebar / diagnostics
+        with self._lock:
+            s = dict(self._stats)
+            s.update({
+                "size": self.size,
+                "open": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+            })
+        checkouts = s["checkouts"] or 1
+        s["avg_wait_ms"] = round(1000 * s["wait_seconds"] / max(s["waits"], 1), 3)
+        s["avg_checkout_ms"] = round(1000 * s["checkout_seconds"] / checkouts, 3)
+        s["max_checkout_ms"] = round(1000 * s["max_checkout_seconds"], 3)
+        s["avg_hold_ms"] = round(1000 * s["hold_seconds"] / checkouts, 3)
+        return s
+
+    def close_all(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, _ = self._idle.pop()
+            self._discard(conn)
+
+
+#Runs one statement on a pooled connection and returns all rows
+def fetch_all(pool, sql, params=None):
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        try:
+            if params is None:
+                cursor.execute(adapt_sql(sql, pool.dialect))
+            else:
+                cursor.execute(adapt_sql(sql, pool.dialect), params)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        #Timed per statement; a slow one is explained on the same connection before it goes back to the pool
+        instrumentation.recorder.record_query(sql, params, time.perf_counter() - start, len(rows),
+                                              lambda: instrumentation.explain_plan(conn, pool.dialect, sql, params))
+        return rows
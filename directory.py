@@ -0,0 +1,58 @@
+# Competitor directory: display labels <-> competitor_id
+# The comparison selectboxes used to list SELECT DISTINCT name and filter on co.name, so two players with the
+# same name were merged into one entry. The directory is read once per data refresh (queries.COMPETITOR_DIRECTORY,
+# cached until the ETL invalidates "rankings") and gives every competitor a unique label built from their name,
+# country and abbreviation; the pages pick competitor IDs and every comparison query filters on the indexed ID
+#
+# Labels look like "Pavic, Mate (Croatia, PAV)"; the ID is appended only if two competitors still share a label
+#
+# Usage:
+#   directory = CompetitorDirectory(frame)           frame: backend.DIRECTORY_COLUMNS
+#   directory.ids                                    competitor IDs in label order (for a selectbox)
+#   directory.label("sr:competitor:49363")           -> "Pavic, Mate (Croatia, PAV)"
+#   directory.find("Pavic, Mate (Croatia, PAV)")     -> "sr:competitor:49363"
+
+# Importing Required Libraries
+import sys                       #Size of the label maps
+
+
+def _label(name, country, abbreviation):
+    details = ", ".join(str(value) for value in (country, abbreviation) if value and value == value)  #Skips None / NaN
+    name = name if name and name == name else "(no name)"
+    return f"{name} ({details})" if details else str(name)
+
+
+class CompetitorDirectory:
+    #frame: one row per competitor with the backend.DIRECTORY_COLUMNS columns
+    def __init__(self, frame):
+        rows = sorted(zip(frame["Competitor ID"], frame["Name"], frame["Country"], frame["Abbreviation"]),
+                      key=lambda row: (str(row[1] or ""), str(row[0])))
+        labels = [_label(name, country, abbreviation) for _, name, country, abbreviation in rows]
+        seen = {}
+        for label in labels:
+            seen[label] = seen.get(label, 0) + 1
+        labels = [f"{label} [{row[0]}]" if seen[label] > 1 else label for label, row in zip(labels, rows)]
+
+        self.frame = frame                                        #Source rows (e.g. served by api_server.py)
+        self.ids = [row[0] for row in rows]                      #Competitor IDs in label order
+        self.labels = labels
+        self._labels = dict(zip(self.ids, labels))                #competitor_id -> label
+        self._ids = dict(zip(labels, self.ids))                   #label -> competitor_id
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, competitor_id):
+        return competitor_id in self._labels
+
+    #Label of a competitor (the ID itself if it is not in the directory)
+    def label(self, competitor_id):
+        return self._labels.get(competitor_id, str(competitor_id))
+
+    #Competitor ID of a label, or None
+    def find(self, label):
+        return self._ids.get(label)
+
+    def memory_bytes(self):
+        return (sys.getsizeof(self._labels) + sys.getsizeof(self._ids)
+                + sum(sys.getsizeof(i) + sys.getsizeof(l) for i, l in self._labels.items()))
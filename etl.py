@@ -0,0 +1,448 @@
+# ETL orchestrator: the ingestion notebooks as one dependency-aware pipeline
+# Loading the database meant running the COMPETITION DATA, Complex Data and DOUBLES COMPETITOR RANKINGS notebooks
+# by hand, cell by cell, each with its own connection and its own CREATE TABLE IF NOT EXISTS. etl.py runs the
+# same work as a DAG of stages:
+#   fetch -> parse -> stage -> load -> post-aggregate (hierarchy, snapshots, search index, notifications,
+#   Arrow snapshot for the dashboard workers)
+# - the schema is migrated once ("migrate"), before the first load
+# - the three branches (competitions + categories, complexes + venues, doubles rankings) run concurrently on a
+#   thread pool; the dependencies keep categorytable before competitiontable (foreign key) and the info.json
+#   upserts after both
+# - "stage" checks every parsed row against schema.COLUMNS and drops duplicate / keyless rows before loading
+# - every finished stage is checkpointed in data/etl_checkpoints/ (its output pickled, state.json lists the done
+#   stages), so after a failure --resume reruns only the failed stage and the stages that depend on it
+#   (the loads are upserts / insert-ignores and the ranking sync is diff-based, so rerunning one is safe)
+# - SQLite allows one writer at a time: there the stages that write take turns, fetch / parse / stage still overlap
+#
+# Usage (offline, against saved JSON fixtures):
+#   python etl.py --sqlite data/sportanalytics.db
+#   python etl.py --sqlite data/sportanalytics.db --resume      (continue a failed run from its checkpoints)
+#   python etl.py --mysql --workers 6
+# Usage (live API through fetcher.py):
+#   SPORTRADAR_API_KEY=... python etl.py --mysql --live --info 3101 2100
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import json                      #Checkpoint state file
+import os                        #Checkpoint paths
+import pickle                    #Stage outputs on disk
+import shutil                    #Removing the checkpoints of a finished run
+import sys                       #Exit status
+import threading                 #One SQLite writer at a time
+import time                      #Per-stage wall-clock timings
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+
+import arrow_snapshot            #Memory-mapped snapshot of the dashboard tables (post-aggregate stage)
+import ingest                    #Parsers, bulk loader, incremental ranking sync
+import notifications             #Ranking change notifications (post-aggregate stage)
+from db_pool import DB_CONFIG
+from hierarchy import refresh_hierarchy
+from migrate import migrate
+from schema import COLUMNS, KEYS
+from snapshots import refresh_snapshots
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "etl_checkpoints")
+STATE_FILE = "state.json"
+WORKERS = 4                      #Stages running at the same time
+
+FEEDS = (ingest.COMPETITIONS_FILE, ingest.COMPLEXES_FILE, ingest.RANKINGS_FILE)
+
+#writes: the stage writes to the database (serialized on SQLite)
+Stage = namedtuple("Stage", ["name", "deps", "fn", "writes"])
+
+
+class Context:
+    #Run settings shared by the stage functions
+    def __init__(self, args):
+        self.args = args
+        self.dialect = "sqlite" if args.sqlite else "mysql"
+        self.options = {"chunk_size": args.chunk_size, "use_infile": args.infile}
+
+    #Each stage that touches the database opens its own connection (stages run on different threads)
+    def connect(self):
+        return ingest.connect(self.args)[0]
+
+    #Identifies the run in the checkpoints: --resume refuses checkpoints of another target or payload source
+    def fingerprint(self):
+        target = os.path.abspath(self.args.sqlite) if self.args.sqlite else f"mysql:{DB_CONFIG.get('database')}"
+        source = "live:" + ",".join(self.args.info) if self.args.live else os.path.abspath(self.args.fixtures)
+        return {"target": target, "source": source}
+
+
+def _with_connection(ctx, fn):
+    conn = ctx.connect()
+    try:
+        return fn(conn)
+    finally:
+        conn.close()
+
+
+def _rows(result):
+    if isinstance(result, list):   #load / post stages: ingest stats dicts
+        return sum(s["rows"] for s in result)
+    if isinstance(result, dict):   #fetch: {file: payload}; parse / stage: {table: rows}
+        return sum(len(v) if isinstance(v, list) else v is not None for v in result.values())
+    return None
+
+
+# 1) Stage functions: fn(ctx, results) -> output; results holds the outputs of the finished stages
+
+def fetch(ctx, results):
+    args = ctx.args
+    if args.live:
+        return ingest.fetch_payloads(args.access_level, args.info)  #Concurrent requests under one rate limiter
+    payloads = {name: ingest.read_payload(name, args.fixtures) for name in FEEDS}
+    payloads.update(ingest.read_info_payloads(args.fixtures))
+    return payloads
+
+
+#Parse stages: payload -> {table: rows}; None when the payload is missing (an unchanged one is still parsed: whether
+#it is already loaded is decided by the database, see ingest.fetch_payloads)
+def parse_competitions(ctx, results):
+    data = results["fetch"].get(ingest.COMPETITIONS_FILE)
+    return None if data is None else dict(zip(("categorytable", "competitiontable"), ingest.parse_competitions(data)))
+
+
+def parse_competition_info(ctx, results):
+    payloads = [data for name, data in results["fetch"].items() if name not in FEEDS]
+    if not payloads:
+        return None
+    return dict(zip(("categorytable", "competitiontable"), ingest.merge_competition_infos(payloads)))
+
+
+def parse_complexes(ctx, results):
+    data = results["fetch"].get(ingest.COMPLEXES_FILE)
+    return None if data is None else dict(zip(("complex", "venue"), ingest.parse_complexes(data)))
+
+
+def parse_rankings(ctx, results):
+    data = results["fetch"].get(ingest.RANKINGS_FILE)
+    if data is None:
+        return None
+    return dict(zip(("competitor_ranking_table", "competitors_table"), ingest.parse_rankings(data)))
+
+
+#Stage: every row must have the table's column count; rows without a key are dropped, duplicate keys keep
+#the first row (tables without schema.KEYS are keyed on their first column)
+def stage_rows(table, rows):
+    width = len(COLUMNS[table])
+    key_positions = [COLUMNS[table].index(column) for column in KEYS.get(table, COLUMNS[table][:1])]
+    staged, rejected = {}, 0
+    for row in rows:
+        if len(row) != width:
+            raise ValueError(f"{table}: row has {len(row)} values, expected {width}: {row!r}")
+        key = tuple(row[i] for i in key_positions)
+        if any(value is None for value in key):
+            rejected += 1
+            continue
+        staged.setdefault(key, row)
+    if rejected:
+        print(f"stage: {rejected} {table} row(s) without a key dropped")
+    return list(staged.values())
+
+
+def stage(parse_name):
+    def run(ctx, results):
+        parsed = results[parse_name]
+        return None if parsed is None else {table: stage_rows(table, rows) for table, rows in parsed.items()}
+    return run
+
+
+#Load stages: ingest stats dicts, one per table written ([] when there was nothing to load)
+def load_categories(ctx, results):
+    rows = [row for name in ("stage:competitions", "stage:competition_info") if results[name]
+            for row in results[name]["categorytable"]]
+    if not rows:
+        return []
+    return _with_connection(ctx, lambda conn: [
+        ingest.bulk_load(conn, "categorytable", rows, ctx.dialect, mode="ignore", **ctx.options)])
+
+
+def load_competitions(ctx, results):
+    staged = results["stage:competitions"]
+    if staged is None:
+        return []
+    return _with_connection(ctx, lambda conn: [ingest.upsert_competitions(
+        conn, staged["competitiontable"], ctx.dialect, **ctx.options)])
+
+
+#info.json children are upserted after competitions.json, so the parent links they carry win
+def load_competition_info(ctx, results):
+    staged = results["stage:competition_info"]
+    if staged is None:
+        return []
+    options = dict(ctx.options, use_infile=False)  #Upserts always go through executemany
+    return _with_connection(ctx, lambda conn: [ingest.upsert_changed(
+        conn, "competitiontable", staged["competitiontable"], ctx.dialect, **options)])
+
+
+def load_complexes(ctx, results):
+    staged = results["stage:complexes"]
+    if staged is None:
+        return []
+    return _with_connection(ctx, lambda conn: ingest.load_batches(
+        conn, ("complex", "venue"), [(staged["complex"], staged["venue"])], ctx.dialect, mode="upsert", **ctx.options))
+
+
+#Incremental sync (diff against the stored week + watermark); the snapshots are rebuilt by post:snapshots
+def load_rankings(ctx, results):
+    staged = results["stage:rankings"]
+    if staged is None:
+        return []
+    generated_at = results["fetch"][ingest.RANKINGS_FILE].get("generated_at")
+
+    def sync(conn):
+        if ingest.already_synced(conn, generated_at, ctx.dialect):
+            print(f"{ingest.RANKINGS_FILE}: already synced (generated_at {generated_at}), skipped")
+            return []
+        batch = (staged["competitor_ranking_table"], staged["competitors_table"])
+        return ingest.sync_ranking_batches(conn, [batch], generated_at, ctx.dialect, snapshots=False, **ctx.options)
+    return _with_connection(ctx, sync)
+
+
+def _changed(stats, table):
+    return any(s["table"] == table and s["rows"] for s in stats)
+
+
+#Post-aggregate stages
+def post_hierarchy(ctx, results):
+    loaded = results["load:competitions"] + results["load:competition_info"]
+    if not _changed(loaded, "competitiontable"):
+        return []
+    return _with_connection(ctx, lambda conn: refresh_hierarchy(conn, ctx.dialect))
+
+
+def post_snapshots(ctx, results):
+    if not (_changed(results["load:rankings"], "competitor_ranking_table")
+            or _changed(results["load:rankings"], "competitors_table")):
+        return []
+    return _with_connection(ctx, lambda conn: refresh_snapshots(conn, ctx.dialect))
+
+
+def post_notifications(ctx, results):
+    if not _changed(results["load:rankings"], "competitor_ranking_table"):
+        return []
+    return _with_connection(ctx, lambda conn: notifications.evaluate(conn, ctx.dialect)[0])
+
+
+#Watermark rows for the competitions / complexes loads, so the memory / arrow backends see a new data version
+def post_watermark(ctx, results):
+    stats = [s for name in ("load:categories", "load:competitions", "load:competition_info", "load:complexes")
+             for s in results[name]]
+    if not any(s["rows"] for s in stats):
+        return []
+    _with_connection(ctx, lambda conn: ingest.record_loads(conn, stats, ctx.dialect))
+    return []
+
+
+#Every load / post stage whose stats say which dashboard tables changed
+SNAPSHOT_INPUTS = ("load:categories", "load:competitions", "load:competition_info", "load:complexes",
+                   "load:rankings", "post:snapshots")
+
+
+def post_arrow_snapshot(ctx, results):
+    if not arrow_snapshot.needs_publish([s for name in SNAPSHOT_INPUTS for s in results[name]]):
+        return []
+    return _with_connection(ctx, lambda conn: [arrow_snapshot.publish(conn, ctx.dialect)])
+
+
+def post_search_index(ctx, results):
+    if not _changed(results["load:rankings"], "competitors_table"):
+        return []
+    return _with_connection(ctx, lambda conn: [ingest.build_search_index(conn, ctx.dialect)])
+
+
+#New data committed: tell every dashboard process to drop its cached ranking / competition results
+def post_invalidate(ctx, results):
+    tags = []
+    if (_changed(results["load:rankings"], "competitor_ranking_table")
+            or _changed(results["load:rankings"], "competitors_table")):   #Same test as post_snapshots
+        tags.append("rankings")
+    if results["post:hierarchy"]:
+        tags.append("competitions")
+    if tags:
+        from query_cache import notify_invalidation
+        notify_invalidation(tags)
+    return {"tags": tags}
+
+
+def migrate_schema(ctx, results):
+    _with_connection(ctx, lambda conn: migrate(conn, ctx.dialect))
+    return []
+
+
+# 2) The DAG
+
+def build_stages():
+    stages = [
+        Stage("fetch", (), fetch, False),
+        Stage("migrate", (), migrate_schema, True),
+    ]
+    for feed, parse in (("competitions", parse_competitions), ("competition_info", parse_competition_info),
+                        ("complexes", parse_complexes), ("rankings", parse_rankings)):
+        stages += [
+            Stage(f"parse:{feed}", ("fetch",), parse, False),
+            Stage(f"stage:{feed}", (f"parse:{feed}",), stage(f"parse:{feed}"), False),
+        ]
+    stages += [
+        Stage("load:categories", ("migrate", "stage:competitions", "stage:competition_info"), load_categories, True),
+        Stage("load:competitions", ("load:categories",), load_competitions, True),  #categorytable first (FK)
+        Stage("load:competition_info", ("load:competitions",), load_competition_info, True),
+        Stage("load:complexes", ("migrate", "stage:complexes"), load_complexes, True),
+        Stage("load:rankings", ("migrate", "stage:rankings"), load_rankings, True),
+        Stage("post:hierarchy", ("load:competitions", "load:competition_info"), post_hierarchy, True),
+        Stage("post:snapshots", ("load:rankings",), post_snapshots, True),
+        Stage("post:search_index", ("load:rankings",), post_search_index, False),
+        Stage("post:notifications", ("load:rankings",), post_notifications, True),
+        Stage("post:watermark", ("load:competition_info", "load:complexes"), post_watermark, True),
+        Stage("post:arrow_snapshot", SNAPSHOT_INPUTS, post_arrow_snapshot, False),
+        Stage("post:invalidate", ("post:hierarchy", "post:snapshots", "post:search_index", "load:complexes"),
+              post_invalidate, False),
+    ]
+    return stages
+
+
+# 3) Checkpoints
+
+class Checkpoints:
+    #folder/state.json: {"run": fingerprint, "done": {stage: seconds}}; folder/<stage>.pkl: the stage's output
+    def __init__(self, folder, run):
+        self.folder = folder
+        self.run = run
+        self.done = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name):
+        return os.path.join(self.folder, name.replace(":", "_") + ".pkl")
+
+    #Outputs of the stages finished by an earlier run (resume), or {} after clearing the folder (fresh run)
+    def start(self, resume):
+        state_path = os.path.join(self.folder, STATE_FILE)
+        if resume and os.path.exists(state_path):
+            with open(state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state["run"] != self.run:
+                raise SystemExit(f"Checkpoints in {self.folder} belong to another run ({state['run']}); "
+                                 "run without --resume to start over")
+            self.done = state["done"]
+            outputs = {}
+            for name in self.done:
+                with open(self._path(name), "rb") as f:
+                    outputs[name] = pickle.load(f)
+            return outputs
+        if resume:
+            print(f"No checkpoints in {self.folder}: starting a fresh run")
+        self.clear()
+        os.makedirs(self.folder, exist_ok=True)
+        return {}
+
+    def save(self, name, output, seconds):
+        with self._lock:
+            with open(self._path(name), "wb") as f:
+                pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.done[name] = seconds
+            tmp = os.path.join(self.folder, STATE_FILE + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"run": self.run, "done": self.done}, f, indent=1)
+            os.replace(tmp, os.path.join(self.folder, STATE_FILE))  #The state never points at a half-written run
+
+    def clear(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+
+# 4) Scheduler
+
+#Runs every stage whose dependencies are done, up to `workers` at a time
+#Returns ({stage: {"status", "start", "seconds", "rows", "error"}} in DAG order, stage outputs, wall-clock seconds)
+def run_pipeline(stages, ctx, checkpoints, workers=WORKERS, resume=False):
+    results = checkpoints.start(resume)
+    report = {s.name: {"status": "resumed", "start": None, "seconds": checkpoints.done[s.name],
+                       "rows": _rows(results[s.name]), "error": None} for s in stages if s.name in results}
+    write_lock = threading.Lock() if ctx.dialect == "sqlite" else None
+    clock = time.perf_counter()
+
+    def execute(stage):
+        with write_lock if stage.writes and write_lock else nullcontext():
+            began = time.perf_counter()  #After the lock: waiting for the writer is not the stage's time
+            output = stage.fn(ctx, results)
+            return output, began - clock, time.perf_counter() - began
+
+    pending = {s.name: s for s in stages if s.name not in results}
+    running = {}
+    failed = set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.deps):
+                    running[pool.submit(execute, stage)] = stage
+                    del pending[name]
+            if not running:
+                break  #Everything left depends on a failed stage
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    output, start, seconds = future.result()
+                except Exception as exc:
+                    failed.add(stage.name)
+                    report[stage.name] = {"status": "failed", "start": None, "seconds": None, "rows": None,
+                                          "error": f"{type(exc).__name__}: {exc}"}
+                    continue
+                results[stage.name] = output
+                checkpoints.save(stage.name, output, seconds)
+                report[stage.name] = {"status": "done", "start": start, "seconds": seconds,
+                                      "rows": _rows(output), "error": None}
+    for name in pending:
+        report[name] = {"status": "blocked", "start": None, "seconds": None, "rows": None, "error": None}
+    return {s.name: report[s.name] for s in stages}, results, time.perf_counter() - clock
+
+
+def print_timings(report, wall_clock):
+    print(f"{'stage':<26}{'status':<10}{'start':>9}{'seconds':>10}{'rows':>9}")
+    for name, r in report.items():
+        start = f"{r['start']:.3f}" if r["start"] is not None else ""
+        seconds = f"{r['seconds']:.3f}" if r["seconds"] is not None else ""
+        rows = r["rows"] if r["rows"] is not None else ""
+        print(f"{name:<26}{r['status']:<10}{start:>9}{seconds:>10}{rows:>9}")
+    stage_time = sum(r["seconds"] for r in report.values() if r["status"] == "done")
+    print(f"wall clock {wall_clock:.3f} s for {stage_time:.3f} s of stage time")
+    for name, r in report.items():
+        if r["error"]:
+            print(f"{name} failed: {r['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Sportradar ETL as one dependency-aware, resumable pipeline")
+    parser.add_argument("--fixtures", default=ingest.FIXTURES_DIR, help="folder with the saved JSON payloads")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="load into a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="load into MySQL (db_pool.DB_CONFIG)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="stages run concurrently")
+    parser.add_argument("--resume", action="store_true", help="skip the stages checkpointed by the last failed run")
+    parser.add_argument("--checkpoints", default=CHECKPOINT_DIR, help="checkpoint folder")
+    parser.add_argument("--chunk-size", type=int, default=ingest.CHUNK_SIZE)
+    parser.add_argument("--infile", action="store_true", help="use LOAD DATA LOCAL INFILE (MySQL only)")
+    parser.add_argument("--live", action="store_true", help="fetch the payloads from the API instead of --fixtures")
+    parser.add_argument("--access-level", default="trial", help="Sportradar access level for --live")
+    parser.add_argument("--info", nargs="*", default=[], metavar="ID",
+                        help="competition ids whose info.json to fetch with --live (offline: every saved one)")
+    args = parser.parse_args(argv)
+
+    ctx = Context(args)
+    checkpoints = Checkpoints(args.checkpoints, ctx.fingerprint())
+    report, results, wall_clock = run_pipeline(build_stages(), ctx, checkpoints, args.workers, args.resume)
+    print_timings(report, wall_clock)
+
+    if any(r["status"] not in ("done", "resumed") for r in report.values()):
+        print(f"Finished stages are checkpointed in {args.checkpoints}; rerun with --resume to continue")
+        sys.exit(1)
+    checkpoints.clear()  #Complete run: nothing to resume
+    print()
+    ingest.print_report([s for name, output in results.items()
+                         if name.startswith(("load:", "post:")) and isinstance(output, list) for s in output])
+
+
+if __name__ == "__main__":
+    main()
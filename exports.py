@@ -0,0 +1,355 @@
+# Background export service for the dashboard downloads
+# The download buttons used to build to_csv() strings and PNG bytes inside the page render, so every click held
+# the script thread (and the whole week as one DataFrame) until the file was ready. Exports now run on a small
+# worker pool shared by all sessions:
+#   - query exports stream rows from a cursor in chunks of EXPORT_CHUNK_ROWS straight into the file
+#     (CSV, Parquet or Arrow IPC), never building a DataFrame of the whole result
+#     (MySQL: unbuffered cursor, rows are read off the socket as they are written; SQLite: lazy cursor)
+#   - PNG exports render a figure with Kaleido off the page thread
+#   - each artifact is written to data/exports/ under a hash of (normalized SQL, params, format, data version),
+#     so the same export requested by another session, or again after a rerun, is served from disk;
+#     the data version comes from the query_cache stamp file, so a new ETL run makes new artifacts
+#   - a job reports rows written / total rows, which the page shows as a progress bar; finished jobs are
+#     forgotten EXPORT_JOB_TTL seconds after they finish, and their files are kept at least that long
+# Parquet and Arrow IPC need pyarrow (installed with streamlit); arrow_available() tells the page
+#
+# Usage (in a page):
+#   job = exports.export_query(queries.LATEST_RANKINGS_SNAPSHOT, columns=RANKING_COLUMNS, fmt="parquet",
+#                              name="ranking_overview", count_sql=queries.LATEST_RANKINGS_COUNT)
+#   job.status, job.progress, exports.read(job)
+#
+#   python exports.py --sqlite data/sportanalytics.db --format parquet      (whole latest week to data/exports/)
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import csv                       #Chunked CSV writer
+import hashlib                   #Artifact key
+import json                      #Key material
+import os                        #Export folder and settings
+import sqlite3                   #Local SQLite stand-in
+import threading                 #Lock around the job table
+import time                      #Job timing
+import uuid                      #Job ids
+from concurrent.futures import ThreadPoolExecutor
+
+import queries
+from backend import RANKING_COLUMNS
+from db_pool import ConnectionPool, adapt_sql, mysql_factory, sqlite_factory
+from query_cache import STAMP_PATH, _read_stamp, normalize_sql
+
+# Export Settings
+EXPORT_DIR = os.environ.get(
+    "TENNIS_EXPORT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "exports"),
+)
+EXPORT_WORKERS = int(os.environ.get("TENNIS_EXPORT_WORKERS", 2))                      #Exports running at once (each holds a pooled connection)
+EXPORT_CHUNK_ROWS = int(os.environ.get("TENNIS_EXPORT_CHUNK_ROWS", 10000))            #Rows per fetchmany / record batch
+EXPORT_MAX_BYTES = int(os.environ.get("TENNIS_EXPORT_MAX_MB", 256)) * 1024 * 1024     #Disk cap; oldest artifacts are removed first
+EXPORT_JOB_TTL = float(os.environ.get("TENNIS_EXPORT_JOB_TTL", 3600))                 #Seconds a finished job (and its file) is kept for its download button
+
+#format -> (file extension, MIME type)
+FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "arrow": ("arrow", "application/vnd.apache.arrow.file"),
+    "png": ("png", "image/png"),
+}
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+#True when Parquet / Arrow IPC exports are possible
+def arrow_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+#Cursor that streams the result instead of loading it into client memory first
+def stream_cursor(conn, dialect):
+    if dialect == "mysql":
+        return conn.cursor(buffered=False)
+    return conn.cursor()
+
+
+#Writes rows to one file, a chunk at a time
+class CsvWriter:
+    def __init__(self, path, columns):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ArrowWriter:
+    #Parquet (one row group per chunk) or Arrow IPC file (one record batch per chunk)
+    #Column types are taken from the first chunk; a column that is all NULL there is written as string
+    def __init__(self, path, columns, fmt):
+        import pyarrow as pa
+        self.pa = pa
+        self.path, self.columns, self.fmt = path, columns, fmt
+        self.schema = None
+        self._writer = None
+
+    def _open(self, arrays):
+        pa = self.pa
+        fields = [pa.field(c, pa.string() if a.type == pa.null() else a.type) for c, a in zip(self.columns, arrays)]
+        self.schema = pa.schema(fields)
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        else:
+            self._writer = pa.ipc.new_file(self.path, self.schema)
+
+    def write(self, rows):
+        pa = self.pa
+        values = list(zip(*rows)) if rows else [[] for _ in self.columns]
+        if self.schema is None:
+            arrays = [pa.array(v) for v in values]
+            self._open(arrays)
+        arrays = [pa.array(v, type=f.type) for v, f in zip(values, self.schema)]
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        if self._writer is None:  #Empty result: still write a valid file with the column names
+            self.write([])
+        self._writer.close()
+
+
+def make_writer(path, columns, fmt):
+    if fmt == "csv":
+        return CsvWriter(path, columns)
+    return ArrowWriter(path, columns, fmt)
+
+
+class ExportJob:
+    #One requested artifact; the worker updates status / rows while the page reads them
+    def __init__(self, key, fmt, name, path, total=None):
+        self.id = uuid.uuid4().hex
+        self.key, self.fmt, self.name, self.path = key, fmt, name, path
+        self.file_name = f"{name}.{FORMATS[fmt][0]}"
+        self.mime = FORMATS[fmt][1]
+        self.status = QUEUED
+        self.rows = 0
+        self.total = total
+        self.bytes = 0
+        self.error = None
+        self.cached = False
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.seconds = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    #0..1 for st.progress: rows written / total rows when the total is known
+    @property
+    def progress(self):
+        if self.status == DONE:
+            return 1.0
+        if self.total:
+            return min(self.rows / self.total, 1.0)
+        return 0.0
+
+
+class ExportService:
+    #Worker pool + artifact cache; one instance per server process (st.cache_resource)
+    def __init__(self, pool, folder=EXPORT_DIR, workers=EXPORT_WORKERS, chunk_rows=EXPORT_CHUNK_ROWS,
+                 max_bytes=EXPORT_MAX_BYTES, stamp_path=STAMP_PATH, job_ttl=EXPORT_JOB_TTL):
+        self.pool = pool
+        self.folder = folder
+        self.chunk_rows = chunk_rows
+        self.max_bytes = max_bytes
+        self.job_ttl = job_ttl
+        self.stamp_path = stamp_path
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export")
+        self._lock = threading.Lock()
+        self._jobs = {}       #job id -> ExportJob
+        self._by_key = {}     #artifact key -> latest ExportJob for it
+        self._stats = {"submitted": 0, "cache_hits": 0, "completed": 0, "failed": 0, "rows": 0, "bytes": 0}
+        os.makedirs(folder, exist_ok=True)
+
+    #Artifact key: the same export of the same data version always maps to the same file
+    def _key(self, material, tags):
+        versions = _read_stamp(self.stamp_path)
+        material = dict(material, version={tag: versions.get(tag, 0) for tag in tags})
+        return hashlib.blake2b(json.dumps(material, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+    #Returns the running or finished job for key, or queues run(job) on the worker pool
+    def _submit(self, key, fmt, name, run):
+        path = os.path.join(self.folder, f"{key}.{FORMATS[fmt][0]}")
+        with self._lock:
+            self._expire_locked()  #Cache hits never reach _prune
+            self._stats["submitted"] += 1
+            job = self._by_key.get(key)
+            if job is not None and job.status != FAILED and (not job.finished or os.path.exists(job.path)):
+                self._stats["cache_hits"] += int(job.status == DONE)
+                return job
+            job = ExportJob(key, fmt, name, path)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+            if os.path.exists(path):  #Written earlier (another process or before a restart)
+                job.status, job.cached, job.bytes, job.seconds = DONE, True, os.path.getsize(path), 0.0
+                job.finished_at = time.time()
+                self._stats["cache_hits"] += 1
+                return job
+        self._executor.submit(self._run, job, run)
+        return job
+
+    def _run(self, job, run):
+        start = time.perf_counter()
+        job.status = RUNNING
+        tmp_path = f"{job.path}.{job.id}.tmp"
+        try:
+            run(job, tmp_path)
+            os.replace(tmp_path, job.path)  #Readers never see a half-written artifact
+            job.bytes = os.path.getsize(job.path)
+            job.status = DONE
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = FAILED
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        job.seconds = time.perf_counter() - start
+        job.finished_at = time.time()
+        with self._lock:
+            self._stats["completed" if job.status == DONE else "failed"] += 1
+            self._stats["rows"] += job.rows
+            self._stats["bytes"] += job.bytes
+        self._prune()
+
+    #Forgets jobs that finished more than job_ttl seconds ago (caller holds the lock)
+    def _expire_locked(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.job_ttl:
+                del self._jobs[job_id]
+                if self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+
+    #Removes the oldest artifacts once the folder is over max_bytes; the files of running and recently finished
+    #jobs are kept, so a download button shown on a page still finds its file
+    def _prune(self):
+        with self._lock:
+            self._expire_locked()
+            keep = {job.path for job in self._jobs.values() if job.status != FAILED}
+        files = []
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and not entry.name.endswith(".tmp") and entry.path not in keep:
+                files.append((entry.stat().st_mtime, entry.stat().st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    #Queues an export of one query's result
+    #count_sql: optional COUNT(*) query for the progress total; tags: query_cache tags whose version the data has
+    def export_query(self, sql, params=None, columns=None, fmt="csv", name="export", count_sql=None,
+                     tags=("rankings",)):
+        if fmt not in ("csv", "parquet", "arrow"):
+            raise ValueError(f"Unknown export format: {fmt}")
+        if fmt != "csv" and not arrow_available():
+            raise RuntimeError(f"{fmt} export needs pyarrow: pip install pyarrow")
+        params = tuple(params) if params is not None else None
+        key = self._key({"sql": normalize_sql(sql), "params": params, "columns": columns, "format": fmt}, tags)
+
+        def run(job, path):
+            dialect = self.pool.dialect
+            with self.pool.connection() as conn:
+                if count_sql is not None:
+                    cursor = conn.cursor()
+                    cursor.execute(adapt_sql(count_sql, dialect), params or ())
+                    job.total = cursor.fetchone()[0]
+                    cursor.close()
+                cursor = stream_cursor(conn, dialect)
+                try:
+                    cursor.execute(adapt_sql(sql, dialect), params or ())
+                    names = columns or [d[0] for d in cursor.description]
+                    writer = make_writer(path, names, fmt)
+                    try:
+                        while True:
+                            rows = cursor.fetchmany(self.chunk_rows)
+                            if not rows:
+                                break
+                            writer.write(rows)
+                            job.rows += len(rows)
+                    finally:
+                        writer.close()
+                finally:
+                    cursor.close()
+        return self._submit(key, fmt, name, run)
+
+    #Queues a PNG render of a plotly figure (needs kaleido >= 1)
+    def export_figure(self, figure, name="chart", **image_options):
+        import plotly.io as pio
+        key = self._key({"figure": pio.to_json(figure, validate=False), "options": image_options, "format": "png"}, ())
+
+        def run(job, path):
+            job.total = 1
+            with open(path, "wb") as f:
+                f.write(figure.to_image(format="png", **image_options))
+            job.rows = 1
+        return self._submit(key, "png", name, run)
+
+    def job(self, job_id):
+        return self._jobs.get(job_id)
+
+    #Contents of a finished artifact (for st.download_button)
+    def read(self, job):
+        with open(job.path, "rb") as f:
+            return f.read()
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+            s = dict(self._stats)
+        s["queued"] = sum(job.status == QUEUED for job in jobs)
+        s["running"] = sum(job.status == RUNNING for job in jobs)
+        s["hit_rate"] = s["cache_hits"] / s["submitted"] if s["submitted"] else 0.0
+        return s
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the latest ranking week to data/exports/")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="read a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="read MySQL (db_pool.DB_CONFIG)")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], default="csv")
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        pool = ConnectionPool(sqlite_factory(args.sqlite), size=1, dialect="sqlite")
+    else:
+        pool = ConnectionPool(mysql_factory(), size=1)
+    service = ExportService(pool, workers=1)
+    try:
+        job = service.export_query(queries.LATEST_RANKINGS_SNAPSHOT, columns=RANKING_COLUMNS, fmt=args.format,
+                                   name="ranking_overview", count_sql=queries.LATEST_RANKINGS_COUNT)
+        while not job.finished:
+            time.sleep(0.1)
+        if job.status == FAILED:
+            raise SystemExit(job.error)
+        rows = "cached" if job.cached else f"{job.rows} rows in {job.seconds:.2f}s"
+        print(f"{rows}, {job.bytes / 1024:.0f} KB -> {job.path}")
+    finally:
+        service.shutdown()
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+# Concurrent Sportradar fetcher
+# Replaces the one-at-a-time requests.get(url) calls in the notebooks with an asyncio client:
+#   - connection-pooled HTTP transport (aiohttp when installed, urllib in a thread pool otherwise)
+#   - token-bucket rate limiter matching the API quota (trial: 1 request/second)
+#   - exponential backoff with jitter on 429 / 5xx / network errors (Retry-After is honoured)
+#   - on-disk response cache keyed by URL; ETag revalidation and generated_at comparison report unchanged payloads
+# The transport is pluggable, so the fetcher runs offline against fixture JSON (StubTransport)
+#
+# Usage:
+#   SPORTRADAR_API_KEY=... python fetcher.py competitions complexes rankings --info 3101 --out data/raw
+#   python fetcher.py competitions --offline data/fixtures --out /tmp/raw
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import asyncio                   #Concurrent requests
+import hashlib                   #Cache file names
+import http.client               #Errors of a cut-off urllib response
+import json                      #Payloads and cache metadata
+import os                        #Paths and the API key
+import random                    #Backoff jitter
+import time                      #Rate limiter clock
+import urllib.error
+import urllib.parse
+import urllib.request
+
+API_KEY = os.environ.get("SPORTRADAR_API_KEY", "")
+BASE_URL = "https://api.sportradar.com/tennis/{access_level}/v3/{language}/"
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "api_cache")
+
+#Requests per second and burst size per access level (adjust to the quota on your Sportradar account)
+QUOTAS = {
+    "trial": (1.0, 1),
+    "production": (10.0, 10),
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+#Endpoint paths used by the notebooks
+COMPETITIONS = "competitions.json"
+COMPLEXES = "complexes.json"
+DOUBLES_RANKINGS = "double_competitors_rankings.json"
+
+
+def competition_info_path(competition_id):
+    #"sr:competition:3101" or "3101" -> competitions/sr%3Acompetition%3A3101/info.json
+    if not str(competition_id).startswith("sr:"):
+        competition_id = f"sr:competition:{competition_id}"
+    return f"competitions/{urllib.parse.quote(competition_id, safe='')}/info.json"
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.body = body
+
+
+class FetchResult:
+    #data: decoded JSON; from_cache: served from disk without a new body;
+    #unchanged: same payload as the cached copy (304 or identical generated_at). Reported only: the cache is written
+    #when the response arrives, before anything is loaded, so loaders must not skip on it (ingest.fetch_payloads)
+    def __init__(self, path, status, data, from_cache=False, unchanged=False):
+        self.path = path
+        self.status = status
+        self.data = data
+        self.from_cache = from_cache
+        self.unchanged = unchanged
+
+
+class FetchError(Exception):
+    pass
+
+
+# Transports: anything with "async get(url, headers) -> Response" and "async close()"; their "errors" tuple lists
+# the exceptions of a failed request (besides OSError / timeouts) that are retried like a 5xx
+
+class AiohttpTransport:
+    #One aiohttp session for the whole run, so TCP/TLS connections are reused across requests
+    def __init__(self, limit=10, timeout=30):
+        import aiohttp
+        self._aiohttp = aiohttp
+        self.errors = (aiohttp.ClientError,)  #ServerDisconnectedError, ClientPayloadError, ... are not OSErrors
+        self._session = None
+        self.limit = limit
+        self.timeout = timeout
+
+    async def get(self, url, headers):
+        if self._session is None:
+            self._session = self._aiohttp.ClientSession(
+                connector=self._aiohttp.TCPConnector(limit=self.limit),
+                timeout=self._aiohttp.ClientTimeout(total=self.timeout),
+            )
+        async with self._session.get(url, headers=headers) as response:
+            return Response(response.status, dict(response.headers), await response.read())
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+class UrllibTransport:
+    #Standard-library fallback: blocking urllib calls run in the default thread pool
+    errors = (http.client.HTTPException,)  #IncompleteRead, BadStatusLine: a response cut off mid-way
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+
+    def _get(self, url, headers):
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return Response(response.status, dict(response.headers), response.read())
+        except urllib.error.HTTPError as e:
+            return Response(e.code, dict(e.headers or {}), e.read() or b"")
+
+    async def get(self, url, headers):
+        return await asyncio.get_running_loop().run_in_executor(None, self._get, url, headers)
+
+    async def close(self):
+        pass
+
+
+class StubTransport:
+    #Offline transport: serves <fixtures_dir>/<file name of the URL path>, e.g. complexes.json
+    #info.json requests map to competition_info_<id>.json; anything missing is a 404
+    #fail_first: {file name: [status, ...]} responses returned before the real file (to exercise retries)
+    errors = ()
+
+    def __init__(self, fixtures_dir, fail_first=None):
+        self.fixtures_dir = fixtures_dir
+        self.fail_first = {k: list(v) for k, v in (fail_first or {}).items()}
+        self.requests = []
+
+    def _file_name(self, url):
+        path = urllib.parse.unquote(urllib.parse.urlparse(url).path)
+        if path.endswith("/info.json"):
+            competition_id = path.rsplit("/", 2)[-2].rsplit(":", 1)[-1]
+            return f"competition_info_{competition_id}.json"
+        return path.rsplit("/", 1)[-1]
+
+    async def get(self, url, headers):
+        name = self._file_name(url)
+        self.requests.append(name)
+        if self.fail_first.get(name):
+            return Response(self.fail_first[name].pop(0), {"Retry-After": "0"}, b"")
+        file_path = os.path.join(self.fixtures_dir, name)
+        if not os.path.exists(file_path):
+            return Response(404, {}, b'{"message": "Not found"}')
+        with open(file_path, "rb") as f:
+            body = f.read()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if headers.get("If-None-Match") == etag:
+            return Response(304, {"ETag": etag}, b"")
+        return Response(200, {"ETag": etag, "Content-Type": "application/json"}, body)
+
+    async def close(self):
+        pass
+
+
+def default_transport():
+    try:
+        return AiohttpTransport()
+    except ImportError:
+        return UrllibTransport()
+
+
+# Rate limiting
+
+class TokenBucket:
+    #rate tokens are added per second up to capacity; each request takes one
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# On-disk response cache
+
+class DiskCache:
+    #One <sha256 of URL>.json body file plus a .meta.json file (ETag, generated_at, fetched_at) per URL
+    #The API key is removed from the URL before hashing, so rotating keys keeps the cache
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, url):
+        parts = urllib.parse.urlsplit(url)
+        query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query) if k != "api_key"]
+        clean = urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(sorted(query))))
+        return os.path.join(self.cache_dir, hashlib.sha256(clean.encode()).hexdigest())
+
+    def get(self, url):
+        key = self._key(url)
+        try:
+            with open(key + ".meta.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(key + ".json", "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def put(self, url, body, meta):
+        key = self._key(url)
+        for suffix, content in ((".json", body), (".meta.json", json.dumps(meta).encode())):
+            tmp_path = f"{key}{suffix}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, key + suffix)
+
+
+# Fetcher
+
+class SportradarFetcher:
+    def __init__(self, api_key=API_KEY, access_level="trial", language="en", transport=None,
+                 rate=None, burst=None, concurrency=8, max_retries=5, backoff=1.0,
+                 cache=None, base_url=BASE_URL):
+        quota_rate, quota_burst = QUOTAS.get(access_level, QUOTAS["trial"])
+        self.api_key = api_key
+        self.base_url = base_url.format(access_level=access_level, language=language)
+        self.transport = transport or default_transport()
+        self.retry_errors = (OSError, asyncio.TimeoutError, *getattr(self.transport, "errors", ()))
+        self.bucket = TokenBucket(rate or quota_rate, burst or quota_burst)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = DiskCache() if cache is None else cache
+        self.stats = {"requests": 0, "retries": 0, "not_modified": 0, "unchanged": 0, "errors": 0}
+
+    def url(self, path):
+        query = f"?api_key={self.api_key}" if self.api_key else ""
+        return f"{self.base_url}{path}{query}"
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)  #Exponential backoff with jitter
+
+    async def fetch(self, path):
+        url = self.url(path)
+        meta, cached_body = self.cache.get(url) if self.cache else (None, None)
+        headers = {"accept": "application/json"}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.bucket.acquire()
+                self.stats["requests"] += 1
+                try:
+                    response = await self.transport.get(url, headers)
+                except self.retry_errors as e:
+                    response, error = None, e
+                else:
+                    error = None
+                    if response.status not in RETRY_STATUSES:
+                        break
+                if attempt == self.max_retries:
+                    self.stats["errors"] += 1
+                    raise FetchError(f"{path}: gave up after {attempt + 1} attempts "
+                                     f"({error or response.status})")
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._delay(attempt, response))
+
+        if response.status == 304 and cached_body is not None:
+            self.stats["not_modified"] += 1
+            return FetchResult(path, 304, json.loads(cached_body), from_cache=True, unchanged=True)
+        if response.status != 200:
+            self.stats["errors"] += 1
+            raise FetchError(f"{path}: HTTP {response.status}")
+
+        data = json.loads(response.body)
+        unchanged = bool(meta) and data.get("generated_at") is not None \
+            and meta.get("generated_at") == data.get("generated_at")
+        if unchanged:
+            self.stats["unchanged"] += 1
+        if self.cache:
+            self.cache.put(url, response.body, {
+                "etag": response.headers.get("etag"),
+                "generated_at": data.get("generated_at"),
+                "fetched_at": time.time(),
+            })
+        return FetchResult(path, 200, data, unchanged=unchanged)
+
+    #Fetches many paths concurrently (bounded by the semaphore and the rate limiter)
+    #Failed paths come back as FetchError instances instead of cancelling the others
+    async def fetch_many(self, paths):
+        return await asyncio.gather(*(self.fetch(path) for path in paths), return_exceptions=True)
+
+    async def competitions(self):
+        return await self.fetch(COMPETITIONS)
+
+    async def complexes(self):
+        return await self.fetch(COMPLEXES)
+
+    async def doubles_rankings(self):
+        return await self.fetch(DOUBLES_RANKINGS)
+
+    async def competition_infos(self, competition_ids):
+        return await self.fetch_many([competition_info_path(c) for c in competition_ids])
+
+    async def close(self):
+        await self.transport.close()
+
+
+async def _run(args):
+    transport = StubTransport(args.offline) if args.offline else None
+    fetcher = SportradarFetcher(access_level=args.access_level, transport=transport,
+                                concurrency=args.concurrency, rate=args.rate)
+    endpoints = {"competitions": COMPETITIONS, "complexes": COMPLEXES, "rankings": DOUBLES_RANKINGS}
+    paths = [endpoints[name] for name in args.endpoints] + [competition_info_path(c) for c in args.info]
+    start = time.perf_counter()
+    try:
+        results = await fetcher.fetch_many(paths)
+    finally:
+        await fetcher.close()
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    for path, result in zip(paths, results):
+        if isinstance(result, Exception):
+            print(f"FAILED     {result}")
+            continue
+        print(f"{'unchanged' if result.unchanged else 'new':<10} {path}")
+        if args.out:
+            name = path.replace("/", "_").replace("%3A", "_")
+            with open(os.path.join(args.out, name), "w", encoding="utf-8") as f:
+                json.dump(result.data, f)
+    print(f"{len(paths)} requests in {time.perf_counter() - start:.2f}s - {fetcher.stats}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch Sportradar tennis endpoints concurrently")
+    parser.add_argument("endpoints", nargs="*", choices=["competitions", "complexes", "rankings"])
+    parser.add_argument("--info", nargs="*", default=[], help="competition ids for competitions/{id}/info.json")
+    parser.add_argument("--access-level", default="trial", choices=sorted(QUOTAS))
+    parser.add_argument("--rate", type=float, help="requests per second (default: the access level quota)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--offline", metavar="FIXTURES_DIR", help="serve responses from fixture JSON files")
+    parser.add_argument("--out", help="folder to write the payloads to")
+    asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
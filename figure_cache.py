@@ -0,0 +1,141 @@
+# Plotly figure cache for the dashboard pages
+# Every rerun used to rebuild each px.bar / px.line / go.Scatterpolar from scratch (tens of ms each), even when
+# the data behind it had not changed. A figure is now built once per (chart name, content hash of the input
+# DataFrame, chart spec) and kept as its serialized JSON; the Figure object is kept next to it, so a rerun
+# with the same inputs costs one hash of the DataFrame
+#
+# Image export: fig.to_image() starts Kaleido (a headless Chrome) and takes seconds, so PNGs are rendered by the
+# export service (exports.ExportService.export_figure) off the page thread, and prewarm_renderer() starts the
+# renderer process in the background when the dashboard starts
+#
+# Usage (in a page):
+#   fig = figures.express("bar", df, x="Competitor", y="Points", title="Points Comparison")
+#   fig = figures.figure("radar", df, lambda: build_radar(df))
+# Returned figures are shared between sessions and must be treated as read-only
+
+# Importing Required Libraries
+import hashlib                   #Content hash of the input DataFrame
+import json                      #Chart spec in the cache key
+import os                        #Cache size from the environment
+import threading                 #Lock around the entries; background renderer start
+import time                      #Build timing
+from collections import OrderedDict
+from importlib import metadata   #Kaleido version check
+
+import instrumentation           #Figure build / cache hit spans of the page render
+
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get("TENNIS_FIGURE_CACHE_MB", 32)) * 1024 * 1024
+
+
+#Content hash of a DataFrame: column names, dtypes and every value (index included)
+def frame_hash(df):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([[str(c) for c in df.columns], [str(t) for t in df.dtypes]]).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    except TypeError:  #Unhashable cell values (lists, dicts)
+        digest.update(df.to_json(orient="split", default_handler=str).encode())
+    return digest.hexdigest()
+
+
+def figure_key(name, data, spec):
+    return name, frame_hash(data) if data is not None else None, json.dumps(spec, sort_keys=True, default=str)
+
+
+#True when static image export works (plotly needs kaleido >= 1)
+def image_export_available():
+    try:
+        return int(metadata.version("kaleido").split(".")[0]) >= 1
+    except (metadata.PackageNotFoundError, ValueError):
+        return False
+
+
+#Starts Kaleido's persistent renderer (a headless Chrome process) on a background thread, so the first PNG
+#export does not pay for the browser start; returns the thread, or None when image export is unavailable
+def prewarm_renderer():
+    if not image_export_available():
+        return None
+    import kaleido
+
+    def start():
+        try:
+            if hasattr(kaleido, "start_sync_server"):
+                kaleido.start_sync_server(silence_warnings=True)
+            else:
+                pio.to_image({"data": [], "layout": {}}, format="png", width=10, height=10)  #Starts it on first use
+        except Exception:  #No Chrome on this machine: exports will report the error when they are requested
+            pass
+
+    thread = threading.Thread(target=start, name="kaleido-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+class FigureCache:
+    #LRU cache of figures capped by the size of their JSON
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   #key -> {"json", "figure"}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "build_ms": 0.0}
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+            return entry
+
+    def _store(self, key, figure, seconds):
+        entry = {"json": pio.to_json(figure, validate=False), "figure": figure}
+        with self._lock:
+            self._stats["misses"] += 1
+            self._stats["build_ms"] += seconds * 1000
+            if key in self._entries:  #Built by another session in the meantime
+                return self._entries[key]
+            self._entries[key] = entry
+            self._bytes += len(entry["json"])
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= len(old["json"])
+                self._stats["evictions"] += 1
+        return entry
+
+    #The figure for (name, data, spec); build() is only called when it is not cached yet
+    def figure(self, name, data, build, **spec):
+        with instrumentation.span("figure", name) as span:
+            key = figure_key(name, data, spec)
+            entry = self._lookup(key)
+            span["hit"] = entry is not None
+            if entry is None:
+                start = time.perf_counter()
+                figure = build()
+                entry = self._store(key, figure, time.perf_counter() - start)
+                span["bytes"] = len(entry["json"])
+            return entry["figure"]
+
+    #Shortcut for plotly express charts: figures.express("bar", df, x=..., y=...) caches px.bar(df, x=..., y=...)
+    def express(self, kind, data, **kwargs):
+        return self.figure(f"px.{kind}", data, lambda: getattr(px, kind)(data, **kwargs), **kwargs)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,192 @@
+# Competition hierarchy index
+# competitiontable only stores each competition's parent_id, so "everything under ATP Vienna" took one self-join
+# per level. The ETL now also keeps a closure table (schema.py: competition_closure) with one row per
+# (ancestor, descendant) pair and the number of levels between them (depth 0 = the competition itself):
+#   - all descendants of X:   WHERE ancestor_id = X AND depth > 0     (primary-key range)
+#   - depth of X:             MAX(depth) WHERE descendant_id = X      (idx_closure_descendant)
+#   - roll-up counts under X: the descendants joined to competitiontable, grouped by category/type/gender
+# Parent links come from parent_id in competitions.json and from the children[] of competitions/{id}/info.json
+#
+# The Competition Hierarchy page reads the whole tree once (queries.COMPETITION_TREE) into a CompetitionTree,
+# which numbers the competitions in depth-first order (a nested-set encoding): the subtree of a competition is
+# one contiguous slice, so drilling down a level needs no further query
+#
+# Usage:
+#   python hierarchy.py --sqlite data/sportanalytics.db                  (rebuild the closure table)
+#   python hierarchy.py --sqlite data/sportanalytics.db --under 3101     (descendants, depth and roll-up of one)
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import sqlite3                   #Local SQLite stand-in
+import time                      #Timing the rebuild
+
+import numpy as np
+import pandas as pd
+
+import queries                   #Hierarchy lookups
+from db_pool import DB_CONFIG, adapt_sql
+
+CHUNK_SIZE = 1000                #Closure rows per executemany call
+ROLLUP_COLUMNS = ["Category", "Type", "Gender", "Competitions"]
+
+INSERT_SQL = "INSERT INTO competition_closure (ancestor_id, descendant_id, depth) VALUES (%s, %s, %s)"
+
+
+#"3101" or "sr:competition:3101" -> "sr:competition:3101"
+def competition_id(value):
+    value = str(value)
+    return value if value.startswith("sr:") else f"sr:competition:{value}"
+
+
+#(competition_id, parent_id) pairs -> closure rows (ancestor_id, descendant_id, depth)
+#A parent that is not a known competition ends the chain; a parent cycle is cut where it repeats
+def closure_rows(edges):
+    parents = dict(edges)
+    rows = []
+    for descendant in parents:
+        ancestor, depth, seen = descendant, 0, set()
+        while ancestor in parents and ancestor not in seen:
+            rows.append((ancestor, descendant, depth))
+            seen.add(ancestor)
+            ancestor, depth = parents[ancestor], depth + 1
+    return rows
+
+
+#Rebuilds competition_closure from the parent links in competitiontable
+#The table is emptied and refilled in one transaction, so readers see either the old or the new tree
+#Returns report lines in the same shape as ingest.bulk_load stats
+def refresh_hierarchy(conn, dialect="mysql", chunk_size=CHUNK_SIZE):
+    start = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute("SELECT competition_id, parent_id FROM competitiontable")
+    rows = closure_rows(cursor.fetchall())
+    sql = adapt_sql(INSERT_SQL, dialect)
+    try:
+        cursor.execute("DELETE FROM competition_closure")
+        for i in range(0, len(rows), chunk_size):
+            cursor.executemany(sql, rows[i:i + chunk_size])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    seconds = time.perf_counter() - start
+    return [{
+        "table": "competition_closure",
+        "rows": len(rows),
+        "seconds": seconds,
+        "rows_per_sec": len(rows) / seconds if seconds > 0 else float("inf"),
+        "method": "closure rebuild",
+    }]
+
+
+class CompetitionTree:
+    #frame: one row per competition with the backend.TREE_COLUMNS columns, in display (name) order
+    def __init__(self, frame):
+        ids = frame["Competition ID"].tolist()
+        position = {c: i for i, c in enumerate(ids)}
+        children = [[] for _ in ids]
+        roots = []
+        for i, parent in enumerate(frame["Parent ID"].tolist()):
+            p = position.get(parent)
+            (roots if p is None or p == i else children[p]).append(i)
+
+        #Depth-first numbering: each competition is followed by its whole subtree
+        order, end = [], [0] * len(ids)
+        visited = [False] * len(ids)
+        for starts in (roots, range(len(ids))):  #Then anything only reachable through a parent cycle
+            stack = [(i, False) for i in reversed(starts)]
+            while stack:
+                i, closing = stack.pop()
+                if closing:
+                    end[i] = len(order)
+                    continue
+                if visited[i]:
+                    continue
+                visited[i] = True
+                order.append(i)
+                stack.append((i, True))
+                stack.extend((c, False) for c in reversed(children[i]))
+
+        rank = np.empty(len(ids), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        self.frame = frame.iloc[order].reset_index(drop=True)
+        self.index = {ids[i]: int(rank[i]) for i in range(len(ids))}   #competition_id -> position in self.frame
+        self.end = np.array([end[i] for i in order], dtype=np.int64)   #Subtree of position p = frame[p:end[p]]
+        self.child_positions = {ids[i]: [int(rank[c]) for c in children[i]] for i in range(len(ids))}
+        self.root_positions = [int(rank[i]) for i in roots]
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __contains__(self, competition_id):
+        return competition_id in self.index
+
+    def name(self, competition_id):
+        return self.frame.at[self.index[competition_id], "Competition"]
+
+    #Direct children of a competition (the top-level competitions for None), in name order
+    def children(self, competition_id=None):
+        positions = self.root_positions if competition_id is None else self.child_positions.get(competition_id, [])
+        return self.frame.iloc[positions]
+
+    #Every competition below one competition, in depth-first order
+    def descendants(self, competition_id):
+        p = self.index[competition_id]
+        return self.frame.iloc[p + 1:self.end[p]]
+
+    #Competition IDs from the top-level competition down to competition_id
+    def path(self, competition_id):
+        path = []
+        while competition_id in self.index and competition_id not in path:
+            path.append(competition_id)
+            competition_id = self.frame.at[self.index[competition_id], "Parent ID"]
+        return path[::-1]
+
+    #Competitions per category, type and gender below one competition (the whole tree for None)
+    def rollup(self, competition_id=None):
+        rows = self.frame if competition_id is None else self.descendants(competition_id)
+        counts = rows.groupby(["Category", "Type", "Gender"], dropna=False).size()
+        counts = counts.rename("Competitions").reset_index()
+        return counts.sort_values(["Competitions", "Category", "Type", "Gender"],
+                                  ascending=[False, True, True, True], ignore_index=True)[ROLLUP_COLUMNS]
+
+    def memory_bytes(self):
+        return int(self.frame.memory_usage(deep=True).sum()) + self.end.nbytes + 100 * len(self.index)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the competition closure table or look up one competition")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="use a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="use MySQL (db_pool.DB_CONFIG)")
+    parser.add_argument("--under", metavar="ID", help="print the descendants, depth and roll-up of a competition")
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        conn, dialect = sqlite3.connect(args.sqlite), "sqlite"
+    else:
+        import mysql.connector
+        conn, dialect = mysql.connector.connect(**DB_CONFIG), "mysql"
+    try:
+        if not args.under:
+            for s in refresh_hierarchy(conn, dialect):
+                print(f"{s['table']:<20}{s['rows']:>8} rows")
+            return
+        params = (competition_id(args.under),)
+        cursor = conn.cursor()
+        cursor.execute(adapt_sql(queries.COMPETITION_DEPTH, dialect), params)
+        print(f"{params[0]}: depth {cursor.fetchone()[0]}")
+        cursor.execute(adapt_sql(queries.COMPETITION_DESCENDANTS, dialect), params)
+        for row in cursor.fetchall():
+            print(f"  depth {row[5]}  {row[0]:<24} {row[1]} ({row[3]}, {row[4]})")
+        cursor.execute(adapt_sql(queries.COMPETITION_ROLLUP, dialect), params)
+        print(pd.DataFrame(cursor.fetchall(), columns=ROLLUP_COLUMNS).to_string(index=False))
+        cursor.close()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,616 @@
+# Bulk-load ingestion for the Sportradar payloads
+# Replaces the row-by-row "for _, row in df.iterrows(): cursor.execute(INSERT ...)" loops in the notebooks:
+# rows are sent in chunks with executemany (or LOAD DATA LOCAL INFILE) and committed once per chunk
+#
+# Rankings are synced incrementally: only rows that differ from the stored week are upserted
+#
+# Usage (offline, against saved JSON fixtures):
+#   python ingest.py --sqlite data/sportanalytics.db
+#   python ingest.py --mysql --chunk-size 5000 --infile
+#   python ingest.py --mysql --stream          (rankings and complexes read incrementally, see stream_parser.py)
+# Usage (live API through fetcher.py; payloads already in the database write nothing):
+#   SPORTRADAR_API_KEY=... python ingest.py --mysql --live
+#   SPORTRADAR_API_KEY=... python ingest.py --mysql --live --info 3101 2100     (plus competitions/{id}/info.json)
+# After the competitions are loaded the competition hierarchy (hierarchy.py) is rebuilt; after a rankings load that
+# changed rows the ranking notification rules are evaluated (notifications.py); then, if any dashboard table
+# changed, a new Arrow snapshot is published for the dashboard workers (arrow_snapshot.py)
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import csv                       #Temporary CSV for the LOAD DATA fast path
+import glob                      #Finding the saved info.json payloads
+import json                      #Reading the saved API payloads
+import os                        #File paths
+import sqlite3                   #Local SQLite stand-in
+import tempfile                  #Temporary CSV file
+import time                      #Timing each table load
+from datetime import datetime, timezone
+from itertools import islice     #Splitting rows into chunks without copying them
+
+from db_pool import DB_CONFIG, adapt_sql
+from hierarchy import refresh_hierarchy
+from migrate import migrate
+from schema import COLUMNS, KEYS
+from snapshots import refresh_snapshots
+
+CHUNK_SIZE = 1000                #Rows per executemany call / commit
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fixtures")
+
+#Payload file behind each endpoint (same names as the API paths)
+RANKINGS_FILE = "double_competitors_rankings.json"
+RANKINGS_SOURCE = "double_competitors_rankings"  #etl_watermark.source for the rankings sync
+LOAD_SOURCES = {                 #etl_watermark.source of the other loads -> the tables they write
+    "competitions": ("categorytable", "competitiontable"),
+    "complexes": ("complex", "venue"),
+}
+COMPETITIONS_FILE = "competitions.json"
+COMPLEXES_FILE = "complexes.json"
+COMPETITION_INFO_FILE = "competition_info_{id}.json"   #competitions/sr:competition:{id}/info.json
+
+
+# 1) Parsers: flatten the nested JSON into row tuples (in schema.COLUMNS order)
+
+#One rankings[].competitor_rankings[] entry -> (competitor_ranking_table row, competitors_table row)
+#'year' and 'week' come from the parent ranking object
+def ranking_entry_rows(competitor_ranking, year, week):
+    competitor = competitor_ranking.get("competitor", {})
+    ranking_row = (
+        competitor.get("id"),
+        year,
+        week,
+        competitor_ranking.get("rank"),
+        competitor_ranking.get("movement"),
+        competitor_ranking.get("points"),
+        competitor_ranking.get("competitions_played"),
+    )
+    competitor_row = (
+        competitor.get("id"),
+        competitor.get("name"),
+        competitor.get("country"),
+        competitor.get("country_code"),
+        competitor.get("abbreviation"),
+        year,
+        week,
+    )
+    return ranking_row, competitor_row
+
+
+#double_competitors_rankings.json -> competitor_ranking_table rows, competitors_table rows
+#rank_id is no longer numbered here; the database assigns it and (competitor_id, year, week) is the key
+def parse_rankings(data):
+    ranking_rows = []
+    competitor_rows = {}  #One row per competitor_id (first occurrence wins)
+    for ranking in data.get("rankings", []):
+        for competitor_ranking in ranking.get("competitor_rankings", []):
+            ranking_row, competitor_row = ranking_entry_rows(competitor_ranking, ranking.get("year"), ranking.get("week"))
+            ranking_rows.append(ranking_row)
+            competitor_rows.setdefault(competitor_row[0], competitor_row)
+    return ranking_rows, list(competitor_rows.values())
+
+
+#competitions.json -> categorytable rows, competitiontable rows
+def parse_competitions(data):
+    categories = {}
+    competition_rows = []
+    for item in data.get("competitions", []):
+        category = item.get("category", {})
+        category_id = category.get("id", "unknown")
+        categories.setdefault(category_id, (category_id, category.get("name", "unknown")))
+        competition_rows.append((
+            item.get("id", "unknown"),
+            item.get("name", "unknown"),
+            item.get("parent_id"),
+            item.get("type", "unknown"),
+            item.get("gender", "unknown"),
+            category_id,
+        ))
+    return list(categories.values()), competition_rows
+
+
+#competitions/{id}/info.json -> categorytable rows, competitiontable rows for the competition and its children[]
+#The children carry parent_id but no category; they belong to the category of the competition they sit under
+def parse_competition_info(data):
+    competition = data.get("competition", {})
+    category = competition.get("category", {})
+    category_id = category.get("id", "unknown")
+    items = [competition] + [child.get("competition", {}) for child in competition.get("children", [])]
+    competition_rows = [(
+        item.get("id", "unknown"),
+        item.get("name", "unknown"),
+        item.get("parent_id"),
+        item.get("type", "unknown"),
+        item.get("gender", "unknown"),
+        category_id,
+    ) for item in items]
+    return [(category_id, category.get("name", "unknown"))], competition_rows
+
+
+#One complexes[] entry -> (complex row, venue rows)
+def complex_entry_rows(cmplx):
+    complex_id = cmplx.get("id")
+    venue_rows = [(
+        venue.get("id"),
+        venue.get("name"),
+        venue.get("city_name"),
+        venue.get("country_name"),
+        venue.get("country_code"),
+        venue.get("timezone"),
+        complex_id,  #Foreign key reference
+    ) for venue in cmplx.get("venues", [])]
+    return (complex_id, cmplx.get("name")), venue_rows
+
+
+#complexes.json -> complex rows, venue rows
+def parse_complexes(data):
+    complex_rows = []
+    venue_rows = []
+    for cmplx in data.get("complexes", []):
+        complex_row, venues = complex_entry_rows(cmplx)
+        complex_rows.append(complex_row)
+        venue_rows.extend(venues)
+    return complex_rows, venue_rows
+
+
+# 2) Bulk loader
+
+#mode: "insert", "ignore" (skip rows whose key exists) or "upsert" (update them; needs schema.KEYS)
+def insert_sql(table, columns, dialect="mysql", mode="insert"):
+    verbs = {
+        ("insert", "mysql"): "INSERT",
+        ("insert", "sqlite"): "INSERT",
+        ("ignore", "mysql"): "INSERT IGNORE",
+        ("ignore", "sqlite"): "INSERT OR IGNORE",
+        ("upsert", "mysql"): "INSERT",
+        ("upsert", "sqlite"): "INSERT",
+    }
+    placeholders = ", ".join(["%s"] * len(columns))
+    sql = f"{verbs[(mode, dialect)]} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    if mode == "upsert":
+        keys = KEYS[table]
+        updates = [c for c in columns if c not in keys]
+        if dialect == "sqlite":
+            sql += f" ON CONFLICT ({', '.join(keys)}) DO UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in updates)
+        else:
+            sql += " ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = VALUES({c})" for c in updates)
+    return adapt_sql(sql, dialect)
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+#Fast path for MySQL: write the rows to a temporary CSV and let the server parse it in one statement
+#Needs local_infile enabled on the server and allow_local_infile=True on the connection
+def _load_infile(conn, table, columns, rows, mode):
+    count = 0
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", encoding="utf-8", delete=False) as f:
+        writer = csv.writer(f, lineterminator="\n")
+        for row in rows:
+            writer.writerow(["\\N" if value is None else value for value in row])  #\N is NULL for LOAD DATA
+            count += 1
+        path = f.name
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s {'IGNORE ' if mode == 'ignore' else ''}INTO TABLE {table} "
+            "CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            f"LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+            (path,),
+        )
+        count = cursor.rowcount if cursor.rowcount >= 0 else count  #IGNORE: rows actually inserted
+        conn.commit()
+        cursor.close()
+    finally:
+        os.remove(path)
+    return count
+
+
+#Loads rows (any iterable of tuples, e.g. a generator) into one table
+#Returns a stats dict: table, rows, seconds, rows_per_sec, method
+#"rows" counts the rows written: for mode="ignore" the rows not already stored; upserts count every row sent
+#(MySQL reports 2 per updated row), so callers diff first (upsert_changed, sync_ranking_batches)
+def bulk_load(conn, table, rows, dialect="mysql", chunk_size=CHUNK_SIZE, mode="insert",
+              use_infile=False, columns=None):
+    columns = columns or COLUMNS[table]
+    start = time.perf_counter()
+    if use_infile and dialect == "mysql" and mode != "upsert":
+        count = _load_infile(conn, table, columns, rows, mode)
+        method = "load data infile"
+    else:
+        sql = insert_sql(table, columns, dialect, mode)
+        cursor = conn.cursor()
+        count = 0
+        for chunk in _chunks(rows, chunk_size):
+            cursor.executemany(sql, chunk)  #mysql.connector rewrites this into one multi-row INSERT
+            conn.commit()                   #One commit per chunk
+            count += len(chunk) if mode == "upsert" or cursor.rowcount < 0 else cursor.rowcount
+        cursor.close()
+        method = f"executemany x{chunk_size}"
+    seconds = time.perf_counter() - start
+    return {
+        "table": table,
+        "rows": count,
+        "seconds": seconds,
+        "rows_per_sec": count / seconds if seconds > 0 else float("inf"),
+        "method": method,
+    }
+
+
+#Adds up the stats of several bulk_load calls into one line per table (in the order of tables)
+def merge_stats(tables, stats):
+    merged = {table: {"table": table, "rows": 0, "seconds": 0.0, "method": None} for table in tables}
+    for s in stats:
+        m = merged[s["table"]]
+        m["rows"] += s["rows"]
+        m["seconds"] += s["seconds"]
+        m["method"] = m["method"] or s["method"]
+    for m in merged.values():
+        m["rows_per_sec"] = m["rows"] / m["seconds"] if m["seconds"] > 0 else float("inf")
+        m["method"] = m["method"] or "nothing to load"
+    return list(merged.values())
+
+
+#Stored non-key values of the given rows of a table keyed on its first column: {(key,): values}
+def _stored_rows(conn, table, rows, dialect, chunk_size):
+    key, = KEYS[table]
+    stored = {}
+    for chunk in _chunks([row[0] for row in rows], chunk_size):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        for stored_key, *values in _fetch(conn, f"SELECT {', '.join(COLUMNS[table])} FROM {table} "
+                                                f"WHERE {key} IN ({placeholders})", tuple(chunk), dialect):
+            stored[(stored_key,)] = tuple(values)
+    return stored
+
+
+#Upserts only the rows that differ from the stored ones, so "rows" in the stats is the number of rows changed
+#(a re-load of an unchanged payload reports 0 and does not trigger the downstream rebuilds)
+def upsert_changed(conn, table, rows, dialect="mysql", chunk_size=CHUNK_SIZE, **options):
+    rows = list(rows)
+    changes = changed_rows(rows, _stored_rows(conn, table, rows, dialect, chunk_size), key_len=1)
+    stats = bulk_load(conn, table, changes, dialect, chunk_size=chunk_size, mode="upsert", **options)
+    stats["method"] += " (changed rows only)"
+    return stats
+
+
+#Loads a stream of batches; each batch holds one list of rows per table, e.g. (complex rows, venue rows)
+#A batch is committed before the next one is read, so only one batch is in memory at a time
+def load_batches(conn, tables, batches, dialect="mysql", mode="insert", **options):
+    stats = []
+    for batch in batches:
+        for table, rows in zip(tables, batch):
+            if not rows:
+                continue
+            if mode == "upsert":
+                stats.append(upsert_changed(conn, table, rows, dialect, **options))
+            else:
+                stats.append(bulk_load(conn, table, rows, dialect, mode=mode, **options))
+    return merge_stats(tables, stats)
+
+
+# 3) Loading the three payloads
+
+def read_payload(name, fixtures_dir=FIXTURES_DIR):
+    with open(os.path.join(fixtures_dir, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+#Every saved competitions/{id}/info.json payload in the fixtures folder: {file name: payload}
+def read_info_payloads(fixtures_dir=FIXTURES_DIR):
+    pattern = os.path.join(fixtures_dir, COMPETITION_INFO_FILE.format(id="*"))
+    return {os.path.basename(path): read_payload(os.path.basename(path), fixtures_dir)
+            for path in sorted(glob.glob(pattern))}
+
+
+#Fetches the three endpoints (and the info.json of info_ids) concurrently with fetcher.py: {file name: payload}
+#A payload the response cache reports as unchanged (304 / same generated_at) is still returned: the cache is written
+#before the load, so if that load failed only the database knows the payload is missing (the rankings sync checks
+#etl_watermark, the other loads diff against the stored rows and write nothing for a payload already loaded)
+def fetch_payloads(access_level="trial", info_ids=()):
+    import asyncio
+    from fetcher import SportradarFetcher, competition_info_path
+    from hierarchy import competition_id
+
+    names = [COMPETITIONS_FILE, COMPLEXES_FILE, RANKINGS_FILE]
+    paths = list(names)
+    for info_id in info_ids:
+        names.append(COMPETITION_INFO_FILE.format(id=competition_id(info_id).rsplit(":", 1)[-1]))
+        paths.append(competition_info_path(info_id))
+
+    async def run():
+        fetcher = SportradarFetcher(access_level=access_level)
+        try:
+            results = await fetcher.fetch_many(paths)
+        finally:
+            await fetcher.close()
+        payloads = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                raise result
+            payloads[name] = result.data
+        return payloads
+
+    return asyncio.run(run())
+
+
+def _fetch(conn, sql, params, dialect):
+    cursor = conn.cursor()
+    cursor.execute(adapt_sql(sql, dialect), params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+#Latest watermark for a source: (generated_at, year, week) of the last successful run, or None
+def last_watermark(conn, source, dialect="mysql"):
+    rows = _fetch(conn, "SELECT generated_at, year, week FROM etl_watermark WHERE source = %s "
+                        "ORDER BY run_id DESC LIMIT 1", (source,), dialect)
+    return rows[0] if rows else None
+
+
+def record_watermark(conn, source, year, week, generated_at, rows_seen, rows_changed, dialect="mysql"):
+    run_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    bulk_load(conn, "etl_watermark", [(source, year, week, generated_at, rows_seen, rows_changed, run_at)], dialect)
+
+
+#Records the competitions / complexes loads that changed rows (year and week NULL): the in-memory stores take
+#the last run_id as their data version (memstore.VERSION_SQL), so they reload the competitions and venues too
+def record_loads(conn, stats, dialect="mysql"):
+    for source, tables in LOAD_SOURCES.items():
+        changed = sum(s["rows"] for s in stats if s["table"] in tables)
+        if changed:
+            record_watermark(conn, source, None, None, None, None, changed, dialect)
+
+
+#Rows in new_rows whose values differ from what is stored (or that are not stored yet)
+#stored maps key -> the row's non-key values
+def changed_rows(new_rows, stored, key_len):
+    return [row for row in new_rows if stored.get(tuple(row[:key_len])) != tuple(row[key_len:])]
+
+
+#True when a rankings payload with this generated_at was already synced (the last watermark)
+def already_synced(conn, generated_at, dialect="mysql"):
+    watermark = last_watermark(conn, RANKINGS_SOURCE, dialect)
+    return watermark is not None and generated_at is not None and watermark[0] == generated_at
+
+
+#Stored values of the given ranking rows, looked up by key: {(competitor_id, year, week): values}
+def _stored_rankings(conn, ranking_rows, dialect, chunk_size):
+    ids_by_week = {}
+    for row in ranking_rows:
+        ids_by_week.setdefault((row[1], row[2]), []).append(row[0])
+    stored = {}
+    for (year, week), ids in ids_by_week.items():
+        for chunk in _chunks(ids, chunk_size):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            for competitor_id, yr, wk, *values in _fetch(
+                    conn, "SELECT competitor_id, year, week, ranks, movement, points, competitions_played "
+                          "FROM competitor_ranking_table "
+                          f"WHERE year = %s AND week = %s AND competitor_id IN ({placeholders})",
+                    (year, week, *chunk), dialect):
+                stored[(competitor_id, yr, wk)] = tuple(values)
+    return stored
+
+
+#Competitor rows that differ from the stored ones; a row from an older (or undated) week than the stored one is
+#skipped, so a backfill of past weeks never moves the week back or reverts the name / country to older details
+def _competitor_changes(conn, competitor_rows, dialect, chunk_size):
+    stored = {}
+    for chunk in _chunks([row[0] for row in competitor_rows], chunk_size):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        for competitor_id, *values in _fetch(
+                conn, "SELECT competitor_id, name, country, country_code, abbreviation, year, week "
+                      f"FROM competitors_table WHERE competitor_id IN ({placeholders})", tuple(chunk), dialect):
+            stored[competitor_id] = tuple(values)
+    changes = []
+    for row in competitor_rows:
+        old = stored.get(row[0])
+        if old is not None and old[4] is not None and (row[5] is None or old[4:] > row[5:]):
+            continue
+        if old != row[1:]:
+            changes.append(row)
+    return changes
+
+
+#Incremental sync of a stream of (ranking rows, competitor rows) batches from one payload
+#Each batch is diffed against the stored rows with the same keys and only changed rows are upserted,
+#then the run is recorded in etl_watermark. Cost is O(rows in the payload + changes), independent of
+#how much history is stored, and only one batch is held in memory at a time
+#A competitor listed in several batches is compared with what the earlier batch stored (same values: no write)
+#snapshots=False leaves the snapshot refresh to the caller (etl.py runs it as its own stage)
+#source: etl_watermark.source of the run (backfill.py records each loaded week under its own source)
+def sync_ranking_batches(conn, batches, generated_at, dialect="mysql", chunk_size=CHUNK_SIZE, use_infile=False,
+                         snapshots=True, source=RANKINGS_SOURCE):
+    options = {"chunk_size": chunk_size, "use_infile": use_infile}
+    stats = []
+    rows_seen = rows_changed = 0
+    latest = None
+    for ranking_rows, competitor_rows in batches:
+        new_competitors = {}
+        for row in competitor_rows:
+            new_competitors.setdefault(row[0], row)  #First occurrence wins
+        new_competitors = list(new_competitors.values())
+        ranking_changes = changed_rows(ranking_rows, _stored_rankings(conn, ranking_rows, dialect, chunk_size), key_len=3)
+        competitor_changes = _competitor_changes(conn, new_competitors, dialect, chunk_size)
+        stats.append(bulk_load(conn, "competitor_ranking_table", ranking_changes, dialect, mode="upsert", **options))
+        stats.append(bulk_load(conn, "competitors_table", competitor_changes, dialect, mode="upsert", **options))
+        rows_seen += len(ranking_rows)
+        rows_changed += len(ranking_changes) + len(competitor_changes)
+        weeks = [(row[1], row[2]) for row in ranking_rows if row[2] is not None]
+        if weeks:
+            latest = max(weeks + ([latest] if latest else []))
+
+    stats = merge_stats(["competitor_ranking_table", "competitors_table"], stats)
+    for s in stats:
+        s["method"] += " (changed rows only)"
+    latest_year, latest_week = latest or (None, None)
+    record_watermark(conn, source, latest_year, latest_week, generated_at, rows_seen, rows_changed, dialect)
+    if rows_changed and snapshots:
+        stats += refresh_snapshots(conn, dialect)  #Rebuild the page snapshots once per load, not per page view
+    return stats
+
+
+#Incremental sync of one rankings payload
+#- skipped entirely when its generated_at matches the last watermark
+#- otherwise diffed against the stored rows and only changed rows are upserted
+def sync_rankings(conn, data, dialect="mysql", chunk_size=CHUNK_SIZE, use_infile=False, snapshots=True):
+    generated_at = data.get("generated_at")
+    if already_synced(conn, generated_at, dialect):
+        return []  #Same payload as the last run: nothing to do
+    return sync_ranking_batches(conn, [parse_rankings(data)], generated_at, dialect, chunk_size, use_infile, snapshots)
+
+
+#Loads a rankings payload through the incremental sync (safe to re-run)
+def load_rankings(conn, data, dialect="mysql", **options):
+    return sync_rankings(conn, data, dialect, **options)
+
+
+#Upserts competitions.json rows, so renamed competitions and changed types / genders are written; a row without a
+#parent_id keeps the stored one (the parent links only info.json carries survive every competitions.json load)
+def upsert_competitions(conn, rows, dialect="mysql", chunk_size=CHUNK_SIZE, **options):
+    rows = list(rows)
+    stored = _stored_rows(conn, "competitiontable", rows, dialect, chunk_size)
+    rows = [row[:2] + (stored[(row[0],)][1],) + row[3:] if row[2] is None and (row[0],) in stored else row
+            for row in rows]
+    options.pop("use_infile", None)  #Upserts always go through executemany
+    return upsert_changed(conn, "competitiontable", rows, dialect, chunk_size, **options)
+
+
+def load_competitions(conn, data, dialect="mysql", **options):
+    category_rows, competition_rows = parse_competitions(data)
+    return [
+        bulk_load(conn, "categorytable", category_rows, dialect, mode="ignore", **options),  #Parent table first (foreign key)
+        upsert_competitions(conn, competition_rows, dialect, **options),
+    ]
+
+
+#info.json payloads -> categorytable rows, competitiontable rows (one row per id)
+def merge_competition_infos(payloads):
+    category_rows, competition_rows = {}, {}
+    for data in payloads:
+        categories, competitions = parse_competition_info(data)
+        category_rows.update((row[0], row) for row in categories)
+        for row in competitions:
+            stored = competition_rows.get(row[0])
+            #The same competition seen as a child and as the subject of its own info.json: keep the known parent
+            competition_rows[row[0]] = row if stored is None or row[2] is not None else stored
+    return list(category_rows.values()), list(competition_rows.values())
+
+
+#Loads info.json payloads: their children[] are upserted so the parent links they carry are stored
+#even for competitions that competitions.json listed without a parent_id
+def load_competition_infos(conn, payloads, dialect="mysql", **options):
+    category_rows, competition_rows = merge_competition_infos(payloads)
+    options.pop("use_infile", None)  #Upserts always go through executemany
+    return [
+        bulk_load(conn, "categorytable", category_rows, dialect, mode="ignore", **options),
+        upsert_changed(conn, "competitiontable", competition_rows, dialect, **options),
+    ]
+
+
+def load_complexes(conn, data, dialect="mysql", **options):
+    return load_batches(conn, ("complex", "venue"), [parse_complexes(data)], dialect, mode="upsert", **options)
+
+
+#Rebuilds and saves the competitor search index after a load that changed competitors (see search_index.py)
+def build_search_index(conn, dialect="mysql"):
+    from search_index import build_from_connection
+    start = time.perf_counter()
+    index = build_from_connection(conn, dialect=dialect)
+    seconds = time.perf_counter() - start
+    return {
+        "table": "search index",
+        "rows": len(index),
+        "seconds": seconds,
+        "rows_per_sec": len(index) / seconds if seconds > 0 else float("inf"),
+        "method": "trigram index file",
+    }
+
+
+def print_report(stats):
+    print(f"{'table':<26}{'rows':>8}{'seconds':>10}{'rows/sec':>12}  method")
+    for s in stats:
+        print(f"{s['table']:<26}{s['rows']:>8}{s['seconds']:>10.3f}{s['rows_per_sec']:>12.0f}  {s['method']}")
+
+
+def connect(args):
+    if args.sqlite:
+        return sqlite3.connect(args.sqlite), "sqlite"
+    import mysql.connector
+    return mysql.connector.connect(**DB_CONFIG, allow_local_infile=args.infile), "mysql"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load Sportradar payloads into the sportanalytics database")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="folder with the saved JSON payloads")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="load into a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="load into MySQL (db_pool.DB_CONFIG)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--infile", action="store_true", help="use LOAD DATA LOCAL INFILE (MySQL only)")
+    parser.add_argument("--stream", action="store_true", help="stream the rankings and complexes files in batches")
+    parser.add_argument("--live", action="store_true", help="fetch the payloads from the API instead of --fixtures")
+    parser.add_argument("--access-level", default="trial", help="Sportradar access level for --live")
+    parser.add_argument("--info", nargs="*", default=[], metavar="ID",
+                        help="competition ids whose info.json to fetch with --live (offline: every saved one)")
+    args = parser.parse_args(argv)
+
+    names = [COMPETITIONS_FILE, COMPLEXES_FILE, RANKINGS_FILE]
+    loaders = {COMPETITIONS_FILE: load_competitions, COMPLEXES_FILE: load_complexes, RANKINGS_FILE: load_rankings}
+    if args.live:
+        payloads = fetch_payloads(args.access_level, args.info)
+        infos = {name: payloads.pop(name) for name in list(payloads) if name not in loaders}
+    elif args.stream:
+        import stream_parser
+        #File-based loaders: the payload passed to them is the file path
+        payloads = {name: os.path.join(args.fixtures, name) for name in names}
+        payloads[COMPETITIONS_FILE] = read_payload(COMPETITIONS_FILE, args.fixtures)
+        loaders[COMPLEXES_FILE] = stream_parser.load_complexes_file
+        loaders[RANKINGS_FILE] = stream_parser.load_rankings_file
+        infos = read_info_payloads(args.fixtures)
+    else:
+        payloads = {name: read_payload(name, args.fixtures) for name in names}
+        infos = read_info_payloads(args.fixtures)
+
+    conn, dialect = connect(args)
+    options = {"chunk_size": args.chunk_size, "use_infile": args.infile}
+    try:
+        migrate(conn, dialect)
+        stats = []
+        for name in names:
+            stats += loaders[name](conn, payloads[name], dialect, **options)
+        if infos:
+            stats += load_competition_infos(conn, list(infos.values()), dialect, **options)
+        record_loads(conn, stats, dialect)
+        if any(s["table"] == "competitiontable" and s["rows"] for s in stats):
+            stats += refresh_hierarchy(conn, dialect)
+        if any(s["table"] == "competitors_table" and s["rows"] for s in stats):
+            stats.append(build_search_index(conn, dialect))
+        if any(s["table"] == "competitor_ranking_table" and s["rows"] for s in stats):
+            from notifications import evaluate
+            stats += evaluate(conn, dialect)[0]  #Watch-list / threshold rules against the new week
+        import arrow_snapshot
+        if arrow_snapshot.needs_publish(stats):
+            stats.append(arrow_snapshot.publish(conn, dialect))  #Mapped by TENNIS_BACKEND=arrow dashboards
+    finally:
+        conn.close()
+
+    #New data committed: tell every dashboard process to drop its cached ranking / competition results
+    #(a competitor rename or country fix alone changes the name- and country-based page queries too)
+    tags = []
+    if any(s["table"] in ("competitor_ranking_table", "competitors_table") and s["rows"] for s in stats):
+        tags.append("rankings")
+    if any(s["table"] == "competition_closure" for s in stats):
+        tags.append("competitions")
+    if tags:
+        from query_cache import notify_invalidation
+        notify_invalidation(tags)
+    print_report(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+# Query and render instrumentation for the dashboard
+# Every page render is timed and broken down into spans, innermost last:
+#   backend   - one DataBackend call (dashboard.resources wraps the backend), rows returned
+#   read      - query_cache.cached_read: cache hit or miss, bytes of the cached DataFrame
+#   query     - db_pool.fetch_all: the statement on the database, rows fetched
+#   frame     - DataFrame construction + clean-up step of a cache miss
+#   figure    - FigureCache: figure build (or cache hit), bytes of its JSON
+# Statements slower than SLOW_QUERY_MS are kept (last SLOW_QUERY_KEEP) with their EXPLAIN plan.
+# Page and query latencies go into Prometheus-style histograms, exposed three ways:
+#   - the hidden Diagnostics page (open the dashboard with ?diagnostics=1)
+#   - an HTTP endpoint serving /metrics (Prometheus text) and /metrics.json, when TENNIS_METRICS_PORT is set;
+#     it listens on localhost unless TENNIS_METRICS_HOST names another interface
+#   - one JSON line per page render appended to TENNIS_METRICS_LOG, when set
+# Only the standard library is used, so db_pool / query_cache can import this without loading anything heavy
+#
+# Usage:
+#   python instrumentation.py --log data/metrics.jsonl          (p50 / p95 / max render time per page from a log)
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import hashlib                   #Label for statements that are not in queries.py
+import json                      #JSON log lines and /metrics.json
+import os                        #Settings from the environment
+import re                        #Normalizing IN (...) lists before the query-name lookup
+import threading                 #Per-thread render context, lock around the metrics
+import time                      #Timings
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SLOW_QUERY_MS = float(os.environ.get("TENNIS_SLOW_QUERY_MS", 250))   #Statements at least this slow get an EXPLAIN
+SLOW_QUERY_KEEP = 50                                                  #Slow statements kept for the Diagnostics page
+METRICS_LOG = os.environ.get("TENNIS_METRICS_LOG")                    #JSON-lines file, one line per page render
+METRICS_PORT = os.environ.get("TENNIS_METRICS_PORT")                  #Port of the /metrics endpoint
+METRICS_HOST = os.environ.get("TENNIS_METRICS_HOST", "127.0.0.1")     #Interface it binds; 0.0.0.0 exposes it
+RECENT = 1000                                                         #Samples kept per histogram for p50 / p95
+
+PAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)            #Seconds
+QUERY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+
+_IN_LIST = re.compile(r"IN \((?:%s|\?)(?:, (?:%s|\?))*\)")
+_query_names = None
+
+
+#Statement -> name of its constant in queries.py (e.g. "LATEST_RANKINGS_PAGE"), else "sql_<hash>"
+def query_name(sql):
+    global _query_names
+    from query_cache import normalize_sql
+    if _query_names is None:
+        import queries
+        _query_names = {_IN_LIST.sub("IN ({placeholders})", normalize_sql(value)): name
+                        for name, value in vars(queries).items() if name.isupper() and isinstance(value, str)}
+    text = _IN_LIST.sub("IN ({placeholders})", normalize_sql(sql))
+    name = _query_names.get(text)
+    if name is None:
+        name = "sql_" + hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+    return name
+
+
+#Query plan of one statement, as text lines (EXPLAIN on MySQL, EXPLAIN QUERY PLAN on SQLite)
+def explain_plan(conn, dialect, sql, params=None):
+    from db_pool import adapt_sql
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    cursor = conn.cursor()
+    try:
+        cursor.execute(prefix + adapt_sql(sql, dialect), params or ())
+        columns = [d[0] for d in cursor.description]
+        return [", ".join(f"{c}={v}" for c, v in zip(columns, row) if v is not None) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class Histogram:
+    #Cumulative Prometheus-style buckets plus the most recent samples for percentiles
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=RECENT)
+
+    def observe(self, seconds):
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+
+    def summary(self):
+        recent = list(self.recent)
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.sum, 6),
+            "p50_ms": round(percentile(recent, 0.5) * 1000, 3),
+            "p95_ms": round(percentile(recent, 0.95) * 1000, 3),
+            "max_ms": round(max(recent) * 1000, 3) if recent else 0.0,
+        }
+
+
+class Recorder:
+    #Collects spans of the render running on the current thread and the process-wide metrics
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS, log_path=METRICS_LOG):
+        self.slow_query_ms = slow_query_ms
+        self.log_path = log_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.pages = {}          #page -> Histogram of render seconds
+            self.queries = {}        #query name -> Histogram of execution seconds
+            self.query_rows = {}     #query name -> rows fetched
+            self.render_bytes = {}   #page -> bytes of DataFrames / figures built
+            self.slow = deque(maxlen=SLOW_QUERY_KEEP)
+            self.last_renders = {}   #page -> spans of its latest render
+
+    #The render in progress on this thread, or None (export workers, background refreshes)
+    def _render(self):
+        return getattr(self._local, "render", None)
+
+    @contextmanager
+    def page_render(self, page):
+        render = {"page": page, "started_at": time.time(), "spans": [], "stack": []}
+        self._local.render = render
+        start = time.perf_counter()
+        try:
+            yield render
+        finally:
+            seconds = time.perf_counter() - start
+            self._local.render = None
+            self._finish(render, seconds)
+
+    #Times a step of the current render; the yielded dict takes "rows", "bytes" and "hit"
+    @contextmanager
+    def span(self, kind, name):
+        render = self._render()
+        entry = {"kind": kind, "name": name}
+        if render is None:
+            yield entry
+            return
+        entry["depth"] = len(render["stack"])
+        render["spans"].append(entry)
+        render["stack"].append(entry)
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["ms"] = round((time.perf_counter() - start) * 1000, 3)
+            render["stack"].pop()
+
+    #Adds bytes to the innermost open span (e.g. the cache reporting the size of what it stored)
+    def add_bytes(self, nbytes):
+        render = self._render()
+        if render is not None and render["stack"]:
+            span = render["stack"][-1]
+            span["bytes"] = span.get("bytes", 0) + int(nbytes)
+
+    #Called by db_pool.fetch_all after each statement; explain() is only called for slow statements
+    def record_query(self, sql, params, seconds, rows, explain=None):
+        name = query_name(sql)
+        ms = seconds * 1000
+        render = self._render()
+        if render is not None:
+            render["spans"].append({"kind": "query", "name": name, "ms": round(ms, 3), "rows": rows,
+                                    "depth": len(render["stack"])})
+        plan = None
+        if ms >= self.slow_query_ms and explain is not None:
+            try:
+                plan = explain()
+            except Exception as e:
+                plan = [f"EXPLAIN failed: {e}"]
+        with self._lock:
+            self.queries.setdefault(name, Histogram(QUERY_BUCKETS)).observe(seconds)
+            self.query_rows[name] = self.query_rows.get(name, 0) + rows
+            if plan is not None:
+                self.slow.append({"at": time.time(), "page": render["page"] if render else None, "query": name,
+                                  "ms": round(ms, 3), "rows": rows, "sql": sql.strip(),
+                                  "params": [str(p) for p in params or ()], "plan": plan})
+
+    def _finish(self, render, seconds):
+        spans = render["spans"]
+        totals = {}
+        for span in spans:
+            totals[span["kind"]] = totals.get(span["kind"], 0.0) + span.get("ms", 0.0) * (span.get("depth", 0) == 0)
+        nbytes = sum(span.get("bytes", 0) for span in spans)
+        record = {
+            "ts": round(render["started_at"], 3),
+            "page": render["page"],
+            "ms": round(seconds * 1000, 3),
+            "queries": sum(span["kind"] == "query" for span in spans),
+            "rows": sum(span.get("rows", 0) for span in spans if span["kind"] == "query"),
+            "bytes": nbytes,
+            "top_level_ms": {kind: round(ms, 3) for kind, ms in totals.items()},
+        }
+        with self._lock:
+            self.pages.setdefault(render["page"], Histogram(PAGE_BUCKETS)).observe(seconds)
+            self.render_bytes[render["page"]] = self.render_bytes.get(render["page"], 0) + nbytes
+            self.last_renders[render["page"]] = dict(record, spans=spans)
+        if self.log_path:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError:
+                pass
+
+    #Everything the Diagnostics page and /metrics.json show
+    def snapshot(self):
+        with self._lock:
+            return {
+                "pages": {page: h.summary() for page, h in self.pages.items()},
+                "queries": {name: dict(h.summary(), rows=self.query_rows.get(name, 0))
+                            for name, h in self.queries.items()},
+                "slow_queries": list(self.slow),
+                "last_renders": dict(self.last_renders),
+                "slow_query_ms": self.slow_query_ms,
+            }
+
+    #Prometheus text exposition format
+    def prometheus_text(self):
+        lines = []
+
+        def histogram(metric, help_text, label, histograms):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for value, h in sorted(histograms.items()):
+                value = value.replace("\\", "\\\\").replace('"', '\\"')
+                for bound, count in zip(h.buckets, h.counts):
+                    lines.append(f'{metric}_bucket{{{label}="{value}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{{label}="{value}",le="+Inf"}} {h.count}')
+                lines.append(f'{metric}_sum{{{label}="{value}"}} {h.sum:.6f}')
+                lines.append(f'{metric}_count{{{label}="{value}"}} {h.count}')
+
+        with self._lock:
+            histogram("tennis_page_render_seconds", "Dashboard page render time", "page", self.pages)
+            histogram("tennis_query_seconds", "Database statement time", "query", self.queries)
+            lines.append("# HELP tennis_query_rows_total Rows fetched per statement")
+            lines.append("# TYPE tennis_query_rows_total counter")
+            for name, rows in sorted(self.query_rows.items()):
+                lines.append(f'tennis_query_rows_total{{query="{name}"}} {rows}')
+            lines.append("# HELP tennis_render_bytes_total Bytes of DataFrames and figures built per page")
+            lines.append("# TYPE tennis_render_bytes_total counter")
+            for page, nbytes in sorted(self.render_bytes.items()):
+                lines.append(f'tennis_render_bytes_total{{page="{page}"}} {nbytes}')
+            lines.append("# HELP tennis_slow_queries Slow statements currently kept with their plan")
+            lines.append("# TYPE tennis_slow_queries gauge")
+            lines.append(f"tennis_slow_queries {len(self.slow)}")
+        return "\n".join(lines) + "\n"
+
+
+recorder = Recorder()
+page_render = recorder.page_render
+span = recorder.span
+
+
+#Backend proxy: every method call becomes a "backend" span with the number of rows returned
+class InstrumentedBackend:
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __getattr__(self, name):
+        value = getattr(self._backend, name)
+        if not callable(value) or name.startswith("_") or name in ("stats", "close"):
+            return value
+
+        def call(*args, **kwargs):
+            with span("backend", name) as entry:
+                result = value(*args, **kwargs)
+                if hasattr(result, "__len__"):
+                    entry["rows"] = len(result)
+                return result
+        return call
+
+
+#Serves /metrics (Prometheus text) and /metrics.json on a background thread; returns the server
+def start_metrics_server(port, host=METRICS_HOST, target=recorder):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics.json"):
+                body, content_type = json.dumps(target.snapshot(), default=str).encode(), "application/json"
+            elif self.path.startswith("/metrics"):
+                body, content_type = target.prometheus_text().encode(), "text/plain; version=0.0.4"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  #Keep scrapes out of the Streamlit log
+            pass
+
+    server = ThreadingHTTPServer((host, int(port)), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    return server
+
+
+#p50 / p95 / max render time per page from a TENNIS_METRICS_LOG file
+def summarize_log(path):
+    per_page = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            per_page.setdefault(record["page"], []).append(record["ms"])
+    return {page: {"renders": len(ms), "p50_ms": percentile(ms, 0.5), "p95_ms": percentile(ms, 0.95),
+                   "max_ms": max(ms)} for page, ms in sorted(per_page.items())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize the dashboard's JSON metrics log")
+    parser.add_argument("--log", default=METRICS_LOG, required=METRICS_LOG is None, help="TENNIS_METRICS_LOG file")
+    args = parser.parse_args(argv)
+    print(f"{'page':<24}{'renders':>9}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for page, s in summarize_log(args.log).items():
+        print(f"{page:<24}{s['renders']:>9}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['max_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+# In-memory columnar store for the dashboard
+# The whole data set (a few thousand competitors x weeks) fits in RAM, so instead of a database round trip
+# per interaction the tables are loaded once into pandas with categorical columns, the latest-ranking join
+# is done once, and group indexes (country -> rows, competitor -> ranking history) are precomputed.
+# Page questions are then answered with vectorized filters and positional lookups.
+#
+# A MemoryStore is never modified after it is built; MemoryBackend swaps in a new one (a single reference
+# assignment) when a background check sees a new ETL run in etl_watermark
+#
+# Usage:
+#   TENNIS_BACKEND=memory streamlit run tennis_analytics.py
+
+# Importing Required Libraries
+import threading                 #Background refresh
+import time                      #Refresh interval and build timing
+
+import numpy as np
+import pandas as pd
+
+from backend import (COMPARISON_COLUMNS, COUNTRY_COLUMNS, COUNTRY_STATS_COLUMNS, DIRECTORY_COLUMNS, RANKING_COLUMNS,
+                     RANKING_COUNTRY_COLUMNS, RANKING_PAGE_SIZE, SEARCH_COLUMNS, SERIES_COLUMNS, TOP_MOVERS_COLUMNS,
+                     TREE_COLUMNS, DataBackend)
+from directory import CompetitorDirectory
+from db_pool import fetch_all
+from hierarchy import CompetitionTree, closure_rows
+from schema import COLUMNS
+from search_index import SEARCH_LIMIT, SearchIndex
+from timeseries import RankSeries
+
+REFRESH_INTERVAL = 60            #Seconds between checks for a new ETL run
+TOP_MOVERS_LIMIT = 50
+
+#Tables loaded into the store and the columns stored as categoricals (repeated labels)
+CATEGORICAL = {
+    "competitors_table": ["name", "country", "country_code", "abbreviation"],
+    "competitor_ranking_table": ["competitor_id"],
+    "categorytable": ["category_name"],
+    "competitiontable": ["type", "gender", "category_id"],
+    "complex": [],
+    "venue": ["city_name", "country_name", "country_code", "timezone", "complex_id"],
+    "country_rankings": [],
+}
+
+#Version of the loaded data: the last ETL run id (changes whenever the rankings sync runs)
+VERSION_SQL = "SELECT MAX(run_id) FROM etl_watermark"
+
+
+#Rows of one table (schema.COLUMNS order) -> DataFrame with the CATEGORICAL columns as categoricals
+def table_frame(rows, table):
+    df = pd.DataFrame(rows, columns=COLUMNS[table])
+    for column in CATEGORICAL[table]:
+        df[column] = df[column].astype("category")
+    return df
+
+
+def load_table(pool, table):
+    return table_frame(fetch_all(pool, f"SELECT {', '.join(COLUMNS[table])} FROM {table}"), table)
+
+
+#Ranking history in the order the store keeps it: by competitor, then week
+def sort_rankings(rankings):
+    return rankings.sort_values(["competitor_id", "year", "week"], kind="stable", ignore_index=True)
+
+
+#competitor_id -> (first row, row after the last) of each competitor's block in rankings sorted by sort_rankings
+def history_ranges(rankings):
+    codes = rankings["competitor_id"].cat.codes.to_numpy()
+    starts = np.flatnonzero(np.diff(codes, prepend=-2))
+    stops = np.append(starts[1:], len(codes))
+    categories = rankings["competitor_id"].cat.categories
+    return {categories[codes[start]]: (int(start), int(stop)) for start, stop in zip(starts, stops) if codes[start] >= 0}
+
+
+#Categorical columns back to plain objects, so charts and tables only see the values actually present
+def _plain(df):
+    df = df.copy()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+    return df
+
+
+#Competitions with their category, depth and descendant count (the same frame as queries.COMPETITION_TREE),
+#worked out from the parent links with the closure rows the ETL stores in competition_closure
+def tree_frame(competitions, categories):
+    competitions = _plain(competitions)
+    closure = pd.DataFrame(closure_rows(zip(competitions["competition_id"], competitions["parent_id"])),
+                           columns=["ancestor_id", "descendant_id", "depth"])
+    depth = closure.groupby("descendant_id")["depth"].max()
+    descendants = closure.groupby("ancestor_id").size() - 1
+    frame = competitions.merge(_plain(categories), how="left", on="category_id")
+    frame = frame.assign(depth=frame["competition_id"].map(depth), descendants=frame["competition_id"].map(descendants))
+    frame = frame.sort_values(["competition_name", "competition_id"], kind="stable", ignore_index=True)
+    return frame[["competition_id", "competition_name", "parent_id", "category_name", "type", "gender",
+                  "depth", "descendants"]].set_axis(TREE_COLUMNS, axis=1)
+
+
+class MemoryStore:
+    #presorted: the rankings table is already in sort_rankings order (a mapped snapshot), so it is used as is
+    def __init__(self, tables, version=None, presorted=False):
+        start = time.perf_counter()
+        self.tables = tables
+        self.version = version
+        competitors = tables["competitors_table"]
+        rankings = tables["competitor_ranking_table"]
+
+        #Ranking history ordered by competitor and week; competitor_id -> (start, stop) rows (trend lookups)
+        rankings = rankings if presorted else sort_rankings(rankings)
+        self.rankings = rankings
+        self.history_index = history_ranges(rankings)
+
+        #Each competitor joined with their latest ranking (competitors_table.(year, week) is that week)
+        latest = competitors.merge(rankings, how="left", on=["competitor_id", "year", "week"], indicator=True)
+        self.has_ranking = (latest.pop("_merge") == "both").to_numpy()
+        self.latest = latest
+
+        #Ranked competitors by country (row positions in self.latest), already in rank order
+        ranked = latest[self.has_ranking].sort_values("ranks", kind="stable")
+        self.country_index = {country: ranked.index.to_numpy()[positions]
+                              for country, positions in ranked.groupby("country", observed=True).indices.items()}
+        self.countries = sorted(competitors["country"].dropna().unique())
+        self.id_index = pd.Index(latest["competitor_id"].astype(object))   #competitor_id -> row in self.latest
+        self.directory = CompetitorDirectory(_plain(latest[["competitor_id", "name", "country", "abbreviation"]])
+                                             .set_axis(DIRECTORY_COLUMNS, axis=1))
+        self.search_index = SearchIndex(latest["competitor_id"], latest["name"].astype(object),
+                                        latest["abbreviation"].astype(object), version)  #Documents = rows of latest
+
+        #Every ranking week, newest first; the latest one in rank order, and its top movers
+        weeks = rankings[["year", "week"]].drop_duplicates().sort_values(["year", "week"], ascending=False)
+        self.weeks = [(int(year), int(week)) for year, week in zip(weeks["year"], weeks["week"])]
+        week_rows = self._week_rows(*self.weeks[0]) if self.weeks else self._week_rows(None, None)
+        self.week_rankings = _plain(week_rows[["ranks", "movement", "points", "name", "country", "week"]]
+                                    .set_axis(RANKING_COLUMNS, axis=1).reset_index(drop=True))
+        movers = week_rows[week_rows["movement"].notna() & (week_rows["movement"] != 0)]
+        movers = movers.assign(abs_movement=movers["movement"].abs()).sort_values(
+            ["abs_movement", "ranks", "competitor_id"], ascending=[False, True, True], kind="stable")
+        self.week_movers = _plain(movers[["ranks", "movement", "points", "name", "country", "week"]]
+                                  .head(TOP_MOVERS_LIMIT).set_axis(TOP_MOVERS_COLUMNS, axis=1)
+                                  .reset_index(drop=True))
+        by_country = self.week_rankings.groupby("Country", dropna=False).agg(
+            Competitors=("Rank", "size"), Points=("Points", "sum"), best_rank=("Rank", "min")).reset_index()
+        self.week_by_country = by_country.sort_values(["Points", "Country"], ascending=[False, True],
+                                                      ignore_index=True).set_axis(RANKING_COUNTRY_COLUMNS, axis=1)
+
+        #Country aggregates are precomputed by the ETL (snapshots.country_rankings); served as loaded
+        stats = tables["country_rankings"].sort_values("country_code", ignore_index=True)
+        self.country_stats = stats[["country_code", "country", "competitors", "best_rank", "median_points",
+                                    "total_points", "top10", "top100", "competitors_change", "best_rank_change",
+                                    "median_points_change", "total_points_change", "year", "week"]].set_axis(
+                                        COUNTRY_STATS_COLUMNS, axis=1)
+
+        self.competition_tree = CompetitionTree(tree_frame(tables["competitiontable"], tables["categorytable"]))
+
+        self.loaded_at = time.time()
+        self.build_seconds = time.perf_counter() - start
+
+    @classmethod
+    def load(cls, pool):
+        version = fetch_all(pool, VERSION_SQL)[0][0]
+        return cls({table: load_table(pool, table) for table in CATEGORICAL}, version)
+
+    #Ranking rows of one week with the competitor's name and country, in rank order
+    def _week_rows(self, year, week):
+        rankings = self.rankings
+        rows = rankings[(rankings["year"] == year) & (rankings["week"] == week)]
+        rows = rows.merge(self.tables["competitors_table"][["competitor_id", "name", "country"]], on="competitor_id")
+        return rows.sort_values(["ranks", "competitor_id"], kind="stable")
+
+    def rankings_of_week(self, year, week):
+        rows = self._week_rows(year, week)
+        return _plain(rows[["ranks", "movement", "points", "name", "country", "week"]].set_axis(RANKING_COLUMNS, axis=1)
+                      .set_axis(pd.RangeIndex(1, len(rows) + 1, name="Position")))
+
+    def search(self, text):
+        rows = self.latest.iloc[self.search_index.search_docs(text, SEARCH_LIMIT)]
+        return _plain(rows[["competitor_id", "name", "country", "country_code", "abbreviation",
+                            "ranks", "points", "movement", "competitions_played"]]
+                      .set_axis(SEARCH_COLUMNS, axis=1).reset_index(drop=True))
+
+    def competitors_by_country(self, country):
+        rows = self.latest.iloc[self.country_index.get(country, [])]
+        return _plain(rows[["competitor_id", "name", "ranks", "points"]]
+                      .set_axis(COUNTRY_COLUMNS, axis=1).reset_index(drop=True))
+
+    #Rows in self.latest of the given competitor IDs (unknown IDs are skipped)
+    def _id_rows(self, ids):
+        positions = self.id_index.get_indexer(list(ids))
+        return positions[positions >= 0]
+
+    def comparison_latest(self, ids):
+        positions = self._id_rows(ids)
+        rows = self.latest.iloc[positions[self.has_ranking[positions]]]
+        rows = _plain(rows[["competitor_id", "country", "country_code", "abbreviation",
+                            "ranks", "points", "movement", "competitions_played"]])
+        rows.insert(1, "name", rows["competitor_id"].map(self.directory.label))
+        return rows.drop(columns="competitor_id").set_axis(COMPARISON_COLUMNS, axis=1).reset_index(drop=True)
+
+    #Ranking history rows of the given competitors (each competitor's rows are already contiguous in self.rankings)
+    def rank_series(self, ids):
+        ids = [i for i in ids if i in self.history_index]
+        positions = (np.concatenate([np.arange(*self.history_index[i]) for i in ids]) if ids
+                     else np.array([], dtype=int))
+        history = self.rankings.iloc[positions]
+        competitor_ids = history["competitor_id"].astype(object)
+        return RankSeries(pd.DataFrame({
+            "Competitor ID": competitor_ids.to_numpy(),
+            "Competitor": competitor_ids.map(self.directory.label).to_numpy(),
+            "Year": history["year"].to_numpy(),
+            "Week": history["week"].to_numpy(),
+            "Rank": history["ranks"].to_numpy(),
+            "Points": history["points"].to_numpy(),
+        }, columns=SERIES_COLUMNS))
+
+    def memory_bytes(self):
+        return sum(int(df.memory_usage(deep=True).sum()) for df in self.tables.values())
+
+
+class MemoryBackend(DataBackend):
+    name = "memory"
+
+    def __init__(self, pool, refresh_interval=REFRESH_INTERVAL, background=True):
+        self.pool = pool
+        self.refresh_interval = refresh_interval
+        self.refreshes = 0
+        self.last_error = None
+        self._store = self._load()
+        self._stop = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._refresh_loop, name="memstore-refresh", daemon=True)
+            self._thread.start()
+
+    #Version of the data the next _load() would see (the last ETL run id)
+    def _version(self):
+        return fetch_all(self.pool, VERSION_SQL)[0][0]
+
+    def _load(self):
+        return MemoryStore.load(self.pool)
+
+    #Reloads the tables if the ETL has run since the current store was built; returns True if swapped
+    def refresh(self, force=False):
+        version = self._version()
+        if not force and version == self._store.version:
+            return False
+        store = self._load()                 #Built off to the side; pages keep using the old store meanwhile
+        self._store = store                  #Atomic swap
+        self.refreshes += 1
+        return True
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:  #Keep serving the old store; try again next interval
+                self.last_error = str(e)
+
+    def search(self, text):
+        return self._store.search(text)
+
+    def latest_rankings(self):
+        return self._store.week_rankings
+
+    #Positions are 1..n in rank order, so the page after position `after` starts at row `after`
+    def latest_rankings_page(self, after=0, size=RANKING_PAGE_SIZE):
+        rows = self._store.week_rankings.iloc[int(after):int(after) + int(size)]
+        return rows.set_axis(pd.RangeIndex(int(after) + 1, int(after) + 1 + len(rows), name="Position"))
+
+    def latest_rankings_count(self):
+        return len(self._store.week_rankings)
+
+    def ranking_by_country(self):
+        return self._store.week_by_country
+
+    def top_movers(self):
+        return self._store.week_movers
+
+    def ranking_weeks(self):
+        return self._store.weeks
+
+    def week_rankings(self, year, week):
+        return self._store.rankings_of_week(year, week)
+
+    def country_list(self):
+        return self._store.countries
+
+    def competitors_by_country(self, country):
+        return self._store.competitors_by_country(country)
+
+    def country_stats(self):
+        return self._store.country_stats
+
+    def competitor_directory(self):
+        return self._store.directory
+
+    def comparison_latest(self, ids):
+        return self._store.comparison_latest(sorted(set(ids)))
+
+    def rank_series(self, ids):
+        return self._store.rank_series(set(ids))
+
+    def competition_tree(self):
+        return self._store.competition_tree
+
+    def stats(self):
+        store = self._store
+        return {
+            "backend": self.name,
+            "version": store.version,
+            "rows": {table: len(df) for table, df in store.tables.items()},
+            "bytes": store.memory_bytes(),
+            "build_ms": round(store.build_seconds * 1000, 1),
+            "loaded_at": store.loaded_at,
+            "refreshes": self.refreshes,
+            "last_error": self.last_error,
+        }
+
+    def close(self):
+        self._stop.set()
@@ -0,0 +1,286 @@
+# Schema migrations for the sportanalytics database
+# Brings a database created by the original notebooks up to the current schema.py layout
+#
+# Usage:
+#   python migrate.py --sqlite data/sportanalytics.db
+#   python migrate.py --mysql
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import sqlite3                   #Local SQLite stand-in
+from datetime import date
+
+from db_pool import DB_CONFIG
+from hierarchy import refresh_hierarchy
+from schema import COLUMNS, TABLES, create_indexes, create_tables, table_ddl
+from snapshots import refresh_snapshots
+
+
+# Helpers
+
+def table_exists(cursor, table):
+    try:
+        cursor.execute(f"SELECT * FROM {table} LIMIT 0")
+        cursor.fetchall()
+        return True
+    except Exception:
+        return False
+
+
+def column_names(cursor, table):
+    cursor.execute(f"SELECT * FROM {table} LIMIT 0")
+    cursor.fetchall()
+    return [column[0] for column in cursor.description]
+
+
+def get_version(conn):
+    cursor = conn.cursor()
+    try:
+        if not table_exists(cursor, "schema_version"):
+            return 0
+        cursor.execute("SELECT MAX(version) FROM schema_version")
+        return cursor.fetchone()[0] or 0
+    finally:
+        cursor.close()
+
+
+def set_version(conn, version, name):
+    cursor = conn.cursor()
+    cursor.execute("CREATE TABLE IF NOT EXISTS schema_version (version INT PRIMARY KEY, name VARCHAR(100))")
+    cursor.execute(f"INSERT INTO schema_version (version, name) VALUES ({int(version)}, '{name}')")
+    conn.commit()
+    cursor.close()
+
+
+#Year for ranking rows loaded before the year column existed: the --year option if given,
+#else taken from the last rankings payload (etl_watermark.generated_at), else the current year
+def default_year(conn, year=None):
+    if year is not None:
+        return int(year)
+    cursor = conn.cursor()
+    try:
+        if table_exists(cursor, "etl_watermark"):
+            cursor.execute("SELECT generated_at FROM etl_watermark WHERE generated_at IS NOT NULL "
+                           "ORDER BY run_id DESC LIMIT 1")
+            row = cursor.fetchone()
+            if row and row[0]:
+                return int(row[0][:4])
+    finally:
+        cursor.close()
+    return date.today().year
+
+
+#SQL expression that numbers the rows of a notebook-built table in insert order (larger = inserted later)
+#The notebook tables have no key and their rank_id restarted at 1 on every run, so insert order is the only way
+#to tell an older copy of a row from a newer one. SQLite: the rowid. MySQL: a LOAD_SEQ AUTO_INCREMENT column is
+#added; InnoDB numbers the rows in the order of its hidden row id, which it assigns increasing at insert time.
+#The column disappears with the old table when rebuild_table swaps in the new one
+LOAD_SEQ = "load_seq"
+
+
+def insert_order(conn, table, dialect):
+    if dialect == "sqlite":
+        return "rowid"
+    cursor = conn.cursor()
+    if table_exists(cursor, table) and LOAD_SEQ not in column_names(cursor, table):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {LOAD_SEQ} BIGINT NOT NULL AUTO_INCREMENT UNIQUE")
+    cursor.close()
+    return LOAD_SEQ
+
+
+#Rebuilds a table under its new definition: create <table>_new, copy rows with copy_sql, swap names
+#A table that does not exist yet is simply created
+def rebuild_table(conn, table, copy_sql, dialect):
+    cursor = conn.cursor()
+    if not table_exists(cursor, table):
+        cursor.close()
+        create_tables(conn, [table], dialect)
+        return
+    new_table = f"{table}_new"
+    cursor.execute(f"DROP TABLE IF EXISTS {new_table}")
+    cursor.execute(table_ddl(table, dialect, name=new_table))
+    cursor.execute(copy_sql.format(new_table=new_table))
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+    conn.commit()
+    cursor.close()
+
+
+# Migrations: (version, name, function)
+
+#1) Unique keys so the weekly sync can upsert instead of appending a snapshot every run
+#   - competitor_ranking_table gets year and week columns (week copied from competitors_table) and
+#     UNIQUE (competitor_id, year, week)
+#   - competitors_table, complex and venue get their API id as primary key
+#   Duplicates left by earlier runs are dropped while copying: rows are copied newest insert first
+#   (insert_order) and INSERT IGNORE keeps the first one, i.e. the most recently loaded copy
+#   (rows are copied straight into the current layout, so a year column is filled in as well)
+def add_unique_keys(conn, dialect, year=None):
+    ignore = "INSERT OR IGNORE" if dialect == "sqlite" else "INSERT IGNORE"
+    week_int = "CAST(week AS INTEGER)" if dialect == "sqlite" else "CAST(week AS UNSIGNED)"
+    year = default_year(conn, year)
+    cursor = conn.cursor()
+    has_week = "week" in column_names(cursor, "competitor_ranking_table")
+    cursor.close()
+
+    if not has_week:
+        order = insert_order(conn, "competitor_ranking_table", dialect)
+        rebuild_table(conn, "competitor_ranking_table", f"""
+            {ignore} INTO {{new_table}} (competitor_id, year, week, ranks, movement, points, competitions_played)
+            SELECT r.competitor_id, {year}, w.week, r.ranks, r.movement, r.points, r.competitions_played
+            FROM competitor_ranking_table r
+            JOIN (
+                SELECT competitor_id, MAX({week_int}) AS week
+                FROM competitors_table
+                GROUP BY competitor_id
+            ) w ON w.competitor_id = r.competitor_id
+            ORDER BY r.{order} DESC
+        """, dialect)
+
+    order = insert_order(conn, "competitors_table", dialect)
+    rebuild_table(conn, "competitors_table", f"""
+        {ignore} INTO {{new_table}} (competitor_id, name, country, country_code, abbreviation, year, week)
+        SELECT competitor_id, name, country, country_code, abbreviation, {year}, {week_int}
+        FROM competitors_table
+        WHERE competitor_id IS NOT NULL
+        ORDER BY {week_int} DESC, {order} DESC
+    """, dialect)
+
+    for table, columns in (("complex", COLUMNS["complex"]), ("venue", COLUMNS["venue"])):
+        order = insert_order(conn, table, dialect)
+        rebuild_table(conn, table, f"""
+            {ignore} INTO {{new_table}} ({', '.join(columns)})
+            SELECT {', '.join(columns)} FROM {table} WHERE {columns[0]} IS NOT NULL
+            ORDER BY {order} DESC
+        """, dialect)
+
+    create_tables(conn, ["etl_watermark"], dialect)
+    create_indexes(conn, dialect)
+
+
+#2) Week-partitioned ranking history
+#   - rankings keyed by (competitor_id, year, week); competitors_table.week becomes INT with a year beside it
+#   - composite indexes for the page queries (see schema.INDEXES)
+#   Databases that went through migration 1 with the current layout already have the columns and are only indexed
+def add_year_week(conn, dialect, year=None):
+    year = default_year(conn, year)
+    week_int = "CAST(week AS INTEGER)" if dialect == "sqlite" else "CAST(week AS UNSIGNED)"
+    cursor = conn.cursor()
+    ranking_columns = column_names(cursor, "competitor_ranking_table")
+    competitor_columns = column_names(cursor, "competitors_table")
+    watermark_columns = column_names(cursor, "etl_watermark")
+    cursor.close()
+
+    if "year" not in ranking_columns:
+        rebuild_table(conn, "competitor_ranking_table", f"""
+            INSERT INTO {{new_table}} (competitor_id, year, week, ranks, movement, points, competitions_played)
+            SELECT competitor_id, {year}, week, ranks, movement, points, competitions_played
+            FROM competitor_ranking_table
+        """, dialect)
+    if "year" not in competitor_columns:
+        rebuild_table(conn, "competitors_table", f"""
+            INSERT INTO {{new_table}} (competitor_id, name, country, country_code, abbreviation, year, week)
+            SELECT competitor_id, name, country, country_code, abbreviation, {year}, {week_int}
+            FROM competitors_table
+        """, dialect)
+    if "year" not in watermark_columns:
+        cursor = conn.cursor()
+        cursor.execute("ALTER TABLE etl_watermark ADD COLUMN year INT")
+        conn.commit()
+        cursor.close()
+    create_indexes(conn, dialect)
+
+
+#3) Precomputed latest_rankings / top_movers tables for the Ranking Overview and Top Movers pages
+#   (the tables themselves are created by migrate(); this fills them from the data already loaded)
+def add_ranking_snapshots(conn, dialect, year=None):
+    create_tables(conn, ["latest_rankings", "top_movers"], dialect)
+    refresh_snapshots(conn, dialect)
+
+
+#4) Competition hierarchy: competition_closure (ancestor, descendant, depth) and an index on competitiontable.parent_id
+#   (the closure table is created by migrate(); this indexes it and fills it from the competitions already loaded)
+def add_competition_hierarchy(conn, dialect, year=None):
+    create_tables(conn, ["competitiontable", "competition_closure"], dialect)
+    refresh_hierarchy(conn, dialect)
+
+
+#5) Index on competitors_table.name: the competitor directory (queries.COMPETITOR_DIRECTORY) is read in name
+#   order without a sort; the comparison queries themselves filter on competitor_id
+def add_competitor_name_index(conn, dialect, year=None):
+    create_indexes(conn, dialect, ["competitors_table"])
+
+
+#6) Per-country aggregates of the latest ranking week for the Country Map page
+#   (the table is created by migrate(); this fills it, with the other snapshots, from the rankings already loaded)
+def add_country_rankings(conn, dialect, year=None):
+    create_tables(conn, ["country_rankings"], dialect)
+    refresh_snapshots(conn, dialect)
+
+
+#7) Ranking notifications: watch-list / threshold rules and the log of notifications sent (notifications.py)
+def add_notifications(conn, dialect, year=None):
+    create_tables(conn, ["watch_rules", "notifications"], dialect)
+
+
+MIGRATIONS = [
+    (1, "unique_keys", add_unique_keys),
+    (2, "year_week_partitions", add_year_week),
+    (3, "ranking_snapshots", add_ranking_snapshots),
+    (4, "competition_hierarchy", add_competition_hierarchy),
+    (5, "competitor_name_index", add_competitor_name_index),
+    (6, "country_rankings", add_country_rankings),
+    (7, "notifications", add_notifications),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+#Applies every migration newer than the database's schema_version
+#A brand-new database gets the current schema directly
+#year: ranking year to assume for rows stored before the year column existed
+def migrate(conn, dialect="mysql", verbose=False, year=None):
+    current = get_version(conn)
+    cursor = conn.cursor()
+    fresh = current == 0 and not table_exists(cursor, "competitor_ranking_table")
+    cursor.close()
+
+    if fresh:
+        create_tables(conn, dialect=dialect)
+        set_version(conn, LATEST_VERSION, MIGRATIONS[-1][1])
+        if verbose:
+            print(f"Created schema version {LATEST_VERSION}")
+        return LATEST_VERSION
+
+    rebuilt = ("competitor_ranking_table", "competitors_table", "complex", "venue")  #Created by the migrations
+    create_tables(conn, [t for t in TABLES if t not in rebuilt], dialect)
+    for version, name, step in MIGRATIONS:
+        if version > current:
+            if verbose:
+                print(f"Applying migration {version}: {name}")
+            step(conn, dialect, year)
+            set_version(conn, version, name)
+    return max(current, LATEST_VERSION)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate the sportanalytics database to the current schema")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="migrate a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="migrate MySQL (db_pool.DB_CONFIG)")
+    parser.add_argument("--year", type=int, help="ranking year of rows stored before the year column existed")
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        conn, dialect = sqlite3.connect(args.sqlite), "sqlite"
+    else:
+        import mysql.connector
+        conn, dialect = mysql.connector.connect(**DB_CONFIG), "mysql"
+    try:
+        version = migrate(conn, dialect, verbose=True, year=args.year)
+        print(f"Database is at schema version {version}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+# Ranking change notifications
+# Instead of analysts polling the Top Movers page, every ingest that changes the rankings ends with a
+# change-detection stage:
+#   1) diff:   the latest ranking week against the previous one for every competitor in one vectorized pass
+#              (old / new rank and points; a competitor missing from a week counts as unranked)
+#   2) match:  watch-list rules (competitor_id set) are hash-joined to the diff on competitor_id and each rule
+#              type is evaluated as one array expression over the joined pairs; rules on every competitor
+#              (competitor_id NULL) are grouped by type with their thresholds sorted, and each competitor
+#              binary-searches the thresholds it crosses - no rules x competitors product
+#   3) dedupe: matches already in the notifications table for that week are dropped (a re-run never sends twice)
+#   4) fan out: grouped per (sink, target) and handed to the sinks on a thread pool; the delivered ones are logged
+#              in the notifications table
+#
+# Rule types (threshold N):
+#   entered_top     rank <= N now and > N (or unranked) the week before
+#   left_top        rank <= N the week before and > N (or unranked) now
+#   moved           rank changed by at least N places, up or down
+#   points_change   points changed by at least N
+# Sinks: "file" (JSON lines), "webhook" and "email" (stubs: the request / message is written to an outbox file);
+# register_sink() adds more
+#
+# Usage:
+#   python notifications.py --sqlite data/sportanalytics.db --add moved 20 --user ana                 (any competitor)
+#   python notifications.py --sqlite data/sportanalytics.db --add entered_top 100 --user ana --sink email --target ana@example.com
+#   python notifications.py --sqlite data/sportanalytics.db --add moved 1 --user ana --competitor sr:competitor:49363
+#   python notifications.py --sqlite data/sportanalytics.db --list [--user ana]
+#   python notifications.py --sqlite data/sportanalytics.db --run        (evaluate the latest week now)
+# ingest.py and etl.py run the evaluation after every load that changed the rankings
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import json                      #Sink payloads
+import os                        #Outbox paths
+import sqlite3                   #Local SQLite stand-in
+import threading                 #One writer per outbox file
+import time                      #Stage timings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from db_pool import DB_CONFIG, adapt_sql
+from ingest import bulk_load
+from schema import COLUMNS
+from snapshots import RANKING_WEEKS_SQL
+
+NOTIFY_DIR = os.environ.get(
+    "TENNIS_NOTIFY_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "notifications"))
+SINK_WORKERS = 4                 #(sink, target) groups delivered at the same time
+RULE_TYPES = ("entered_top", "left_top", "moved", "points_change")
+
+#One ranking week with the competitor names (params: year, week)
+WEEK_SQL = """
+    SELECT cr.competitor_id, co.name, cr.ranks, cr.points
+    FROM competitor_ranking_table cr
+    JOIN competitors_table co ON co.competitor_id = cr.competitor_id
+    WHERE cr.year = %s AND cr.week = %s
+"""
+RULES_SQL = "SELECT rule_id, user_id, competitor_id, rule_type, threshold, sink, target FROM watch_rules"
+SENT_SQL = "SELECT rule_id, competitor_id FROM notifications WHERE year = %s AND week = %s"
+RULE_COLUMNS = ["rule_id", "user_id", "competitor_id", "rule_type", "threshold", "sink", "target"]
+
+
+def _read(conn, sql, params, columns, dialect):
+    cursor = conn.cursor()
+    cursor.execute(adapt_sql(sql, dialect), params)
+    frame = pd.DataFrame(cursor.fetchall(), columns=columns)
+    cursor.close()
+    return frame
+
+
+# 1) Week-over-week diff
+
+#new, old: one ranking week each (competitor_id, name, ranks, points)
+#-> one row per competitor ranked in either week: competitor_id, name, rank, old_rank, points, old_points
+#Ranks / points of a week the competitor was not ranked in are NaN
+def week_diff(new, old):
+    diff = new.merge(old.drop(columns="name"), on="competitor_id", how="outer", suffixes=("", "_old"))
+    diff = diff.rename(columns={"ranks": "rank", "ranks_old": "old_rank", "points_old": "old_points"})
+    for column in ("rank", "old_rank", "points", "old_points"):
+        diff[column] = diff[column].astype("float64")
+    return diff[["competitor_id", "name", "rank", "old_rank", "points", "old_points"]]
+
+
+# 2) Rule matching
+
+#Boolean mask of the (rule, competitor) pairs in `pairs` whose rule fires; every rule type is one array expression
+def rule_mask(pairs):
+    threshold = pairs["threshold"].to_numpy(dtype="float64")
+    rank = np.nan_to_num(pairs["rank"].to_numpy(), nan=np.inf)           #Unranked = below every threshold
+    old_rank = np.nan_to_num(pairs["old_rank"].to_numpy(), nan=np.inf)
+    moved = np.abs(pairs["old_rank"].to_numpy() - pairs["rank"].to_numpy())               #NaN if unranked in a week
+    points = np.abs(pairs["points"].to_numpy() - pairs["old_points"].to_numpy())
+    rule_type = pairs["rule_type"].to_numpy()
+    with np.errstate(invalid="ignore"):
+        return np.select(
+            [rule_type == "entered_top", rule_type == "left_top", rule_type == "moved", rule_type == "points_change"],
+            [(rank <= threshold) & (old_rank > threshold), (old_rank <= threshold) & (rank > threshold),
+             moved >= threshold, points >= threshold],
+            default=False).astype(bool)
+
+
+#Rules of one type that watch every competitor fire for the thresholds t with lo <= t < hi (t <= hi for
+#"moved" / "points_change"), lo / hi per competitor. The thresholds are sorted once and each competitor looks
+#up its range with a binary search, so the cost follows the matches instead of rules x competitors
+#Returns (rule positions, competitor positions) of the firing pairs
+def _threshold_pairs(thresholds, lo, hi, inclusive):
+    order = np.argsort(thresholds, kind="stable")
+    ordered = thresholds[order]
+    first = np.searchsorted(ordered, lo, side="left")
+    last = np.searchsorted(ordered, hi, side="right" if inclusive else "left")
+    counts = np.where(np.isnan(lo) | np.isnan(hi), 0, np.maximum(last - first, 0))
+    competitors = np.repeat(np.arange(len(lo)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return order[np.repeat(first, counts) + offsets], competitors
+
+
+def _general_pairs(general, diff):
+    rank = np.nan_to_num(diff["rank"].to_numpy(), nan=np.inf)
+    old_rank = np.nan_to_num(diff["old_rank"].to_numpy(), nan=np.inf)
+    bounds = {  #rule_type -> (lo, hi, inclusive)
+        "entered_top": (rank, old_rank, False),
+        "left_top": (old_rank, rank, False),
+        "moved": (np.zeros(len(diff)), np.abs(diff["old_rank"].to_numpy() - diff["rank"].to_numpy()), True),
+        "points_change": (np.zeros(len(diff)), np.abs(diff["points"].to_numpy() - diff["old_points"].to_numpy()), True),
+    }
+    pairs = []
+    for rule_type, rules in general.groupby("rule_type"):
+        lo, hi, inclusive = bounds[rule_type]
+        rule_at, competitor_at = _threshold_pairs(rules["threshold"].to_numpy(dtype="float64"), lo, hi, inclusive)
+        pairs.append(pd.concat([rules.iloc[rule_at].reset_index(drop=True),
+                                diff.iloc[competitor_at].reset_index(drop=True)], axis=1))
+    return pairs
+
+
+#(rule, competitor) pairs whose rule fires: the rule columns plus the competitor's diff columns
+def match_rules(rules, diff):
+    watch = rules[rules["competitor_id"].notna()]
+    pairs = watch.merge(diff, on="competitor_id")                         #Hash join on competitor_id
+    pairs = [pairs[rule_mask(pairs)]]
+    general = rules[rules["competitor_id"].isna()].drop(columns="competitor_id")
+    if len(general):
+        pairs += _general_pairs(general, diff)
+    return pd.concat(pairs, ignore_index=True)[RULE_COLUMNS + list(diff.columns[1:])]
+
+
+#Rows of a frame as dicts; column-wise tolist() is much faster than to_dict("records") on string columns
+def _records(frame):
+    columns = list(frame.columns)
+    return [dict(zip(columns, values)) for values in zip(*(frame[c].tolist() for c in columns))]
+
+
+def _rank(value):
+    return "unranked" if value != value else f"#{int(value)}"
+
+
+def message(row):
+    name = row["name"] if isinstance(row["name"], str) else row["competitor_id"]
+    change = f"{_rank(row['old_rank'])} -> {_rank(row['rank'])}"
+    if row["rule_type"] == "entered_top":
+        return f"{name} entered the top {row['threshold']} ({change})"
+    if row["rule_type"] == "left_top":
+        return f"{name} left the top {row['threshold']} ({change})"
+    if row["rule_type"] == "points_change":
+        delta = int(row["points"] - row["old_points"])
+        return f"{name}: points {int(row['old_points'])} -> {int(row['points'])} ({delta:+d}), rank {change}"
+    return f"{name} moved {change}"
+
+
+# 3) Sinks: send(target, notifications) -> number delivered; notifications are dicts (see evaluate)
+
+class FileSink:
+    #Appends one JSON line per notification to `target` (default: <NOTIFY_DIR>/notifications.jsonl)
+    def __init__(self, folder=NOTIFY_DIR):
+        self.default_path = os.path.join(folder, "notifications.jsonl")
+        self._lock = threading.Lock()
+
+    def send(self, target, notifications):
+        path = target or self.default_path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock, open(path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(n, default=str) + "\n" for n in notifications)
+        return len(notifications)
+
+
+class WebhookSink:
+    #Stub: builds the one POST body per URL that a webhook integration would send and writes it to the outbox
+    def __init__(self, folder=NOTIFY_DIR):
+        self.outbox = os.path.join(folder, "webhook_outbox.jsonl")
+        self._lock = threading.Lock()
+
+    def send(self, target, notifications):
+        os.makedirs(os.path.dirname(self.outbox), exist_ok=True)
+        request = {"url": target, "method": "POST", "body": {"notifications": notifications}}
+        with self._lock, open(self.outbox, "a", encoding="utf-8") as f:
+            f.write(json.dumps(request, default=str) + "\n")
+        return len(notifications)
+
+
+class EmailSink:
+    #Stub: one message per address (subject + one line per notification), written to the outbox
+    def __init__(self, folder=NOTIFY_DIR):
+        self.outbox = os.path.join(folder, "email_outbox.jsonl")
+        self._lock = threading.Lock()
+
+    def send(self, target, notifications):
+        os.makedirs(os.path.dirname(self.outbox), exist_ok=True)
+        year, week = notifications[0]["year"], notifications[0]["week"]
+        mail = {"to": target, "subject": f"Ranking changes, {year} week {week} ({len(notifications)})",
+                "body": "\n".join(n["message"] for n in notifications)}
+        with self._lock, open(self.outbox, "a", encoding="utf-8") as f:
+            f.write(json.dumps(mail) + "\n")
+        return len(notifications)
+
+
+SINKS = {"file": FileSink, "webhook": WebhookSink, "email": EmailSink}
+
+
+#Adds a sink type: factory(folder) -> object with send(target, notifications)
+def register_sink(name, factory):
+    SINKS[name] = factory
+
+
+#Delivers the notifications grouped per (sink, target), the groups in parallel
+#Returns ({sink: delivered}, {(sink, target) that failed}); a failing or unknown sink does not stop the others
+def fan_out(notifications, folder=NOTIFY_DIR, workers=SINK_WORKERS):
+    groups = {}
+    for n in notifications:
+        groups.setdefault((n["sink"], n["target"]), []).append(n)
+    sinks = {name: SINKS[name](folder) for name in {sink for sink, _ in groups} if name in SINKS}
+
+    def deliver(key):
+        sink, target = key
+        if sink not in sinks:
+            raise ValueError(f"unknown sink {sink!r}")
+        return sinks[sink].send(target, groups[key])
+
+    delivered, failed = {}, set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for key, future in zip(groups, [pool.submit(deliver, key) for key in groups]):
+            try:
+                delivered[key[0]] = delivered.get(key[0], 0) + future.result()
+            except Exception as e:
+                failed.add(key)
+                print(f"notifications: {key[0]} delivery to {key[1]} failed: {e}")
+    return delivered, failed
+
+
+# 4) The stage run after each ingest
+
+#Evaluates every rule against the latest ranking week vs the previous one, sends the new notifications and logs
+#the delivered ones (a group whose sink failed is not logged, so the next run tries it again)
+#Returns an ingest-style stats list (one line: notifications sent) plus the timing of each step
+def evaluate(conn, dialect="mysql", folder=NOTIFY_DIR):
+    start = time.perf_counter()
+    timings = {}
+    cursor = conn.cursor()
+    cursor.execute(RANKING_WEEKS_SQL)
+    weeks = [tuple(row) for row in cursor.fetchall()]
+    cursor.close()
+    if len(weeks) < 2:
+        return [], timings  #Nothing to compare with yet
+    (year, week), previous = weeks
+
+    mark = time.perf_counter()
+    diff = week_diff(_read(conn, WEEK_SQL, (year, week), ["competitor_id", "name", "ranks", "points"], dialect),
+                     _read(conn, WEEK_SQL, previous, ["competitor_id", "name", "ranks", "points"], dialect))
+    timings["diff"], mark = time.perf_counter() - mark, time.perf_counter()
+    rules = _read(conn, RULES_SQL, (), RULE_COLUMNS, dialect)
+    timings["load rules"], mark = time.perf_counter() - mark, time.perf_counter()
+    matches = match_rules(rules, diff)
+    timings["match"], mark = time.perf_counter() - mark, time.perf_counter()
+
+    #Drop what was already sent for this week
+    sent = _read(conn, SENT_SQL, (year, week), ["rule_id", "competitor_id"], dialect)
+    if len(sent) and len(matches):
+        seen = matches.merge(sent, on=["rule_id", "competitor_id"], how="left", indicator=True)["_merge"] == "both"
+        matches = matches[~seen.to_numpy()].reset_index(drop=True)
+    sent_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    notifications = [{
+        "year": year, "week": week, "rule_id": int(row["rule_id"]), "competitor_id": row["competitor_id"],
+        "user_id": row["user_id"], "sink": row["sink"],
+        "target": row["target"] if isinstance(row["target"], str) else None, "rule_type": row["rule_type"],
+        "threshold": int(row["threshold"]), "rank": None if row["rank"] != row["rank"] else int(row["rank"]),
+        "old_rank": None if row["old_rank"] != row["old_rank"] else int(row["old_rank"]),
+        "message": message(row), "sent_at": sent_at,
+    } for row in _records(matches)]
+    timings["dedupe"], mark = time.perf_counter() - mark, time.perf_counter()
+    delivered, failed = fan_out(notifications, folder) if notifications else ({}, set())
+    timings["fan out"], mark = time.perf_counter() - mark, time.perf_counter()
+    notifications = [n for n in notifications if (n["sink"], n["target"]) not in failed]
+    if notifications:
+        bulk_load(conn, "notifications", [tuple(n[c] for c in COLUMNS["notifications"]) for n in notifications],
+                  dialect, mode="ignore")
+    timings["log"] = time.perf_counter() - mark
+
+    seconds = time.perf_counter() - start
+    return [{
+        "table": "notifications",
+        "rows": len(notifications),
+        "seconds": seconds,
+        "rows_per_sec": len(notifications) / seconds if seconds > 0 else float("inf"),
+        "method": f"{len(rules)} rules x {len(diff)} competitors, "
+                  + (", ".join(f"{sink} {count}" for sink, count in sorted(delivered.items())) or "nothing new")
+                  + (f", {len(failed)} deliveries failed" if failed else ""),
+    }], timings
+
+
+def add_rule(conn, user_id, rule_type, threshold, competitor_id=None, sink="file", target=None, dialect="mysql"):
+    if rule_type not in RULE_TYPES:
+        raise ValueError(f"rule type must be one of {', '.join(RULE_TYPES)}")
+    if sink not in SINKS:
+        raise ValueError(f"sink must be one of {', '.join(SINKS)}")
+    created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    bulk_load(conn, "watch_rules", [(user_id, competitor_id, rule_type, int(threshold), sink, target, created_at)],
+              dialect)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ranking change notifications: manage rules, evaluate the latest week")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="use a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="use MySQL (db_pool.DB_CONFIG)")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--add", nargs=2, metavar=("TYPE", "THRESHOLD"), help=f"add a rule ({', '.join(RULE_TYPES)})")
+    action.add_argument("--list", action="store_true", help="list the rules")
+    action.add_argument("--run", action="store_true", help="evaluate the latest ranking week now")
+    parser.add_argument("--user", help="rule owner (--add) or filter (--list)")
+    parser.add_argument("--competitor", help="watch one competitor_id (default: every competitor)")
+    parser.add_argument("--sink", default="file", help=f"where to send ({', '.join(SINKS)})")
+    parser.add_argument("--target", help="file path, webhook URL or e-mail address for the sink")
+    args = parser.parse_args(argv)
+    if args.add and not args.user:
+        parser.error("--add needs --user")
+
+    if args.sqlite:
+        conn, dialect = sqlite3.connect(args.sqlite), "sqlite"
+    else:
+        import mysql.connector
+        conn, dialect = mysql.connector.connect(**DB_CONFIG), "mysql"
+    try:
+        from migrate import migrate
+        migrate(conn, dialect)
+        if args.add:
+            add_rule(conn, args.user, args.add[0], int(args.add[1]), args.competitor, args.sink, args.target, dialect)
+            print("Rule added")
+        elif args.list:
+            rules = _read(conn, RULES_SQL + (" WHERE user_id = %s" if args.user else ""),
+                          (args.user,) if args.user else (), RULE_COLUMNS, dialect)
+            print(rules.to_string(index=False) if len(rules) else "No rules")
+        else:
+            stats, timings = evaluate(conn, dialect)
+            for s in stats:
+                print(f"{s['rows']} notifications ({s['method']}) in {s['seconds'] * 1000:.1f} ms")
+            print(", ".join(f"{step} {seconds * 1000:.1f} ms" for step, seconds in timings.items())
+                  or "Fewer than two ranking weeks stored: nothing to compare")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# SQL used by the dashboard pages
+# Written against the schema.py layout so each query is served by an index:
+#   uq_ranking_competitor_week  (competitor_id, year, week)  - one competitor's ranking in a given week / over time
+#   idx_ranking_week_rank       (year, week, ranks)          - one ranking week, already in rank order
+#   idx_competitor_country_week (country, year, week)        - competitors of one country
+#   competition_closure         (ancestor_id, descendant_id) - everything below one competition
+# competitors_table.(year, week) is each competitor's latest ranking week, so "latest ranking" is a key join
+# No "#" comments inside the SQL so the same text runs on the SQLite stand-in
+# Queries with an IN ({placeholders}) list are filled with in_list() and take one parameter per value
+
+
+#sql with its {placeholders} replaced by one %s per value
+def in_list(sql, count):
+    return sql.format(placeholders=", ".join(["%s"] * count))
+
+
+#Latest ranking week in the database (reads the end of idx_ranking_week_rank)
+CURRENT_WEEK = """
+    SELECT year, week
+    FROM competitor_ranking_table
+    ORDER BY year DESC, week DESC
+    LIMIT 1
+"""
+
+#Ranking Overview week picker: every ranking week stored, newest first (index-only scan of idx_ranking_week_rank)
+RANKING_WEEKS = """
+    SELECT DISTINCT year, week
+    FROM competitor_ranking_table
+    ORDER BY year DESC, week DESC
+"""
+
+#Search page: the competitors found by the search index (search_index.py), with their latest ranking
+#{placeholders} is filled with one %s per competitor ID; the IDs themselves are passed as parameters
+SEARCH_BY_IDS = """
+    SELECT co.competitor_id, co.name, co.country,
+           co.country_code, co.abbreviation,
+           r.ranks, r.points, r.movement, r.competitions_played
+    FROM competitors_table co
+    LEFT JOIN competitor_ranking_table r
+        ON r.competitor_id = co.competitor_id AND r.year = co.year AND r.week = co.week
+    WHERE co.competitor_id IN ({placeholders})
+"""
+
+#Ranking Overview: one ranking week in rank order (params: year, week)
+#The page reads the latest week from the precomputed LATEST_RANKINGS_SNAPSHOT and past weeks from this query
+RANKING_OVERVIEW = """
+    SELECT cr.ranks, cr.movement, cr.points, co.name AS competitor_name, co.country, cr.week
+    FROM competitor_ranking_table cr
+    JOIN competitors_table co ON co.competitor_id = cr.competitor_id
+    WHERE cr.year = %s AND cr.week = %s
+    ORDER BY cr.ranks ASC, cr.competitor_id
+"""
+
+#Rows of one ranking week (params: year, week), for the export progress bar
+WEEK_RANKINGS_COUNT = """
+    SELECT COUNT(*)
+    FROM competitor_ranking_table
+    WHERE year = %s AND week = %s
+"""
+
+#Top Movers: largest absolute movement in one ranking week (params: year, week)
+#The page reads the precomputed TOP_MOVERS_SNAPSHOT; this live version is kept for the benchmarks
+TOP_MOVERS = """
+    SELECT cr.ranks, cr.movement, cr.points, co.name AS competitor_name, co.country, cr.week
+    FROM competitor_ranking_table cr
+    JOIN competitors_table co ON co.competitor_id = cr.competitor_id
+    WHERE cr.year = %s AND cr.week = %s AND cr.movement IS NOT NULL AND cr.movement <> 0
+    ORDER BY ABS(cr.movement) DESC
+    LIMIT 50
+"""
+
+#Ranking Overview: latest week from the snapshot table (snapshots.py), read in primary-key order
+LATEST_RANKINGS_SNAPSHOT = """
+    SELECT ranks, movement, points, competitor_name, country, week
+    FROM latest_rankings
+    ORDER BY position
+"""
+
+#Ranking Overview, one page: the `size` rows after a position, in rank order (params: after_position, size)
+#Keyset pagination on the latest_rankings primary key: every page is an index seek, however deep it is
+LATEST_RANKINGS_PAGE = """
+    SELECT position, ranks, movement, points, competitor_name, country, week
+    FROM latest_rankings
+    WHERE position > %s
+    ORDER BY position
+    LIMIT %s
+"""
+
+#Ranking Overview: number of rows in the latest week (for the page count)
+LATEST_RANKINGS_COUNT = """
+    SELECT COUNT(*)
+    FROM latest_rankings
+"""
+
+#Ranking Overview chart: the latest week aggregated per country instead of one bar per competitor
+RANKING_BY_COUNTRY = """
+    SELECT country, COUNT(*) AS competitors, SUM(points) AS points, MIN(ranks) AS best_rank
+    FROM latest_rankings
+    GROUP BY country
+    ORDER BY points DESC, country
+"""
+
+#Country Map / Country-wise Filter: per-country aggregates of the latest week (snapshots.country_rankings),
+#one primary-key scan of a table with one row per country
+COUNTRY_RANKINGS = """
+    SELECT country_code, country, competitors, best_rank, median_points, total_points, top10, top100,
+           competitors_change, best_rank_change, median_points_change, total_points_change, year, week
+    FROM country_rankings
+    ORDER BY country_code
+"""
+
+#Top Movers: up to 50 biggest movers of the latest week from the snapshot table
+TOP_MOVERS_SNAPSHOT = """
+    SELECT ranks, movement, points, competitor_name, country, week
+    FROM top_movers
+    ORDER BY position
+"""
+
+#Country-wise Filter: dropdown values (index-only scan of idx_competitor_country_week)
+COUNTRY_LIST = """
+    SELECT DISTINCT country
+    FROM competitors_table
+    WHERE country IS NOT NULL
+    ORDER BY country
+"""
+
+#Country-wise Filter: competitors of one country with their latest rank and points (params: country)
+COMPETITORS_BY_COUNTRY = """
+    SELECT co.competitor_id, co.name, cr.ranks AS rank, cr.points AS points
+    FROM competitors_table co
+    JOIN competitor_ranking_table cr
+        ON cr.competitor_id = co.competitor_id AND cr.year = co.year AND cr.week = co.week
+    WHERE co.country = %s
+    ORDER BY cr.ranks ASC
+"""
+
+#Competitor Comparison: every competitor with the fields of its selectbox label (directory.CompetitorDirectory),
+#read in name order along idx_competitor_name
+COMPETITOR_DIRECTORY = """
+    SELECT competitor_id, name, country, abbreviation
+    FROM competitors_table
+    ORDER BY name ASC
+"""
+
+#Competitor Comparison: latest ranking of the selected competitors ({placeholders}: one %s per competitor ID)
+COMPARISON_LATEST = """
+    SELECT co.competitor_id, co.name AS Competitor, co.country, co.country_code, co.abbreviation,
+           cr.ranks, cr.points, cr.movement, cr.competitions_played
+    FROM competitors_table co
+    JOIN competitor_ranking_table cr
+        ON cr.competitor_id = co.competitor_id AND cr.year = co.year AND cr.week = co.week
+    WHERE co.competitor_id IN ({placeholders})
+"""
+
+#Competitor Comparison: weekly rank and points of every selected competitor in one statement
+#({placeholders}: one %s per competitor ID), one row per competitor per week, in competitor then week order so
+#each series is one contiguous run of rows (timeseries.RankSeries), read along uq_ranking_competitor_week
+RANK_SERIES = """
+    SELECT co.competitor_id, co.name, cr.year, cr.week, cr.ranks, cr.points
+    FROM competitors_table co
+    JOIN competitor_ranking_table cr ON cr.competitor_id = co.competitor_id
+    WHERE cr.competitor_id IN ({placeholders})
+    ORDER BY cr.competitor_id, cr.year, cr.week
+"""
+
+#Competition Hierarchy: every competition with its category, depth and number of descendants (read once, then
+#drilled down in memory by hierarchy.CompetitionTree); depth and counts come from competition_closure
+COMPETITION_TREE = """
+    SELECT c.competition_id, c.competition_name, c.parent_id, cat.category_name, c.type, c.gender,
+           d.depth, s.descendants
+    FROM competitiontable c
+    LEFT JOIN categorytable cat ON cat.category_id = c.category_id
+    LEFT JOIN (
+        SELECT descendant_id, MAX(depth) AS depth
+        FROM competition_closure
+        GROUP BY descendant_id
+    ) d ON d.descendant_id = c.competition_id
+    LEFT JOIN (
+        SELECT ancestor_id, COUNT(*) - 1 AS descendants
+        FROM competition_closure
+        GROUP BY ancestor_id
+    ) s ON s.ancestor_id = c.competition_id
+    ORDER BY c.competition_name, c.competition_id
+"""
+
+#All competitions below one competition, nearest first (params: competition_id; primary-key range of the closure)
+COMPETITION_DESCENDANTS = """
+    SELECT c.competition_id, c.competition_name, c.parent_id, c.type, c.gender, cc.depth
+    FROM competition_closure cc
+    JOIN competitiontable c ON c.competition_id = cc.descendant_id
+    WHERE cc.ancestor_id = %s AND cc.depth > 0
+    ORDER BY cc.depth, c.competition_name
+"""
+
+#Depth of one competition: 0 for a top-level competition (params: competition_id; idx_closure_descendant)
+COMPETITION_DEPTH = """
+    SELECT MAX(depth)
+    FROM competition_closure
+    WHERE descendant_id = %s
+"""
+
+#Number of competitions below one competition per category, type and gender (params: competition_id)
+COMPETITION_ROLLUP = """
+    SELECT cat.category_name, c.type, c.gender, COUNT(*) AS competitions
+    FROM competition_closure cc
+    JOIN competitiontable c ON c.competition_id = cc.descendant_id
+    LEFT JOIN categorytable cat ON cat.category_id = c.category_id
+    WHERE cc.ancestor_id = %s AND cc.depth > 0
+    GROUP BY cat.category_name, c.type, c.gender
+    ORDER BY competitions DESC, cat.category_name, c.type, c.gender
+"""
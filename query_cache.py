@@ -0,0 +1,218 @@
+# Importing Required Libraries
+import json                      #For the invalidation stamp file
+from contextlib import contextmanager
+import os                        #For cache settings and the stamp file path
+import re                        #For normalizing SQL text into cache keys
+import sys                       #For the command-line invalidation hook
+import threading                 #Lock protecting the cache (Streamlit sessions share it)
+import time                      #For TTL expiry
+from collections import OrderedDict #Keeps entries in least-recently-used order
+
+import instrumentation           #Cache hits / misses and DataFrame build time per page render
+
+import pandas as pd              #Cached values are DataFrames
+
+try:
+    import fcntl                 #Lock file around the stamp update (POSIX)
+except ImportError:              #Windows: updates are not serialized across processes
+    fcntl = None
+
+# Cache Settings
+CACHE_MAX_BYTES = int(os.environ.get("TENNIS_CACHE_MAX_MB", 64)) * 1024 * 1024  #Memory cap before LRU eviction
+CACHE_DEFAULT_TTL = float(os.environ.get("TENNIS_CACHE_TTL", 300))               #Seconds a result stays fresh
+#Stamp file written by the ingestion job; every dashboard process watches it to drop stale results
+STAMP_PATH = os.environ.get(
+    "TENNIS_CACHE_STAMP",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache_invalidation.json"),
+)
+
+#Quoted strings are kept as they are; comments and runs of whitespace collapse to one space
+_SQL_TOKENS = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")|((?:\s|#[^\n]*|--[^\n]*)+)""")
+
+
+def normalize_sql(sql):
+    def repl(match):
+        return match.group(1) if match.group(1) is not None else " "
+    return _SQL_TOKENS.sub(repl, sql).strip().rstrip(";").strip()
+
+
+def make_key(sql, params=None):
+    return (normalize_sql(sql), tuple(params) if params is not None else None)
+
+
+def _size_of(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, "memory_bytes"):  #Cached objects that know their size (e.g. the search index)
+        return value.memory_bytes()
+    return sys.getsizeof(value)
+
+
+def _read_stamp(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+#Exclusive lock on <stamp>.lock, so two jobs invalidating at once do not lose one of the bumps
+@contextmanager
+def _stamp_lock(path):
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+#Invalidation hook: the ingestion job calls this after it commits a new ranking week
+#Bumps a version per tag in the stamp file, so every dashboard process drops those results on its next read
+def notify_invalidation(tags=("rankings",), path=STAMP_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with _stamp_lock(path):
+        versions = _read_stamp(path)
+        for tag in tags:
+            versions[tag] = versions.get(tag, 0) + 1
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(versions, f)
+        os.replace(tmp_path, path) #Atomic swap so readers never see a half-written file
+
+
+class QueryCache:
+    #Query-result cache keyed on normalized SQL + parameters
+    #Each entry has its own TTL and tags; total DataFrame memory is capped with LRU eviction
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, default_ttl=CACHE_DEFAULT_TTL, stamp_path=STAMP_PATH):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stamp_path = stamp_path
+        self._entries = OrderedDict()   #key -> (value, expires_at, nbytes, tags)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stamp_mtime = None
+        self._stamp_versions = _read_stamp(stamp_path)
+        self._clears = 0                #Bumped by invalidate() of everything
+        self._generations = {}          #tag -> bumped by every invalidation of the tag
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0, "stale_loads": 0}
+
+    def _drop(self, key):
+        value, _, nbytes, _ = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def _check_stamp(self):
+        #One os.stat per read; the file is only parsed when the ingestion job has touched it
+        try:
+            mtime = os.stat(self.stamp_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._stamp_mtime:
+            return
+        self._stamp_mtime = mtime
+        versions = _read_stamp(self.stamp_path)
+        changed = {tag for tag, v in versions.items() if self._stamp_versions.get(tag) != v}
+        self._stamp_versions = versions
+        if changed:
+            self._invalidate_locked(changed)
+
+    def _invalidate_locked(self, tags=None):
+        if tags is None:
+            self._clears += 1
+        else:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+        stale = [k for k, (_, _, _, entry_tags) in self._entries.items()
+                 if tags is None or entry_tags & set(tags)]
+        for key in stale:
+            self._drop(key)
+        self._stats["invalidations"] += len(stale)
+
+    def get_or_load(self, sql, params, loader, ttl=None, tags=()):
+        key = make_key(sql, params)
+        now = time.monotonic()
+        with self._lock:
+            self._check_stamp()
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[0]
+                self._drop(key)
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            generation = self._generation(tags)
+
+        #Run the query outside the lock so other sessions are not blocked on the database
+        value = loader()
+        nbytes = _size_of(value)
+        instrumentation.recorder.add_bytes(nbytes)
+        if nbytes > self.max_bytes:
+            return value #Too big to cache; hand it back without storing
+
+        with self._lock:
+            #An invalidation that arrived while the loader ran may have made its result stale: hand it back unstored
+            self._check_stamp()
+            if self._generation(tags) != generation:
+                self._stats["stale_loads"] += 1
+                return value
+            if key in self._entries:
+                self._drop(key)
+            ttl = self.default_ttl if ttl is None else ttl
+            self._entries[key] = (value, now + ttl, nbytes, frozenset(tags))
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+        return value
+
+    def _generation(self, tags):
+        return self._clears, tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def invalidate(self, tags=None):
+        #tags=None clears everything; otherwise only entries carrying one of the tags
+        with self._lock:
+            self._invalidate_locked(tags)
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            s.update({"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes})
+        lookups = s["hits"] + s["misses"]
+        s["hit_rate"] = round(s["hits"] / lookups, 3) if lookups else 0.0
+        return s
+
+
+#Runs a query through the cache and returns it as a DataFrame
+#prepare: optional clean-up step (e.g. drop_duplicates) whose result is cached as well
+#Callers must treat the returned DataFrame as read-only because it is shared between sessions
+def cached_read(cache, pool, sql, params=None, columns=None, ttl=None, tags=(), prepare=None):
+    from db_pool import fetch_all
+
+    def load():
+        rows = fetch_all(pool, sql, params)
+        with instrumentation.span("frame", "DataFrame") as frame:
+            df = pd.DataFrame(rows, columns=columns)
+            df = prepare(df) if prepare is not None else df
+            frame["rows"] = len(df)
+        read["hit"] = False
+        return df
+
+    with instrumentation.span("read", instrumentation.query_name(sql)) as read:
+        read["hit"] = True
+        return cache.get_or_load(sql, params, load, ttl=ttl, tags=tags)
+
+
+#Command-line hook for notebooks and cron jobs:
+#python query_cache.py invalidate [tag ...]
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "invalidate":
+        print("Usage: python query_cache.py invalidate [tag ...]")
+        sys.exit(1)
+    notify_invalidation(tuple(sys.argv[2:]) or ("rankings",))
+    print(f"Invalidated {', '.join(sys.argv[2:]) or 'rankings'} in {STAMP_PATH}")
@@ -0,0 +1,258 @@
+# Table definitions for the sportanalytics database
+# Written so it works on MySQL and on the local SQLite stand-in; {autoincrement} is filled in per dialect
+# Existing databases are brought up to date by migrate.py
+
+#Tables in foreign-key order (categorytable must exist before competitiontable)
+TABLES = {
+    "categorytable": """
+        CREATE TABLE IF NOT EXISTS categorytable (
+            category_id VARCHAR(50) PRIMARY KEY,
+            category_name VARCHAR(100) NOT NULL
+        )
+    """,
+    "competitiontable": """
+        CREATE TABLE IF NOT EXISTS competitiontable (
+            competition_id VARCHAR(50) PRIMARY KEY,
+            competition_name VARCHAR(100) NOT NULL,
+            parent_id VARCHAR(50),
+            type VARCHAR(20) NOT NULL,
+            gender VARCHAR(10) NOT NULL,
+            category_id VARCHAR(50),
+            FOREIGN KEY (category_id) REFERENCES categorytable(category_id)
+        )
+    """,
+    #Ranking history: one row per competitor per (year, week); re-running the ETL updates rows instead of
+    #appending a snapshot. Each week is a contiguous range of idx_ranking_week_rank, ordered by rank
+    "competitor_ranking_table": """
+        CREATE TABLE IF NOT EXISTS competitor_ranking_table (
+            rank_id {autoincrement},
+            competitor_id VARCHAR(255) NOT NULL,
+            year INT NOT NULL,
+            week INT NOT NULL,
+            ranks INT,
+            movement INT,
+            points INT,
+            competitions_played INT,
+            CONSTRAINT uq_ranking_competitor_week UNIQUE (competitor_id, year, week)
+        )
+    """,
+    #One row per competitor; (year, week) = latest ranking week the competitor appeared in,
+    #so "latest ranking per competitor" is a primary-key join instead of a MAX(week) subquery
+    "competitors_table": """
+        CREATE TABLE IF NOT EXISTS competitors_table (
+            competitor_id VARCHAR(255) PRIMARY KEY,
+            name VARCHAR(255),
+            country VARCHAR(255),
+            country_code VARCHAR(10),
+            abbreviation VARCHAR(10),
+            year INT,
+            week INT
+        )
+    """,
+    "complex": """
+        CREATE TABLE IF NOT EXISTS complex (
+            complex_id VARCHAR(50) PRIMARY KEY,
+            complex_name VARCHAR(100)
+        )
+    """,
+    "venue": """
+        CREATE TABLE IF NOT EXISTS venue (
+            venue_id VARCHAR(50) PRIMARY KEY,
+            venue_name VARCHAR(100),
+            city_name VARCHAR(50),
+            country_name VARCHAR(100),
+            country_code VARCHAR(5),
+            timezone VARCHAR(100),
+            complex_id VARCHAR(50)
+        )
+    """,
+    #Precomputed page results, rebuilt by snapshots.refresh_snapshots after each ranking load
+    #position is the display order (rank order / biggest movement first), so a page read is a primary-key scan
+    "latest_rankings": """
+        CREATE TABLE IF NOT EXISTS latest_rankings (
+            position INT PRIMARY KEY,
+            competitor_id VARCHAR(255),
+            ranks INT,
+            movement INT,
+            points INT,
+            competitor_name VARCHAR(255),
+            country VARCHAR(255),
+            year INT,
+            week INT
+        )
+    """,
+    "top_movers": """
+        CREATE TABLE IF NOT EXISTS top_movers (
+            position INT PRIMARY KEY,
+            competitor_id VARCHAR(255),
+            ranks INT,
+            movement INT,
+            points INT,
+            competitor_name VARCHAR(255),
+            country VARCHAR(255),
+            year INT,
+            week INT
+        )
+    """,
+    #Latest ranking week aggregated per country (empty country_code = competitors without one), with the change
+    #since the previous ranking week (NULL for a country absent that week); one row per country, so the
+    #Country Map page never reads the ranking rows themselves
+    "country_rankings": """
+        CREATE TABLE IF NOT EXISTS country_rankings (
+            country_code VARCHAR(10) PRIMARY KEY,
+            country VARCHAR(255),
+            year INT,
+            week INT,
+            competitors INT,
+            best_rank INT,
+            median_points DOUBLE,
+            total_points INT,
+            top10 INT,
+            top100 INT,
+            competitors_change INT,
+            best_rank_change INT,
+            median_points_change DOUBLE,
+            total_points_change INT
+        )
+    """,
+    #Competition hierarchy as a closure table, rebuilt by hierarchy.refresh_hierarchy after each competitions load:
+    #one row per (ancestor, descendant) pair, depth = levels between them (0 = the competition itself)
+    #so "everything under X" is a primary-key range instead of one self-join per level
+    "competition_closure": """
+        CREATE TABLE IF NOT EXISTS competition_closure (
+            ancestor_id VARCHAR(50) NOT NULL,
+            descendant_id VARCHAR(50) NOT NULL,
+            depth INT NOT NULL,
+            PRIMARY KEY (ancestor_id, descendant_id)
+        )
+    """,
+    #Ranking notification rules (notifications.py): competitor_id NULL = a threshold rule over every competitor,
+    #set = a watch-list entry for that competitor; rule_type: entered_top, left_top, moved or points_change
+    "watch_rules": """
+        CREATE TABLE IF NOT EXISTS watch_rules (
+            rule_id {autoincrement},
+            user_id VARCHAR(100) NOT NULL,
+            competitor_id VARCHAR(255),
+            rule_type VARCHAR(20) NOT NULL,
+            threshold INT NOT NULL,
+            sink VARCHAR(20) NOT NULL,
+            target VARCHAR(255),
+            created_at VARCHAR(40)
+        )
+    """,
+    #Notifications sent: one row per (ranking week, rule, competitor), so a re-run never sends one twice
+    "notifications": """
+        CREATE TABLE IF NOT EXISTS notifications (
+            year INT NOT NULL,
+            week INT NOT NULL,
+            rule_id INT NOT NULL,
+            competitor_id VARCHAR(255) NOT NULL,
+            user_id VARCHAR(100),
+            sink VARCHAR(20),
+            message VARCHAR(500),
+            sent_at VARCHAR(40),
+            PRIMARY KEY (year, week, rule_id, competitor_id)
+        )
+    """,
+    #One row per ETL run: what was loaded and how much of it changed (the sync watermark)
+    "etl_watermark": """
+        CREATE TABLE IF NOT EXISTS etl_watermark (
+            run_id {autoincrement},
+            source VARCHAR(100) NOT NULL,
+            week INT,
+            generated_at VARCHAR(40),
+            rows_seen INT,
+            rows_changed INT,
+            run_at VARCHAR(40),
+            year INT
+        )
+    """,
+}
+
+#Secondary indexes: name -> (table, columns)
+INDEXES = {
+    "idx_ranking_week_rank": ("competitor_ranking_table", ["year", "week", "ranks"]),      #Ranking Overview, Top Movers
+    "idx_competitor_country_week": ("competitors_table", ["country", "year", "week"]),    #Country-wise Filter
+    "idx_competitor_name": ("competitors_table", ["name"]),                               #Competitor directory, in name order
+    "idx_watermark_source": ("etl_watermark", ["source", "run_id"]),
+    "idx_competition_parent": ("competitiontable", ["parent_id"]),                        #Children of one competition
+    "idx_closure_descendant": ("competition_closure", ["descendant_id", "depth"]),       #Ancestors / depth of one competition
+    "idx_rules_competitor": ("watch_rules", ["competitor_id", "rule_type"]),             #Rules of the competitors that moved
+    "idx_rules_user": ("watch_rules", ["user_id"]),                                      #One user's rules
+}
+
+#Surrogate key column type per dialect
+AUTOINCREMENT = {
+    "mysql": "INT AUTO_INCREMENT PRIMARY KEY",
+    "sqlite": "INTEGER PRIMARY KEY AUTOINCREMENT",
+}
+
+#Column order used by the loaders (matches the INSERT statements in the notebooks)
+COLUMNS = {
+    "categorytable": ["category_id", "category_name"],
+    "competitiontable": ["competition_id", "competition_name", "parent_id", "type", "gender", "category_id"],
+    "competitor_ranking_table": ["competitor_id", "year", "week", "ranks", "movement", "points", "competitions_played"],
+    "competitors_table": ["competitor_id", "name", "country", "country_code", "abbreviation", "year", "week"],
+    "complex": ["complex_id", "complex_name"],
+    "venue": ["venue_id", "venue_name", "city_name", "country_name", "country_code", "timezone", "complex_id"],
+    "latest_rankings": ["position", "competitor_id", "ranks", "movement", "points", "competitor_name", "country",
+                        "year", "week"],
+    "top_movers": ["position", "competitor_id", "ranks", "movement", "points", "competitor_name", "country",
+                   "year", "week"],
+    "country_rankings": ["country_code", "country", "year", "week", "competitors", "best_rank", "median_points",
+                         "total_points", "top10", "top100", "competitors_change", "best_rank_change",
+                         "median_points_change", "total_points_change"],
+    "competition_closure": ["ancestor_id", "descendant_id", "depth"],
+    "watch_rules": ["user_id", "competitor_id", "rule_type", "threshold", "sink", "target", "created_at"],
+    "notifications": ["year", "week", "rule_id", "competitor_id", "user_id", "sink", "message", "sent_at"],
+    "etl_watermark": ["source", "year", "week", "generated_at", "rows_seen", "rows_changed", "run_at"],
+}
+
+#Natural keys used for upserts
+KEYS = {
+    "competitiontable": ["competition_id"],
+    "competitor_ranking_table": ["competitor_id", "year", "week"],
+    "competitors_table": ["competitor_id"],
+    "complex": ["complex_id"],
+    "venue": ["venue_id"],
+}
+
+
+def table_ddl(table, dialect="mysql", name=None):
+    ddl = TABLES[table].format(autoincrement=AUTOINCREMENT[dialect])
+    if name is not None:
+        ddl = ddl.replace(f"EXISTS {table} (", f"EXISTS {name} (", 1)
+    return ddl
+
+
+def index_exists(cursor, name, table, dialect="mysql"):
+    if dialect == "sqlite":
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,))
+    else:
+        cursor.execute(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+            (table, name),
+        )
+    return cursor.fetchone() is not None
+
+
+def create_indexes(conn, dialect="mysql", tables=None):
+    cursor = conn.cursor()
+    for name, (table, columns) in INDEXES.items():
+        if tables is not None and table not in tables:
+            continue
+        if not index_exists(cursor, name, table, dialect):
+            cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+    conn.commit()
+    cursor.close()
+
+
+#Creates any missing tables (all of them by default) and their indexes
+def create_tables(conn, tables=None, dialect="mysql"):
+    cursor = conn.cursor()
+    for table in tables or TABLES:
+        cursor.execute(table_ddl(table, dialect))
+    conn.commit()
+    cursor.close()
+    create_indexes(conn, dialect, tables)
@@ -0,0 +1,204 @@
+# Competitor search index for the Search page
+# Replaces "name LIKE '%...%' OR competitor_id LIKE '%...%'" (a full scan on every keystroke) with an
+# in-memory trigram inverted index over competitor names, abbreviations and IDs:
+#   - accent/case folding ("Hernández" and "hernandez" are the same), punctuation ignored
+#   - token-start grams ("^pa") so prefix matches rank above matches in the middle of a word
+#   - fuzzy: a competitor matches when it shares at least MIN_SHARE of the query grams (typos still match)
+#   - ranked results (shared grams, then exact substring, then shorter name) cut to a result limit
+# The ETL builds the index after each rankings load and saves it next to the data (INDEX_PATH); the dashboard
+# loads that file when it was built from the same database (db_pool.database_target) at its last ETL run and builds
+# it from competitors_table otherwise
+#
+# Usage:
+#   python search_index.py --sqlite data/sportanalytics.db "pavic"
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import os                        #Index file path
+import pickle                    #Saving the built index
+import re                        #Tokenizing folded text
+import unicodedata               #Accent folding
+
+import numpy as np
+
+INDEX_PATH = os.environ.get(
+    "TENNIS_SEARCH_INDEX",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "search_index.pkl"),
+)
+SEARCH_LIMIT = 50                #Results returned per query
+MIN_SHARE = 0.5                  #Fraction of the query grams a competitor must share to match
+MAX_CANDIDATES = 200             #Candidates ranked per query (the best by shared grams)
+
+#Competitors to index, read from the database (one row per competitor)
+SOURCE_SQL = "SELECT competitor_id, name, abbreviation FROM competitors_table"
+VERSION_SQL = "SELECT MAX(run_id) FROM etl_watermark"
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+#Lower-case, accent-free, punctuation-free text: "Hernández, José-Luis" -> "hernandez jose luis"
+def fold(text):
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+#Grams of one folded token: its first letter and first two letters marked as a token start, then its trigrams
+def token_grams(token):
+    grams = {"^" + token[:1], "^" + token[:2]}
+    grams.update(token[i:i + 3] for i in range(len(token) - 2))
+    return grams
+
+
+#Grams of a query: the same as token_grams, but a one- or two-letter token only contributes its start gram
+def query_grams(text):
+    grams = set()
+    for token in fold(text).split():
+        grams.add("^" + token[:2])
+        grams.update(token[i:i + 3] for i in range(len(token) - 2))
+    return grams
+
+
+#IDs are indexed by their numeric part only ("sr:competitor:49363" -> "49363"); the shared prefix would
+#otherwise put every competitor in the postings of "com", "omp", ...
+def id_token(competitor_id):
+    return str(competitor_id).rsplit(":", 1)[-1].lower() if competitor_id else ""
+
+
+class SearchIndex:
+    #ids[i], names[i], abbreviations[i] describe document i; postings map a gram to the sorted document numbers
+    def __init__(self, ids, names, abbreviations, version=None):
+        self.ids = list(ids)
+        self.names = list(names)
+        self.version = version
+        self.texts = []                          #Folded searchable text per document (for the substring bonus)
+        self.exact = {}                          #Folded full ID -> document (exact ID lookups)
+        postings = {}
+        for doc, (competitor_id, name, abbreviation) in enumerate(zip(self.ids, self.names, abbreviations)):
+            text = " ".join(t for t in (fold(name), fold(abbreviation), id_token(competitor_id)) if t)
+            self.texts.append(text)
+            self.exact[fold(competitor_id)] = doc
+            grams = set()
+            for token in text.split():
+                grams |= token_grams(token)
+            for gram in grams:
+                postings.setdefault(gram, []).append(doc)
+        self.postings = {gram: np.array(docs, dtype=np.int32) for gram, docs in postings.items()}
+        self.name_lengths = np.array([len(name or "") for name in self.names], dtype=np.int32)
+        #Alphabetical position of each document's name (the last tie-breaker, compared as integers)
+        self.name_order = np.empty(len(self.names), dtype=np.int32)
+        self.name_order[sorted(range(len(self.names)), key=lambda doc: self.names[doc] or "")] = np.arange(len(self.names))
+
+    def __len__(self):
+        return len(self.ids)
+
+    #Ranked document numbers for a query (best first, at most limit)
+    def search_docs(self, query, limit=SEARCH_LIMIT):
+        folded = fold(query)
+        if not folded:
+            return []
+        exact = self.exact.get(folded)
+        grams = query_grams(query)
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        if not lists:
+            return [exact] if exact is not None else []
+
+        #Shared grams per document, counted in one pass over the postings
+        counts = np.bincount(np.concatenate(lists), minlength=len(self.ids))
+        docs = np.flatnonzero(counts >= max(1, int(np.ceil(len(grams) * MIN_SHARE))))
+        shared = counts[docs]
+        if len(docs) > MAX_CANDIDATES:
+            best = np.argpartition(-shared, MAX_CANDIDATES)[:MAX_CANDIDATES]
+            docs, shared = docs[best], shared[best]
+
+        #Rank: most shared grams, then contains the query as typed, then shorter name, then alphabetical
+        contains = np.fromiter((folded in self.texts[doc] for doc in docs), dtype=bool, count=len(docs))
+        order = np.lexsort((self.name_order[docs], self.name_lengths[docs], ~contains, -shared))
+        results = docs[order[:limit + 1]].tolist()
+        if exact is not None:
+            results = [exact] + [doc for doc in results if doc != exact]
+        return results[:limit]
+
+    #Ranked competitor IDs for a query
+    def search(self, query, limit=SEARCH_LIMIT):
+        return [self.ids[doc] for doc in self.search_docs(query, limit)]
+
+    def memory_bytes(self):
+        return sum(a.nbytes for a in self.postings.values()) + 100 * len(self.ids)
+
+    def save(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)  #Atomic swap so a dashboard never loads a half-written file
+
+    @staticmethod
+    def load(path=INDEX_PATH):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+#Builds the index from an open connection (the ETL) and saves it; version = (database target, last ETL run id),
+#since run ids of two databases can be equal
+def build_from_connection(conn, path=INDEX_PATH, dialect="mysql"):
+    from db_pool import database_target
+    target = database_target(conn, dialect) if path else None
+    cursor = conn.cursor()
+    cursor.execute(VERSION_SQL)
+    version = (target, cursor.fetchone()[0])
+    cursor.execute(SOURCE_SQL)
+    rows = cursor.fetchall()
+    cursor.close()
+    index = SearchIndex([r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows], version)
+    if path:
+        index.save(path)
+    return index
+
+
+#Index for the dashboard: the saved file if it was built from the current data of this database, else built from the pool
+def load_for_pool(pool, path=INDEX_PATH):
+    from db_pool import database_target, fetch_all
+    with pool.connection() as conn:
+        target = database_target(conn, pool.dialect)
+    version = (target, fetch_all(pool, VERSION_SQL)[0][0])
+    try:
+        index = SearchIndex.load(path)
+        if index.version == version:
+            return index
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+    rows = fetch_all(pool, SOURCE_SQL)
+    return SearchIndex([r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows], version)
+
+
+def main(argv=None):
+    import sqlite3
+    parser = argparse.ArgumentParser(description="Build the competitor search index and run a query")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="read a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="read MySQL (db_pool.DB_CONFIG)")
+    parser.add_argument("query", nargs="?", help="search text")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        conn, dialect = sqlite3.connect(args.sqlite), "sqlite"
+    else:
+        import mysql.connector
+        from db_pool import DB_CONFIG
+        conn, dialect = mysql.connector.connect(**DB_CONFIG), "mysql"
+    try:
+        index = build_from_connection(conn, dialect=dialect)
+    finally:
+        conn.close()
+    print(f"Indexed {len(index)} competitors ({len(index.postings)} grams) -> {INDEX_PATH}")
+    if args.query:
+        for doc in index.search_docs(args.query, args.limit):
+            print(f"  {index.ids[doc]:<24} {index.names[doc]}")
+
+
+if __name__ == "__main__":
+    main()
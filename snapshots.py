@@ -0,0 +1,175 @@
+# Precomputed ranking snapshots for the Ranking Overview, Top Movers and Country Map pages
+# The pages used to join the ranking and competitor tables, pick the latest week and sort by ABS(movement)
+# on every rerun. The ETL now materializes the results once per load into small tables
+# (schema.py: latest_rankings, top_movers, country_rankings) and the pages read them in primary-key order
+# country_rankings holds per-country aggregates of the latest week (competitors, best rank, median / total
+# points, top-10 / top-100 counts) and their change since the previous ranking week
+#
+# Usage:
+#   python snapshots.py --sqlite data/sportanalytics.db      (rebuild the snapshots by hand)
+#   python snapshots.py --mysql
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import sqlite3                   #Local SQLite stand-in
+import statistics                #Median points per country
+import time                      #Timing the refresh
+
+from db_pool import DB_CONFIG, adapt_sql
+
+TOP_MOVERS_LIMIT = 50            #Rows kept in top_movers (same as the old page query)
+
+#The two most recent ranking weeks, newest first (latest snapshot + "previous week" for the country deltas)
+RANKING_WEEKS_SQL = """
+    SELECT DISTINCT year, week
+    FROM competitor_ranking_table
+    ORDER BY year DESC, week DESC
+    LIMIT 2
+"""
+
+#Latest ranking week, every competitor, numbered in rank order (params: year, week)
+LATEST_RANKINGS_SQL = """
+    INSERT INTO latest_rankings (position, competitor_id, ranks, movement, points, competitor_name, country, year, week)
+    SELECT ROW_NUMBER() OVER (ORDER BY cr.ranks, cr.competitor_id),
+           cr.competitor_id, cr.ranks, cr.movement, cr.points, co.name, co.country, cr.year, cr.week
+    FROM competitor_ranking_table cr
+    JOIN competitors_table co ON co.competitor_id = cr.competitor_id
+    WHERE cr.year = %s AND cr.week = %s
+"""
+
+#Largest absolute movements of the latest week, numbered biggest first (params: year, week)
+TOP_MOVERS_SQL = f"""
+    INSERT INTO top_movers (position, competitor_id, ranks, movement, points, competitor_name, country, year, week)
+    SELECT position, competitor_id, ranks, movement, points, competitor_name, country, year, week
+    FROM (
+        SELECT ROW_NUMBER() OVER (ORDER BY ABS(cr.movement) DESC, cr.ranks, cr.competitor_id) AS position,
+               cr.competitor_id, cr.ranks, cr.movement, cr.points, co.name AS competitor_name, co.country,
+               cr.year, cr.week
+        FROM competitor_ranking_table cr
+        JOIN competitors_table co ON co.competitor_id = cr.competitor_id
+        WHERE cr.year = %s AND cr.week = %s AND cr.movement IS NOT NULL AND cr.movement <> 0
+    ) movers
+    WHERE position <= {TOP_MOVERS_LIMIT}
+"""
+
+#Ranking rows of one week with each competitor's country (params: year, week)
+COUNTRY_WEEK_SQL = """
+    SELECT COALESCE(co.country_code, ''), co.country, cr.ranks, cr.points
+    FROM competitor_ranking_table cr
+    JOIN competitors_table co ON co.competitor_id = cr.competitor_id
+    WHERE cr.year = %s AND cr.week = %s
+"""
+
+COUNTRY_INSERT_SQL = """
+    INSERT INTO country_rankings (country_code, country, year, week, competitors, best_rank, median_points,
+                                  total_points, top10, top100, competitors_change, best_rank_change,
+                                  median_points_change, total_points_change)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+#(country_code, country, rank, points) rows of one week -> {country_code: aggregates}
+def country_aggregates(rows):
+    groups = {}
+    for code, country, rank, points in rows:
+        group = groups.setdefault(code, {"country": country, "ranks": [], "points": []})
+        if rank is not None:
+            group["ranks"].append(rank)
+        if points is not None:
+            group["points"].append(points)
+    return {code: {
+        "country": group["country"],
+        "competitors": len(group["ranks"]),
+        "best_rank": min(group["ranks"], default=None),
+        "median_points": statistics.median(group["points"]) if group["points"] else None,
+        "total_points": sum(group["points"]),
+        "top10": sum(rank <= 10 for rank in group["ranks"]),
+        "top100": sum(rank <= 100 for rank in group["ranks"]),
+    } for code, group in groups.items()}
+
+
+def _change(new, old, key, lower_is_better=False):
+    if old is None or new[key] is None or old[key] is None:
+        return None
+    return old[key] - new[key] if lower_is_better else new[key] - old[key]
+
+
+#country_rankings rows for the latest week, with the change since the previous week (best_rank_change > 0 = better)
+def country_rows(cursor, dialect, latest, previous=None):
+    def week(year_week):
+        cursor.execute(adapt_sql(COUNTRY_WEEK_SQL, dialect), tuple(year_week))
+        return country_aggregates(cursor.fetchall())
+
+    current = week(latest)
+    before = week(previous) if previous is not None else {}
+    rows = []
+    for code, agg in sorted(current.items()):
+        old = before.get(code)
+        rows.append((code, agg["country"], latest[0], latest[1], agg["competitors"], agg["best_rank"],
+                     agg["median_points"], agg["total_points"], agg["top10"], agg["top100"],
+                     _change(agg, old, "competitors"), _change(agg, old, "best_rank", lower_is_better=True),
+                     _change(agg, old, "median_points"), _change(agg, old, "total_points")))
+    return rows
+
+
+#Rebuilds latest_rankings, top_movers and country_rankings from the latest ranking week
+#All tables are emptied and refilled in one transaction, so readers see either the old or the new week
+#Returns report lines in the same shape as ingest.bulk_load stats
+def refresh_snapshots(conn, dialect="mysql"):
+    start = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute(RANKING_WEEKS_SQL)
+    weeks = cursor.fetchall()
+    latest = weeks[0] if weeks else None
+    counts = {}
+    try:
+        for table, sql in (("latest_rankings", LATEST_RANKINGS_SQL), ("top_movers", TOP_MOVERS_SQL)):
+            cursor.execute(f"DELETE FROM {table}")
+            if latest is not None:
+                cursor.execute(adapt_sql(sql, dialect), tuple(latest))
+            counts[table] = max(cursor.rowcount, 0) if latest is not None else 0
+        rows = country_rows(cursor, dialect, latest, weeks[1] if len(weeks) > 1 else None) if latest else []
+        cursor.execute("DELETE FROM country_rankings")
+        if rows:
+            cursor.executemany(adapt_sql(COUNTRY_INSERT_SQL, dialect), rows)
+        counts["country_rankings"] = len(rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    seconds = time.perf_counter() - start
+    return [{
+        "table": table,
+        "rows": count,
+        "seconds": seconds,
+        "rows_per_sec": count / seconds if seconds > 0 else float("inf"),
+        "method": "snapshot refresh",
+    } for table, count in counts.items()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the latest_rankings, top_movers and country_rankings tables")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="refresh a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="refresh MySQL (db_pool.DB_CONFIG)")
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        conn, dialect = sqlite3.connect(args.sqlite), "sqlite"
+    else:
+        import mysql.connector
+        conn, dialect = mysql.connector.connect(**DB_CONFIG), "mysql"
+    try:
+        for s in refresh_snapshots(conn, dialect):
+            print(f"{s['table']:<20}{s['rows']:>8} rows")
+    finally:
+        conn.close()
+
+    from query_cache import notify_invalidation
+    notify_invalidation(("rankings",))
+
+
+if __name__ == "__main__":
+    main()
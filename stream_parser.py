@@ -0,0 +1,162 @@
+# Streaming extraction for the large payloads (double_competitors_rankings.json, complexes.json)
+# json.load keeps the whole document in memory, then the parsers build row lists from it and the notebooks
+# build DataFrames from those. Here the nested arrays are read incrementally with ijson and turned into
+# fixed-size row batches that go straight into the bulk loader, so peak memory depends on the batch size,
+# not on the payload size
+#
+# ijson is optional: without it the file is parsed with json.load and then batched (same rows, no memory saving)
+#
+# Usage:
+#   python stream_parser.py --sqlite data/sportanalytics.db --batch-size 5000
+#   (or python ingest.py --sqlite data/sportanalytics.db --stream)
+
+# Importing Required Libraries
+import argparse                  #Command-line options
+import json                      #Fallback when ijson is not installed
+import os                        #File paths
+
+from ingest import (CHUNK_SIZE, COMPLEXES_FILE, FIXTURES_DIR, RANKINGS_FILE, already_synced, build_search_index,
+                    complex_entry_rows, connect, load_batches, print_report, ranking_entry_rows,
+                    sync_ranking_batches)
+from migrate import migrate
+
+try:
+    import ijson                 #Event-based JSON parser
+except ImportError:
+    ijson = None
+
+#ijson prefixes of the nested arrays
+RANKING_PREFIX = "rankings.item"
+RANKING_ENTRY_PREFIX = "rankings.item.competitor_rankings.item"
+COMPLEX_PREFIX = "complexes.item"
+
+
+#Top-level generated_at of a payload file, read without loading the rest of it (None if missing)
+def read_generated_at(f):
+    if ijson is None:
+        return json.load(f).get("generated_at")
+    for prefix, event, value in ijson.parse(f):
+        if prefix == "generated_at":
+            return value
+    return None
+
+
+#Yields (competitor_ranking dict, year, week) for every rankings[].competitor_rankings[] entry
+#Only one entry is built at a time; entries seen before their ranking's year/week are held until the
+#ranking object ends (the API sends year and week first, so normally nothing is held)
+def iter_ranking_entries(f):
+    if ijson is None:
+        for ranking in json.load(f).get("rankings", []):
+            for competitor_ranking in ranking.get("competitor_rankings", []):
+                yield competitor_ranking, ranking.get("year"), ranking.get("week")
+        return
+
+    year = week = builder = None
+    pending = []
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == RANKING_ENTRY_PREFIX and event == "end_map":
+                if week is None:
+                    pending.append(builder.value)
+                else:
+                    yield builder.value, year, week
+                builder = None
+        elif prefix == RANKING_ENTRY_PREFIX and event == "start_map":
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == RANKING_PREFIX and event == "start_map":
+            year = week = None
+        elif prefix == RANKING_PREFIX + ".year":
+            year = value
+        elif prefix == RANKING_PREFIX + ".week":
+            week = value
+        elif prefix == RANKING_PREFIX and event == "end_map":
+            for entry in pending:
+                yield entry, year, week
+            pending = []
+
+
+#Yields each complexes[] object (one complex with its venues at a time)
+def iter_complexes(f):
+    if ijson is None:
+        yield from json.load(f).get("complexes", [])
+        return
+    yield from ijson.items(f, COMPLEX_PREFIX, use_float=True)
+
+
+#Rankings file -> batches of (ranking rows, competitor rows) with batch_size ranking rows each
+def iter_ranking_batches(f, batch_size=CHUNK_SIZE):
+    ranking_rows, competitor_rows = [], []
+    for competitor_ranking, year, week in iter_ranking_entries(f):
+        ranking_row, competitor_row = ranking_entry_rows(competitor_ranking, year, week)
+        ranking_rows.append(ranking_row)
+        competitor_rows.append(competitor_row)
+        if len(ranking_rows) >= batch_size:
+            yield ranking_rows, competitor_rows
+            ranking_rows, competitor_rows = [], []
+    if ranking_rows:
+        yield ranking_rows, competitor_rows
+
+
+#Complexes file -> batches of (complex rows, venue rows) with about batch_size rows each
+def iter_complex_batches(f, batch_size=CHUNK_SIZE):
+    complex_rows, venue_rows = [], []
+    for cmplx in iter_complexes(f):
+        complex_row, venues = complex_entry_rows(cmplx)
+        complex_rows.append(complex_row)
+        venue_rows.extend(venues)
+        if len(complex_rows) + len(venue_rows) >= batch_size:
+            yield complex_rows, venue_rows
+            complex_rows, venue_rows = [], []
+    if complex_rows:
+        yield complex_rows, venue_rows
+
+
+#Streaming versions of ingest.load_rankings / ingest.load_complexes that take a file path
+#The rankings file is opened twice: once for generated_at (the watermark check), once for the rows
+def load_rankings_file(conn, path, dialect="mysql", chunk_size=CHUNK_SIZE, use_infile=False):
+    with open(path, "rb") as f:
+        generated_at = read_generated_at(f)
+    if already_synced(conn, generated_at, dialect):
+        return []
+    with open(path, "rb") as f:
+        return sync_ranking_batches(conn, iter_ranking_batches(f, chunk_size), generated_at, dialect,
+                                    chunk_size, use_infile)
+
+
+def load_complexes_file(conn, path, dialect="mysql", chunk_size=CHUNK_SIZE, use_infile=False):
+    with open(path, "rb") as f:
+        return load_batches(conn, ("complex", "venue"), iter_complex_batches(f, chunk_size), dialect,
+                            mode="upsert", chunk_size=chunk_size, use_infile=use_infile)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream the rankings and complexes payloads into the database")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="folder with the saved JSON payloads")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="PATH", help="load into a local SQLite file")
+    target.add_argument("--mysql", action="store_true", help="load into MySQL (db_pool.DB_CONFIG)")
+    parser.add_argument("--batch-size", type=int, default=CHUNK_SIZE, help="rows per batch / commit")
+    parser.add_argument("--infile", action="store_true", help="use LOAD DATA LOCAL INFILE (MySQL only)")
+    args = parser.parse_args(argv)
+
+    conn, dialect = connect(args)
+    options = {"chunk_size": args.batch_size, "use_infile": args.infile}
+    try:
+        migrate(conn, dialect)
+        stats = load_complexes_file(conn, os.path.join(args.fixtures, COMPLEXES_FILE), dialect, **options)
+        stats += load_rankings_file(conn, os.path.join(args.fixtures, RANKINGS_FILE), dialect, **options)
+        if any(s["table"] == "competitors_table" and s["rows"] for s in stats):
+            stats.append(build_search_index(conn))
+    finally:
+        conn.close()
+
+    if any(s["table"] == "competitor_ranking_table" and s["rows"] for s in stats):
+        from query_cache import notify_invalidation
+        notify_invalidation(("rankings",))
+    print_report(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# Shared pytest setup
+# The modules live at the repository root and the synthetic payloads in benchmarks/, so both go on sys.path
+#
+# Usage:
+#   python -m pytest -q
+
+# Importing Required Libraries
+import os
+import sqlite3
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from migrate import migrate
+
+
+#Empty SQLite database with the current schema
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn, "sqlite")
+    yield conn
+    conn.close()
@@ -0,0 +1,97 @@
+# Parity of the backends: SqlBackend (page queries) and memstore.MemoryBackend (pandas filters) return the same
+# frames for every DataBackend call on a small SQLite database of synthetic rankings and competitions
+
+# Importing Required Libraries
+import random
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import synthetic
+from backend import SqlBackend
+from db_pool import ConnectionPool, sqlite_factory
+from hierarchy import refresh_hierarchy
+from ingest import load_competitions, parse_rankings, sync_ranking_batches
+from memstore import MemoryBackend
+from migrate import migrate
+from query_cache import QueryCache
+from snapshots import refresh_snapshots
+
+COMPETITORS = 60
+WEEKS = 4
+
+
+@pytest.fixture(scope="module")
+def backends(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("backend")
+    path = str(folder / "rankings.db")
+    conn = sqlite3.connect(path)
+    migrate(conn, "sqlite")
+    for payload in synthetic.rankings_payloads(random.Random("backend-parity"), COMPETITORS, WEEKS):
+        sync_ranking_batches(conn, [parse_rankings(payload)], payload["generated_at"], "sqlite", snapshots=False)
+    load_competitions(conn, synthetic.competitions_payload(random.Random("backend-parity"), 40), "sqlite")
+    refresh_hierarchy(conn, "sqlite")
+    refresh_snapshots(conn, "sqlite")
+    conn.close()
+    pool = ConnectionPool(sqlite_factory(path), size=2, dialect="sqlite")
+    sql = SqlBackend(pool, QueryCache(stamp_path=str(folder / "stamp.json")))
+    memory = MemoryBackend(pool, background=False)
+    yield sql, memory
+    memory.close()
+    pool.close_all()
+
+
+def assert_same(a, b):
+    if isinstance(a, pd.DataFrame):
+        assert len(a) > 0
+        pd.testing.assert_frame_equal(a, b, check_dtype=False, check_index_type=False)
+    else:
+        assert a == b
+
+
+@pytest.mark.parametrize("call", ["latest_rankings", "latest_rankings_count", "ranking_by_country", "ranking_weeks",
+                                  "top_movers", "country_list", "country_stats"])
+def test_same_result(backends, call):
+    sql, memory = backends
+    assert_same(getattr(sql, call)(), getattr(memory, call)())
+
+
+def test_latest_rankings_page(backends):
+    sql, memory = backends
+    for after, size in ((0, 100), (10, 20), (COMPETITORS - 5, 20)):
+        assert_same(sql.latest_rankings_page(after, size), memory.latest_rankings_page(after, size))
+    assert sql.latest_rankings_count() == COMPETITORS
+
+
+def test_week_rankings(backends):
+    sql, memory = backends
+    weeks = sql.ranking_weeks()
+    assert len(weeks) == WEEKS
+    for year, week in (weeks[0], weeks[-1]):
+        assert_same(sql.week_rankings(year, week), memory.week_rankings(year, week))
+
+
+def test_search_and_country(backends):
+    sql, memory = backends
+    for text in ("an", "ka", "sr:competitor:100007"):
+        assert_same(sql.search(text), memory.search(text))
+    for country in sql.country_list()[:3]:
+        assert_same(sql.competitors_by_country(country), memory.competitors_by_country(country))
+
+
+def test_competitor_calls(backends):
+    sql, memory = backends
+    directory = sql.competitor_directory()
+    assert directory.ids == memory.competitor_directory().ids
+    assert directory.labels == memory.competitor_directory().labels
+    ids = directory.ids[:5]
+    assert_same(sql.comparison_latest(ids), memory.comparison_latest(ids))
+    assert_same(sql.rank_series(ids).series_frame(), memory.rank_series(ids).series_frame())
+    assert len(sql.rank_series(ids).rank) == 5 * WEEKS
+
+
+def test_competition_tree(backends):
+    sql, memory = backends
+    assert_same(sql.competition_tree().frame, memory.competition_tree().frame)
+    assert sql.competition_tree().index == memory.competition_tree().index
@@ -0,0 +1,58 @@
+# Tests for the connection pool (db_pool.py)
+
+# Importing Required Libraries
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from db_pool import ConnectionPool, PoolTimeout
+
+
+def pool_of(size, timeout=5):
+    return ConnectionPool(lambda: sqlite3.connect(":memory:", check_same_thread=False), size=size, timeout=timeout,
+                          dialect="sqlite")
+
+
+def test_connections_are_reused():
+    pool = pool_of(2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    assert pool.stats()["open"] == 1
+
+
+def test_full_pool_times_out():
+    pool = pool_of(1, timeout=0.1)
+    with pool.connection():
+        with pytest.raises(PoolTimeout):
+            with pool.connection():
+                pass
+
+
+#A waiter on a full pool opens a new connection as soon as a broken one is thrown away
+def test_waiter_replaces_a_discarded_connection():
+    pool = pool_of(1)
+    got = []
+    holding = threading.Event()
+
+    def waiter():
+        holding.wait()
+        start = time.monotonic()
+        with pool.connection() as conn:
+            got.append((conn, time.monotonic() - start))
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    with pytest.raises(sqlite3.ProgrammingError):
+        with pool.connection() as conn:
+            holding.set()
+            time.sleep(0.2)      #The waiter is now blocked on the full pool
+            conn.close()         #Broken: fails the health check and is discarded
+            conn.execute("SELECT 1")
+    thread.join(timeout=2)
+    assert got and got[0][0] is not conn and got[0][1] < 1
+    s = pool.stats()
+    assert s["open"] == 1 and s["idle"] == 1 and s["waits"] == 1
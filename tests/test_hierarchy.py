@@ -0,0 +1,31 @@
+# Tests for the competition closure rows (hierarchy.py)
+
+# Importing Required Libraries
+from hierarchy import closure_rows
+
+
+def test_closure_rows_of_a_three_level_tree():
+    edges = [("tournament", None), ("singles", "tournament"), ("doubles", "tournament"), ("qualification", "singles")]
+    assert sorted(closure_rows(edges)) == sorted([
+        ("tournament", "tournament", 0),
+        ("singles", "singles", 0), ("tournament", "singles", 1),
+        ("doubles", "doubles", 0), ("tournament", "doubles", 1),
+        ("qualification", "qualification", 0), ("singles", "qualification", 1), ("tournament", "qualification", 2),
+    ])
+
+
+def test_unknown_parent_ends_the_chain():
+    assert closure_rows([("event", "not loaded")]) == [("event", "event", 0)]
+
+
+def test_parent_cycle_is_cut():
+    rows = closure_rows([("a", "b"), ("b", "a"), ("c", "c")])
+    assert sorted(rows) == [("a", "a", 0), ("a", "b", 1), ("b", "a", 1), ("b", "b", 0), ("c", "c", 0)]
+
+
+def test_every_competition_is_its_own_ancestor_once():
+    edges = [(f"c{i}", f"c{i // 2}" if i else None) for i in range(50)]
+    rows = closure_rows(edges)
+    assert len(rows) == len(set(rows))
+    assert sorted(d for a, d, depth in rows if depth == 0) == sorted(c for c, _ in edges)
+    assert max(depth for _, _, depth in rows) == 6   #c32..c49 -> c16..c24 -> c8..c12 -> c4..c6 -> c2, c3 -> c1 -> c0
@@ -0,0 +1,60 @@
+# Tests for the incremental sync: changed_rows, _competitor_changes, upsert_changed and upsert_competitions (ingest.py)
+
+# Importing Required Libraries
+from ingest import _competitor_changes, bulk_load, changed_rows, upsert_changed, upsert_competitions
+
+PAVIC = ("sr:competitor:1", "Pavic, Mate", "Croatia", "HRV", "PAV", 2025, 16)
+DODIG = ("sr:competitor:2", "Dodig, Ivan", "Croatia", "HRV", "DOD", 2025, 16)
+
+
+def test_changed_rows_keeps_new_and_changed_rows():
+    stored = {("a", 2025, 1): (1, 0, 100, 5), ("b", 2025, 1): (2, 0, 90, 5)}
+    new = [("a", 2025, 1, 1, 0, 100, 5),   #Same values
+           ("b", 2025, 1, 3, -1, 90, 5),   #Rank changed
+           ("c", 2025, 1, 4, 0, 80, 2)]    #Not stored yet
+    assert changed_rows(new, stored, key_len=3) == new[1:]
+
+
+def test_changed_rows_single_key():
+    assert changed_rows([("x", "A"), ("y", "B")], {("x",): ("A",)}, key_len=1) == [("y", "B")]
+
+
+def test_competitor_changes(conn):
+    bulk_load(conn, "competitors_table", [PAVIC, DODIG], "sqlite")
+    renamed = DODIG[:1] + ("Dodig, I.",) + DODIG[2:]
+    new = ("sr:competitor:3", "Mektic, Nikola", "Croatia", "HRV", "MEK", 2025, 16)
+    assert _competitor_changes(conn, [PAVIC, renamed, new], "sqlite", chunk_size=2) == [renamed, new]
+
+
+def test_competitor_changes_never_moves_the_week_back(conn):
+    bulk_load(conn, "competitors_table", [PAVIC], "sqlite")
+    older = PAVIC[:5] + (2025, 10)
+    assert _competitor_changes(conn, [older], "sqlite", chunk_size=10) == []
+    renamed_older = (PAVIC[0], "Pavic, M.") + PAVIC[2:5] + (2025, 10)
+    assert _competitor_changes(conn, [renamed_older], "sqlite", chunk_size=10) == []   #Older details never win
+    undated = PAVIC[:5] + (None, None)
+    assert _competitor_changes(conn, [undated], "sqlite", chunk_size=10) == []
+
+
+def test_upsert_changed_counts_only_changed_rows(conn):
+    complexes = [("sr:complex:1", "Tennis Club Zagreb"), ("sr:complex:2", "Stadion Kantrida")]
+    assert upsert_changed(conn, "complex", complexes, "sqlite")["rows"] == 2
+    assert upsert_changed(conn, "complex", complexes, "sqlite")["rows"] == 0
+    stats = upsert_changed(conn, "complex", [("sr:complex:2", "Kantrida")], "sqlite")
+    assert stats["rows"] == 1
+    assert stats["method"].endswith("(changed rows only)")
+    assert conn.execute("SELECT complex_name FROM complex ORDER BY complex_id").fetchall() \
+        == [("Tennis Club Zagreb",), ("Kantrida",)]
+
+
+def test_upsert_competitions_writes_renames_and_keeps_info_parents(conn):
+    bulk_load(conn, "categorytable", [("sr:category:3", "ATP")], "sqlite")
+    vienna = ("sr:competition:1", "ATP Vienna", None, "singles", "men", "sr:category:3")
+    doubles = ("sr:competition:2", "ATP Vienna Doubles", None, "doubles", "men", "sr:category:3")
+    assert upsert_competitions(conn, [vienna, doubles], "sqlite")["rows"] == 2
+    upsert_changed(conn, "competitiontable", [doubles[:2] + (vienna[0],) + doubles[3:]], "sqlite")   #info.json parent
+    assert upsert_competitions(conn, [vienna, doubles], "sqlite")["rows"] == 0
+    renamed = ("sr:competition:2", "Erste Bank Open Doubles", None, "doubles", "men", "sr:category:3")
+    assert upsert_competitions(conn, [vienna, renamed], "sqlite")["rows"] == 1
+    assert conn.execute("SELECT competition_name, parent_id FROM competitiontable "
+                        "WHERE competition_id = 'sr:competition:2'").fetchone() == ("Erste Bank Open Doubles", vienna[0])
@@ -0,0 +1,91 @@
+# Tests for the change detection: week_diff, _threshold_pairs and match_rules (notifications.py)
+
+# Importing Required Libraries
+import numpy as np
+import pandas as pd
+
+from notifications import RULE_COLUMNS, _threshold_pairs, match_rules, week_diff
+
+WEEK_COLUMNS = ["competitor_id", "name", "ranks", "points"]
+
+
+def week(rows):
+    return pd.DataFrame(rows, columns=WEEK_COLUMNS)
+
+
+def rules(rows):
+    return pd.DataFrame(rows, columns=RULE_COLUMNS)
+
+
+OLD = week([("a", "Alpha", 1, 1000), ("b", "Beta", 2, 900), ("c", "Gamma", 60, 300), ("d", "Delta", 99, 100)])
+NEW = week([("a", "Alpha", 2, 950), ("b", "Beta", 1, 1200), ("c", "Gamma", 40, 320), ("e", "Eps", 100, 90)])
+
+
+def fired(matches):
+    return sorted(zip(matches["rule_id"], matches["competitor_id"]))
+
+
+def test_week_diff():
+    diff = week_diff(NEW, OLD).set_index("competitor_id")
+    assert sorted(diff.index) == ["a", "b", "c", "d", "e"]
+    assert diff.loc["a", ["rank", "old_rank", "points", "old_points"]].tolist() == [2, 1, 950, 1000]
+    assert np.isnan(diff.loc["d", "rank"]) and diff.loc["d", "old_rank"] == 99   #Dropped out of the ranking
+    assert np.isnan(diff.loc["e", "old_rank"]) and diff.loc["e", "name"] == "Eps"
+    assert (diff[["rank", "old_rank", "points", "old_points"]].dtypes == "float64").all()
+
+
+def test_threshold_pairs_half_open():
+    #entered_top: a threshold t fires when rank <= t < old rank
+    thresholds = np.array([50.0, 10.0, 100.0, 50.0])
+    rank, old_rank = np.array([40.0, 5.0, np.inf]), np.array([60.0, 5.0, 99.0])
+    rule_at, competitor_at = _threshold_pairs(thresholds, rank, old_rank, inclusive=False)
+    assert sorted(zip(rule_at.tolist(), competitor_at.tolist())) == [(0, 0), (3, 0)]
+
+
+def test_threshold_pairs_inclusive_and_nan():
+    #moved: a threshold t fires when 0 <= t <= |change|; NaN (unranked in a week) never fires
+    thresholds = np.array([1.0, 5.0, 20.0])
+    lo, hi = np.zeros(3), np.array([5.0, 0.0, np.nan])
+    rule_at, competitor_at = _threshold_pairs(thresholds, lo, hi, inclusive=True)
+    assert sorted(zip(rule_at.tolist(), competitor_at.tolist())) == [(0, 0), (1, 0)]
+
+
+def test_match_rules_on_watched_competitors():
+    watch = rules([
+        (1, "ana", "a", "moved", 1, "file", None),
+        (2, "ana", "a", "moved", 2, "file", None),
+        (3, "ana", "c", "entered_top", 50, "file", None),
+        (4, "ana", "d", "left_top", 100, "file", None),
+        (5, "ana", "b", "points_change", 300, "file", None),
+        (6, "ana", "x", "moved", 1, "file", None),       #Not ranked in either week
+    ])
+    assert fired(match_rules(watch, week_diff(NEW, OLD))) == [(1, "a"), (3, "c"), (4, "d"), (5, "b")]
+
+
+def test_match_rules_on_every_competitor():
+    general = rules([
+        (1, "ana", None, "entered_top", 50, "file", None),
+        (2, "ana", None, "entered_top", 100, "file", None),
+        (3, "ana", None, "left_top", 1, "file", None),
+        (4, "ana", None, "moved", 20, "file", None),
+        (5, "ana", None, "points_change", 50, "file", None),
+    ])
+    matches = match_rules(general, week_diff(NEW, OLD))
+    assert fired(matches) == [(1, "c"), (2, "e"), (3, "a"), (4, "c"), (5, "a"), (5, "b")]
+    assert list(matches.columns) == RULE_COLUMNS + ["name", "rank", "old_rank", "points", "old_points"]
+
+
+#The binary search over sorted thresholds gives the same pairs as the same rules set on each competitor one by one
+#(the watch-list path, one array expression over every rule x competitor pair)
+def test_general_rules_match_the_watch_list_path():
+    rng = np.random.default_rng(7)
+    ids = [f"c{i}" for i in range(300)]
+    old = week([(c, c, r, int(p)) for c, r, p in zip(ids, rng.permutation(300) + 1, rng.integers(0, 5000, 300))])
+    new = week([(c, c, r, int(p)) for c, r, p in zip(ids[20:], rng.permutation(280) + 1, rng.integers(0, 5000, 280))])
+    types = ["entered_top", "left_top", "moved", "points_change"]
+    general = rules([(i, "u", None, types[i % 4], int(rng.integers(1, 300)), "file", None) for i in range(200)])
+    diff = week_diff(new, old)
+    watch = general.drop(columns="competitor_id").merge(diff[["competitor_id"]], how="cross")[RULE_COLUMNS]
+    expected = fired(match_rules(watch, diff))
+    assert {rule_id % 4 for rule_id, _ in expected} == {0, 1, 2, 3}   #Every rule type fires somewhere
+    assert fired(match_rules(general, diff)) == expected
@@ -0,0 +1,135 @@
+# Tests for the query cache: cache keys, TTL, LRU eviction and stamp-file invalidation (query_cache.py)
+
+# Importing Required Libraries
+import threading
+
+import pandas as pd
+import pytest
+
+import query_cache
+from query_cache import QueryCache, make_key, normalize_sql, notify_invalidation
+
+
+@pytest.fixture
+def stamp(tmp_path):
+    return str(tmp_path / "cache_invalidation.json")
+
+
+#Fake monotonic clock, moved forward by the test
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def frame(rows):
+    return pd.DataFrame({"value": range(rows)})
+
+
+def test_normalize_sql_collapses_whitespace_and_comments():
+    sql = """
+        SELECT name   -- display name
+        FROM  competitors_table   # every competitor
+        WHERE country = %s ;
+    """
+    assert normalize_sql(sql) == "SELECT name FROM competitors_table WHERE country = %s"
+
+
+def test_normalize_sql_keeps_quoted_strings():
+    assert normalize_sql("SELECT 'a  --  b' ,\n \"x   #y\"") == "SELECT 'a  --  b' , \"x   #y\""
+
+
+def test_make_key():
+    assert make_key("SELECT 1;", [1, 2]) == ("SELECT 1", (1, 2))
+    assert make_key("SELECT  1") == ("SELECT 1", None)
+    assert make_key("SELECT 1", ()) != make_key("SELECT 1")
+
+
+def test_hit_after_miss(stamp):
+    cache = QueryCache(stamp_path=stamp)
+    calls = []
+    load = lambda: calls.append(1) or frame(3)
+    first = cache.get_or_load("SELECT 1", None, load)
+    assert cache.get_or_load("SELECT   1 ;", None, load) is first
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_ttl_expiry(stamp, clock):
+    cache = QueryCache(default_ttl=10, stamp_path=stamp)
+    first = cache.get_or_load("SELECT 1", None, lambda: frame(1))
+    clock[0] += 9
+    assert cache.get_or_load("SELECT 1", None, lambda: frame(1)) is first
+    clock[0] += 2
+    assert cache.get_or_load("SELECT 1", None, lambda: frame(1)) is not first
+    assert cache.stats()["expired"] == 1
+    short = cache.get_or_load("SELECT 2", None, lambda: frame(1), ttl=1)
+    clock[0] += 1
+    assert cache.get_or_load("SELECT 2", None, lambda: frame(1)) is not short
+
+
+def test_lru_eviction(stamp):
+    size = query_cache._size_of(frame(100))
+    cache = QueryCache(max_bytes=2 * size, stamp_path=stamp)
+    a = cache.get_or_load("a", None, lambda: frame(100))
+    cache.get_or_load("b", None, lambda: frame(100))
+    assert cache.get_or_load("a", None, lambda: frame(100)) is a   #a is now the most recently used
+    cache.get_or_load("c", None, lambda: frame(100))                #Evicts b, the least recently used
+    s = cache.stats()
+    assert s["evictions"] == 1 and s["entries"] == 2 and s["bytes"] <= s["max_bytes"]
+    assert cache.get_or_load("a", None, lambda: frame(100)) is a
+    misses = cache.stats()["misses"]
+    cache.get_or_load("b", None, lambda: frame(100))
+    assert cache.stats()["misses"] == misses + 1
+
+
+def test_result_larger_than_the_cache_is_not_stored(stamp):
+    cache = QueryCache(max_bytes=10, stamp_path=stamp)
+    cache.get_or_load("big", None, lambda: frame(100))
+    assert cache.stats()["entries"] == 0
+
+
+def test_stamp_invalidates_only_the_tagged_entries(stamp):
+    cache = QueryCache(stamp_path=stamp)
+    rankings = cache.get_or_load("r", None, lambda: frame(1), tags=("rankings",))
+    tree = cache.get_or_load("t", None, lambda: frame(1), tags=("competitions",))
+    notify_invalidation(("rankings",), path=stamp)   #As another process (the ETL) would
+    assert cache.get_or_load("r", None, lambda: frame(1), tags=("rankings",)) is not rankings
+    assert cache.get_or_load("t", None, lambda: frame(1), tags=("competitions",)) is tree
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_invalidate_everything(stamp):
+    cache = QueryCache(stamp_path=stamp)
+    cache.get_or_load("r", None, lambda: frame(1), tags=("rankings",))
+    cache.get_or_load("u", None, lambda: frame(1))
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+
+def test_result_loaded_across_an_invalidation_is_not_stored(stamp):
+    cache = QueryCache(stamp_path=stamp)
+
+    def load():
+        notify_invalidation(("rankings",), path=stamp)   #The ETL commits while the query runs
+        return frame(1)
+
+    cache.get_or_load("r", None, load, tags=("rankings",))
+    s = cache.stats()
+    assert s["stale_loads"] == 1 and s["entries"] == 0
+    cache.get_or_load("r", None, lambda: frame(1), tags=("rankings",))
+    assert cache.stats()["entries"] == 1
+
+
+def test_concurrent_notifications_are_not_lost(stamp):
+    def bump():
+        for _ in range(25):
+            notify_invalidation(("rankings", "competitions"), path=stamp)
+
+    threads = [threading.Thread(target=bump) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert query_cache._read_stamp(stamp) == {"rankings": 200, "competitions": 200}
@@ -0,0 +1,90 @@
+# Tests for the rank series: LTTB downsampling and the RankSeries statistics (timeseries.py)
+
+# Importing Required Libraries
+import numpy as np
+import pandas as pd
+
+from backend import SERIES_COLUMNS
+from timeseries import RankSeries, iso_week_start, lttb
+
+
+def series_frame(ranks):
+    #ranks: competitor_id -> weekly ranks from 2025 week 1; rows are shuffled, RankSeries sorts them
+    rows = [(cid, f"Name {cid}", 2025, week, rank, 1000 - rank)
+            for cid, values in ranks.items() for week, rank in enumerate(values, start=1)]
+    return pd.DataFrame(rows, columns=SERIES_COLUMNS).sample(frac=1, random_state=3)
+
+
+def test_iso_week_start():
+    assert iso_week_start(np.array([2025, 2026]), np.array([1, 53])).tolist() == \
+        [np.datetime64("2024-12-30"), np.datetime64("2026-12-28")]
+
+
+def test_lttb_keeps_the_ends_and_the_peaks():
+    x = np.arange(100)
+    y = np.zeros(100)
+    y[37], y[71] = 50, -40
+    keep = lttb(x, y, 10)
+    assert len(keep) == 10 and keep[0] == 0 and keep[-1] == 99
+    assert np.all(np.diff(keep) > 0)
+    assert 37 in keep and 71 in keep
+
+
+def test_lttb_short_input_is_returned_whole():
+    assert lttb(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+    assert lttb(np.arange(5), np.arange(5), 2).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_rank_series_orders_by_competitor_and_week():
+    series = RankSeries(series_frame({"b": [5, 4, 3], "a": [10, 12]}))
+    assert series.ids.tolist() == ["a", "b"]
+    assert series.offsets.tolist() == [0, 2, 5]
+    assert series.rank.tolist() == [10, 12, 5, 4, 3]
+    assert series.week.tolist() == [1, 2, 1, 2, 3]
+    assert series.labels == ["Name a", "Name b"]
+
+
+def test_rank_series_round_trips_through_series_frame():
+    series = RankSeries(series_frame({"b": [5, 4, 3], "a": [10, 12]}))
+    again = RankSeries(series.series_frame())
+    pd.testing.assert_frame_equal(again.series_frame(), series.series_frame())
+
+
+def test_weeks_without_a_rank_are_dropped():
+    frame = series_frame({"a": [3, 2, 1]})
+    frame.loc[frame["Week"] == 2, "Rank"] = np.nan
+    assert RankSeries(frame).week.tolist() == [1, 3]
+
+
+def test_shared_names_get_the_id():
+    frame = series_frame({"a": [1], "b": [2]})
+    frame["Competitor"] = "Same Name"
+    assert RankSeries(frame).labels == ["Same Name (a)", "Same Name (b)"]
+
+
+def test_summary():
+    summary = RankSeries(series_frame({"a": [10, 8, 6, 7, 7], "b": [1, 2, 3]})).summary(window=2)
+    a, b = summary.loc["Name a"], summary.loc["Name b"]
+    assert a["Weeks"] == 5 and a["Best Rank"] == 6 and a["Worst Rank"] == 10 and a["Rank Change"] == 3
+    assert a["Longest Rise"] == 2 and a["Longest Fall"] == 1 and a["Current Streak"] == 0
+    assert b["Longest Fall"] == 2 and b["Current Streak"] == -2 and b["Points Change"] == -2
+    assert b["Volatility"] == 0.0                  #Every weekly change is +1
+    assert a["Recent Volatility"] == 0.5           #Changes +1 and 0 over the last two weeks
+
+
+def test_rolling_volatility_stays_inside_each_series():
+    series = RankSeries(series_frame({"a": [1, 5], "b": [9, 9, 9]}))
+    volatility = series.rolling_volatility(window=3)
+    assert np.isnan(volatility[0]) and volatility[1] == 0.0   #One change only
+    assert np.isnan(volatility[2]) and volatility[3:].tolist() == [0.0, 0.0]
+
+
+def test_between_and_to_frame():
+    series = RankSeries(series_frame({"a": list(range(1, 41)), "b": [5, 6]}))
+    start, end = series.date_range()
+    assert series.between(start, end) is series
+    late = series.between(iso_week_start(2025, 3), end)
+    assert late.ids.tolist() == ["a"] and len(late.rank) == 38
+    frame = series.to_frame(max_points=10)
+    assert frame.groupby("Competitor").size().to_dict() == {"Name a": 10, "Name b": 2}
+    assert len(series.to_frame()) == 42
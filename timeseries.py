@@ -0,0 +1,188 @@
+# Rank / points time series of many competitors
+# The comparison page used to plot two competitors' raw weekly ranks. RankSeries keeps any number of series in a
+# few flat numpy arrays, one row per competitor per week, ordered by competitor and then by week, so
+# competitor i's history is the contiguous slice offsets[i]:offsets[i + 1]:
+#   - the series of all selected competitors come from one query (queries.RANK_SERIES)
+#   - statistics (best/worst rank, volatility, rolling volatility, rising/falling streaks) are computed for every
+#     competitor at once with segment-wise numpy reductions, with no per-competitor groupby
+#   - long ranges are downsampled with Largest-Triangle-Three-Buckets (LTTB) before plotting, which keeps the
+#     peaks and troughs that taking every n-th week would drop
+#
+# Usage:
+#   series = RankSeries(frame)                       frame: backend.SERIES_COLUMNS, any row order
+#   series.between(start, end).to_frame(150)         long DataFrame for px.line, at most 150 points per line
+#   series.summary(window=8)                         one row per competitor
+
+# Importing Required Libraries
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOW = 8               #Weeks in the rolling volatility window
+SUMMARY_COLUMNS = ["Weeks", "First Rank", "Latest Rank", "Best Rank", "Worst Rank", "Mean Rank", "Rank Change",
+                   "Volatility", "Recent Volatility", "Longest Rise", "Longest Fall", "Current Streak",
+                   "Points", "Points Change"]
+
+
+#Monday of ISO week (year, week) for whole arrays: Monday of the week holding 4 January, plus (week - 1) weeks
+def iso_week_start(year, week):
+    jan4 = (np.asarray(year) - 1970).astype("datetime64[Y]").astype("datetime64[D]") + 3
+    weekday = (jan4.astype(np.int64) + 3) % 7   #1970-01-01 was a Thursday; Monday = 0
+    return jan4 - weekday + (np.asarray(week, dtype=np.int64) - 1) * 7
+
+
+#Indices of at most n_out points of (x, y) chosen by Largest-Triangle-Three-Buckets: the first and last point,
+#then per bucket the point forming the largest triangle with the previous pick and the next bucket's average
+def lttb(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  #n_out - 2 buckets over points 1 .. n - 2
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        next_hi = edges[b + 2] if b + 2 < len(edges) else n
+        avg_x, avg_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[b + 1] = a
+    return keep
+
+
+#Length of the run of True ending at each position (0 where flag is False)
+def _run_lengths(flag):
+    count = np.cumsum(flag)
+    return count - np.maximum.accumulate(np.where(flag, 0, count))
+
+
+class RankSeries:
+    #frame: one row per competitor per week with the backend.SERIES_COLUMNS columns; weeks without a rank are dropped
+    def __init__(self, frame):
+        frame = frame[frame["Rank"].notna()]
+        codes, ids = pd.factorize(frame["Competitor ID"].to_numpy(dtype=object), sort=True)
+        year = frame["Year"].to_numpy(dtype=np.int64)
+        week = frame["Week"].to_numpy(dtype=np.int64)
+        order = np.lexsort((week, year, codes))
+        self._set(np.asarray(ids, dtype=object), frame["Competitor"].to_numpy(dtype=object)[order], codes[order],
+                  year[order], week[order], frame["Rank"].to_numpy(dtype=np.float64)[order],
+                  pd.to_numeric(frame["Points"]).to_numpy(dtype=np.float64)[order])
+
+    def _set(self, ids, names, codes, year, week, rank, points):
+        self.ids = ids                              #Competitor IDs, sorted; competitor i = ids[i]
+        self.codes = codes                          #Competitor number of each row
+        self.offsets = np.searchsorted(codes, np.arange(len(ids) + 1))  #Rows of competitor i: offsets[i]:offsets[i + 1]
+        self.year = year
+        self.week = week
+        self.day = iso_week_start(year, week)       #Monday of each ranking week (datetime64[D])
+        self.rank = rank
+        self.points = points
+        #Legend labels: the name, with the ID added where two competitors share a name
+        first_names = pd.Series(names[self.offsets[:-1]], dtype=object)
+        shared = first_names.duplicated(keep=False).to_numpy()
+        self.labels = [f"{name} ({cid})" if dup else str(name) for name, cid, dup in zip(first_names, ids, shared)]
+        self._names = names
+
+    def __len__(self):
+        return len(self.ids)
+
+    #Back to one row per competitor per week (backend.SERIES_COLUMNS); RankSeries(series.series_frame()) is the same series
+    def series_frame(self):
+        return pd.DataFrame({"Competitor ID": self.ids[self.codes], "Competitor": self._names, "Year": self.year,
+                             "Week": self.week, "Rank": self.rank, "Points": self.points})
+
+    def memory_bytes(self):
+        arrays = (self.codes, self.offsets, self.year, self.week, self.day, self.rank, self.points)
+        return sum(a.nbytes for a in arrays) + sum(len(label) for label in self.labels) * 2
+
+    #First and last ranking week held, as numpy datetime64[D] (None when empty)
+    def date_range(self):
+        if not len(self.day):
+            return None
+        return self.day.min(), self.day.max()
+
+    #Only the weeks starting between start and end (inclusive); competitors with no week left are dropped
+    def between(self, start, end):
+        mask = (self.day >= np.datetime64(start, "D")) & (self.day <= np.datetime64(end, "D"))
+        if mask.all():
+            return self
+        present = np.unique(self.codes[mask])
+        remap = np.full(len(self.ids), -1, dtype=np.int64)
+        remap[present] = np.arange(len(present))
+        subset = object.__new__(RankSeries)
+        subset._set(self.ids[present], self._names[mask], remap[self.codes[mask]], self.year[mask], self.week[mask],
+                    self.rank[mask], self.points[mask])
+        return subset
+
+    #Long DataFrame (Competitor, Date, Year, Week, Rank, Points) with at most max_points weeks per competitor,
+    #chosen by LTTB on the rank line; max_points=None keeps every week
+    def to_frame(self, max_points=None):
+        x = self.day.astype(np.int64)
+        rows = []
+        for i in range(len(self)):
+            lo, hi = self.offsets[i], self.offsets[i + 1]
+            keep = np.arange(lo, hi) if max_points is None else lo + lttb(x[lo:hi], self.rank[lo:hi], max_points)
+            rows.append(keep)
+        rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+        return pd.DataFrame({
+            "Competitor": np.asarray(self.labels, dtype=object)[self.codes[rows]],
+            "Date": self.day[rows].astype("datetime64[ns]"),
+            "Year": self.year[rows],
+            "Week": self.week[rows],
+            "Rank": self.rank[rows],
+            "Points": self.points[rows],
+        })
+
+    #Week-to-week rank change at each row (NaN on each competitor's first week); negative = moved up
+    def rank_change(self):
+        change = np.diff(self.rank, prepend=np.nan)
+        change[self.offsets[:-1]] = np.nan
+        return change
+
+    #Standard deviation of the weekly rank change over the last `window` weeks, at each row
+    def rolling_volatility(self, window=DEFAULT_WINDOW):
+        change = self.rank_change()
+        valid = ~np.isnan(change)
+        values = np.where(valid, change, 0.0)
+        sums = [np.concatenate(([0.0], np.cumsum(a))) for a in (valid.astype(np.float64), values, values * values)]
+        rows = np.arange(len(change))
+        start = np.maximum(rows - window + 1, self.offsets[self.codes])  #Window never crosses into another series
+        count, total, squares = (s[rows + 1] - s[start] for s in sums)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = squares / count - (total / count) ** 2
+        return np.where(count > 0, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+    #One row per competitor (index: legend label); Rank Change > 0 = improved since the first week,
+    #Current Streak > 0 = weeks in a row moving up, < 0 = weeks in a row moving down
+    def summary(self, window=DEFAULT_WINDOW):
+        if not len(self):
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+        starts, last = self.offsets[:-1], self.offsets[1:] - 1
+        weeks = np.diff(self.offsets)
+        change = self.rank_change()
+        valid = ~np.isnan(change)
+        changes = np.add.reduceat(valid, starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_change = np.add.reduceat(np.where(valid, change, 0.0), starts) / changes
+            mean_square = np.add.reduceat(np.where(valid, change * change, 0.0), starts) / changes
+            volatility = np.where(changes > 0, np.sqrt(np.maximum(mean_square - mean_change ** 2, 0.0)), np.nan)
+        rising = _run_lengths(change < 0)   #NaN compares False, so runs restart on each competitor's first week
+        falling = _run_lengths(change > 0)
+        return pd.DataFrame({
+            "Weeks": weeks,
+            "First Rank": self.rank[starts],
+            "Latest Rank": self.rank[last],
+            "Best Rank": np.minimum.reduceat(self.rank, starts),
+            "Worst Rank": np.maximum.reduceat(self.rank, starts),
+            "Mean Rank": np.add.reduceat(self.rank, starts) / weeks,
+            "Rank Change": self.rank[starts] - self.rank[last],
+            "Volatility": volatility,
+            "Recent Volatility": self.rolling_volatility(window)[last],
+            "Longest Rise": np.maximum.reduceat(rising, starts),
+            "Longest Fall": np.maximum.reduceat(falling, starts),
+            "Current Streak": rising[last] - falling[last],
+            "Points": self.points[last],
+            "Points Change": self.points[last] - self.points[starts],
+        }, index=pd.Index(self.labels, name="Competitor"))